@@ -0,0 +1,41 @@
+"""add event attendee count
+
+Revision ID: 8a1c5e2f4b7d
+Revises: f3d9bd065732
+Create Date: 2025-06-12 10:14:03.481275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a1c5e2f4b7d'
+down_revision: Union[str, None] = 'f3d9bd065732'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'events',
+        sa.Column('attendee_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE events
+        SET attendee_count = counts.total
+        FROM (
+            SELECT event_id, count(id) AS total
+            FROM attendees
+            GROUP BY event_id
+        ) AS counts
+        WHERE events.id = counts.event_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'attendee_count')
@@ -0,0 +1,210 @@
+"""partition events and attendees by start time
+
+Revision ID: b9d2f6a4c8e3
+Revises: e2b6c9d4f1a8
+Create Date: 2025-06-27 10:12:44.583190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d2f6a4c8e3'
+down_revision: Union[str, None] = 'e2b6c9d4f1a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "array_to_tsvector(ARRAY['@d' || floor(extract(epoch FROM "
+    "start_time - '1970-01-01 00:00:00+00'::timestamptz) / 86400)::bigint::text])"
+)
+# attendee_count and updated_at change on every registration; leaving them out
+# keeps those updates HOT, at the cost of a heap fetch per page row.
+EVENT_PAGE_COLUMNS = ['name', 'location', 'end_time', 'max_capacity', 'created_at']
+EVENT_COLUMNS = 'id, name, location, start_time, end_time, max_capacity, attendee_count, created_at, updated_at'
+# Matches PARTITION_MONTHS_AHEAD; the partition maintainer keeps extending it.
+MONTHS_AHEAD = 12
+
+# One partition per UTC month, from the first event's month until MONTHS_AHEAD
+# months after the last one, named like event_management.partitions does.
+CREATE_PARTITIONS = f"""
+DO $$
+DECLARE
+    month timestamp := date_trunc(
+        'month', coalesce((SELECT min(start_time) FROM events_unpartitioned), now()) AT TIME ZONE 'UTC'
+    );
+    last timestamp := date_trunc(
+        'month', greatest((SELECT max(start_time) FROM events_unpartitioned), now()) AT TIME ZONE 'UTC'
+    ) + interval '{MONTHS_AHEAD} months';
+BEGIN
+    WHILE month <= last LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF events FOR VALUES FROM (%L) TO (%L)',
+            'events_p' || to_char(month, 'YYYY_MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF attendees FOR VALUES FROM (%L) TO (%L)',
+            'attendees_p' || to_char(month, 'YYYY_MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$
+"""
+
+
+def _event_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('events_id_seq')"), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('location', sa.String(length=500), nullable=False),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('max_capacity', sa.Integer(), nullable=False),
+        sa.Column('attendee_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    ]
+
+
+def _attendee_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('attendees_id_seq')"), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('registered_at', sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def _detach_sequences() -> None:
+    # Keep the id sequences alive while their tables are replaced.
+    op.execute('ALTER SEQUENCE events_id_seq OWNED BY NONE')
+    op.execute('ALTER SEQUENCE attendees_id_seq OWNED BY NONE')
+
+
+def _attach_sequences() -> None:
+    op.execute('ALTER SEQUENCE events_id_seq OWNED BY events.id')
+    op.execute('ALTER SEQUENCE attendees_id_seq OWNED BY attendees.id')
+
+
+def upgrade() -> None:
+    # Rewrites both tables into new partitioned ones; run it with the service stopped.
+    op.rename_table('attendees', 'attendees_unpartitioned')
+    op.rename_table('events', 'events_unpartitioned')
+    _detach_sequences()
+
+    op.create_table('events', *_event_columns(), postgresql_partition_by='RANGE (start_time)')
+    op.create_table(
+        'attendees',
+        *_attendee_columns(),
+        sa.Column('event_start_time', sa.DateTime(timezone=True), nullable=False),
+        postgresql_partition_by='RANGE (event_start_time)',
+    )
+    op.execute(CREATE_PARTITIONS)
+
+    # Load before adding keys and indexes, so each partition's indexes are built once.
+    op.execute(
+        f'INSERT INTO events ({EVENT_COLUMNS}) SELECT {EVENT_COLUMNS} FROM events_unpartitioned'
+    )
+    op.execute(
+        'INSERT INTO attendees (id, name, email, event_id, event_start_time, registered_at) '
+        'SELECT attendees.id, attendees.name, attendees.email, attendees.event_id, '
+        'events.start_time, attendees.registered_at '
+        'FROM attendees_unpartitioned AS attendees '
+        'JOIN events_unpartitioned AS events ON events.id = attendees.event_id'
+    )
+    op.drop_table('attendees_unpartitioned')
+    op.drop_table('events_unpartitioned')
+    _attach_sequences()
+
+    op.create_primary_key('events_pkey', 'events', ['id', 'start_time'])
+    op.create_primary_key('attendees_pkey', 'attendees', ['id', 'event_start_time'])
+    op.create_unique_constraint(
+        'unique_email_per_event', 'attendees', ['email', 'event_id', 'event_start_time']
+    )
+    op.create_foreign_key(
+        'fk_attendees_event',
+        'attendees',
+        'events',
+        ['event_id', 'event_start_time'],
+        ['id', 'start_time'],
+        onupdate='CASCADE',
+    )
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_events_start_time_id_covering',
+        'events',
+        ['start_time', 'id'],
+        postgresql_include=EVENT_PAGE_COLUMNS,
+    )
+    op.create_index(
+        'ix_attendees_event_registered_at_id_covering',
+        'attendees',
+        ['event_id', 'event_start_time', 'registered_at', 'id'],
+        postgresql_include=['name', 'email'],
+    )
+
+
+def downgrade() -> None:
+    # Only attached partitions are copied back; archived months stay in their schema.
+    op.rename_table('attendees', 'attendees_partitioned')
+    op.rename_table('events', 'events_partitioned')
+    _detach_sequences()
+    for name in (
+        'unique_email_per_event',
+        'ix_events_search_vector',
+        'ix_events_start_time_id_covering',
+        'ix_attendees_event_registered_at_id_covering',
+        'events_pkey',
+        'attendees_pkey',
+    ):
+        op.execute(f'ALTER INDEX IF EXISTS {name} RENAME TO {name}_partitioned')
+
+    op.create_table('events', *_event_columns(), sa.PrimaryKeyConstraint('id'))
+    op.create_table(
+        'attendees',
+        *_attendee_columns(),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email', 'event_id', name='unique_email_per_event'),
+    )
+    op.execute(
+        f'INSERT INTO events ({EVENT_COLUMNS}) SELECT {EVENT_COLUMNS} FROM events_partitioned'
+    )
+    op.execute(
+        'INSERT INTO attendees (id, name, email, event_id, registered_at) '
+        'SELECT id, name, email, event_id, registered_at FROM attendees_partitioned'
+    )
+    op.drop_table('attendees_partitioned')
+    op.drop_table('events_partitioned')
+    _attach_sequences()
+
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_events_start_time_id_covering',
+        'events',
+        ['start_time', 'id'],
+        postgresql_include=EVENT_PAGE_COLUMNS,
+    )
+    op.create_index(
+        'ix_attendees_event_id_registered_at_id_covering',
+        'attendees',
+        ['event_id', 'registered_at', 'id'],
+        postgresql_include=['name', 'email'],
+    )
@@ -0,0 +1,33 @@
+"""add keyset pagination indexes
+
+Revision ID: c47e91d3a8f2
+Revises: 8a1c5e2f4b7d
+Create Date: 2025-06-14 16:02:47.905318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e91d3a8f2'
+down_revision: Union[str, None] = '8a1c5e2f4b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_start_time_id', 'events', ['start_time', 'id'], unique=False)
+    op.create_index(
+        'ix_attendees_event_id_registered_at_id',
+        'attendees',
+        ['event_id', 'registered_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendees_event_id_registered_at_id', table_name='attendees')
+    op.drop_index('ix_events_start_time_id', table_name='events')
@@ -0,0 +1,53 @@
+"""add event search vector
+
+Revision ID: e2b6c9d4f1a8
+Revises: d5e8a1f7c3b9
+Create Date: 2025-06-24 09:41:52.127604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b6c9d4f1a8'
+down_revision: Union[str, None] = 'd5e8a1f7c3b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "array_to_tsvector(ARRAY['@d' || floor(extract(epoch FROM "
+    "start_time - '1970-01-01 00:00:00+00'::timestamptz) / 86400)::bigint::text])"
+)
+
+
+def upgrade() -> None:
+    # A stored generated column rewrites the table once; run it in a quiet window.
+    op.add_column(
+        'events',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_search_vector',
+            'events',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_search_vector', table_name='events')
+    op.drop_column('events', 'search_vector')
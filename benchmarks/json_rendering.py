@@ -0,0 +1,56 @@
+"""
+Micro-benchmark of rendering a 100-event /events page to bytes.
+
+Compares FastAPI's response_model path (validation, jsonable_encoder and
+JSONResponse) with common.rendering.render_json, and reports the median
+and p99 cost per page:
+
+    python -m benchmarks.json_rendering
+"""
+import asyncio
+import statistics
+import time
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from common.rendering import render_json
+from event_management.api.v1.schemas.events import PaginatedEventsResponse
+from event_management.views import _event_response
+from benchmarks.response_models import PAGE_SIZE, _rows
+
+
+async def _standard(field, page):
+    content = await serialize_response(field=field, response_content=page, exclude_none=True)
+    return JSONResponse(content).body
+
+
+async def _fast(field, page):
+    return render_json(page, exclude_none=True).body
+
+
+async def _measure(render, field, page, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter_ns()
+        await render(field, page)
+        samples.append(time.perf_counter_ns() - started)
+    return samples
+
+
+async def main(iterations: int = 5000) -> None:
+    field = create_model_field(name="Response", type_=PaginatedEventsResponse, mode="serialization")
+    page = PaginatedEventsResponse(
+        events=[_event_response(row) for row in _rows()], per_page=PAGE_SIZE
+    )
+    assert await _standard(field, page) == await _fast(field, page)
+
+    for label, render in (("standard", _standard), ("fast", _fast)):
+        await _measure(render, field, page, iterations // 10)
+        samples = sorted(await _measure(render, field, page, iterations))
+        p50 = statistics.median(samples) / 1e6
+        p99 = samples[int(len(samples) * 0.99) - 1] / 1e6
+        print(f"{label:>8}: p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
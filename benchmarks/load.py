@@ -0,0 +1,344 @@
+"""
+Load and latency benchmark of the HTTP endpoints.
+
+Requests are driven through the ASGI app in-process, so the numbers cover
+routing, validation, the views and PostgreSQL, but not the network or the
+ASGI server. Point DB_NAME at a dedicated database before seeding:
+
+    python -m benchmarks.load seed --events 100000 --attendees 5000000
+    python -m benchmarks.load run --concurrency 32 --requests 5000 --output after.json
+    python -m benchmarks.load compare before.json after.json
+
+compare exits with status 1 when a scenario regressed beyond --threshold.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+import httpx
+from sqlalchemy import event, text
+from common.config import settings
+from common.database import engine, read_engine
+from event_management.partitions import create_partitions
+
+SCENARIOS = ("create_events", "events", "register_attendee", "attendees")
+BENCH_PREFIX = "Bench event"
+
+
+async def seed(events: int, attendees: int, capacity: int) -> dict:
+    """
+    Insert benchmark events and attendees with server-side generate_series.
+
+    Events start 1 to 365 days from now, in partitions created up front,
+    and attendees are spread evenly over the new events with
+    attendee_count kept in sync.
+
+    Args:
+        events (int): Number of events to insert.
+        attendees (int): Number of attendees to insert.
+        capacity (int): Extra seats per event on top of the seeded attendees.
+
+    Returns:
+        dict: Id range of the seeded events and elapsed seconds.
+    """
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        now = datetime.now(timezone.utc)
+        await create_partitions(conn, now, now + timedelta(days=366))
+        first_id = (await conn.execute(text("SELECT coalesce(max(id), 0) + 1 FROM events"))).scalar()
+        await conn.execute(
+            text(
+                """
+                INSERT INTO events (name, location, start_time, end_time, max_capacity,
+                                    attendee_count, created_at, updated_at)
+                SELECT :prefix || ' ' || g, 'Location ' || (g % 100),
+                       now() + (g % 365 + 1) * interval '1 day',
+                       now() + (g % 365 + 1) * interval '1 day' + interval '3 hours',
+                       :seats, 0, now(), now()
+                FROM generate_series(1, :events) AS g
+                """
+            ),
+            {
+                "prefix": BENCH_PREFIX,
+                "events": events,
+                "seats": capacity + -(-attendees // max(events, 1)),
+            },
+        )
+        last_id = (await conn.execute(text("SELECT max(id) FROM events"))).scalar()
+        if attendees:
+            await conn.execute(
+                text(
+                    """
+                    WITH seeded AS (
+                        SELECT id, start_time, row_number() OVER (ORDER BY id) - 1 AS slot
+                        FROM events WHERE id BETWEEN :first_id AND :last_id
+                    )
+                    INSERT INTO attendees (event_id, event_start_time, name, email, registered_at)
+                    SELECT seeded.id, seeded.start_time, 'Attendee ' || g,
+                           'bench' || g || '@example.com', now() - (g % 86400) * interval '1 second'
+                    FROM generate_series(1, :attendees) AS g
+                    JOIN seeded ON seeded.slot = g % (SELECT count(*) FROM seeded)
+                    """
+                ),
+                {"first_id": first_id, "last_id": last_id, "attendees": attendees},
+            )
+            await conn.execute(
+                text(
+                    """
+                    UPDATE events SET attendee_count = counts.total
+                    FROM (SELECT event_id, count(*) AS total FROM attendees
+                          WHERE event_id BETWEEN :first_id AND :last_id GROUP BY event_id) AS counts
+                    WHERE events.id = counts.event_id
+                    """
+                ),
+                {"first_id": first_id, "last_id": last_id},
+            )
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE events"))
+        await conn.execute(text("ANALYZE attendees"))
+    return {
+        "first_event_id": first_id,
+        "last_event_id": last_id,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+async def _event_ids() -> List[int]:
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT id FROM events WHERE start_time > now() + interval '1 hour' "
+                "AND attendee_count < max_capacity ORDER BY random() LIMIT 1000"
+            )
+        )
+        return result.scalars().all()
+
+
+def _requests(scenario: str, event_ids: List[int]) -> Callable[[], Tuple[str, str, dict]]:
+    """Return a factory of (method, url, json body) for a scenario."""
+
+    def create_events():
+        start_time = datetime.now(timezone.utc) + timedelta(days=random.randint(1, 365))
+        return "POST", "/event/v1/create_events", {
+            "name": f"{BENCH_PREFIX} {uuid.uuid4().hex[:8]}",
+            "location": "Benchmark Hall",
+            "start_time": start_time.isoformat(),
+            "end_time": (start_time + timedelta(hours=3)).isoformat(),
+            "max_capacity": 1000,
+        }
+
+    def events():
+        return "GET", f"/event/v1/events?page={random.randint(1, 20)}&per_page=100", None
+
+    def register_attendee():
+        return "POST", f"/event/v1/{random.choice(event_ids)}/register_attendee", {
+            "name": "Load Tester",
+            "email": f"load-{uuid.uuid4().hex}@example.com",
+        }
+
+    def attendees():
+        return "GET", f"/event/v1/{random.choice(event_ids)}/attendees?per_page=100", None
+
+    return locals()[scenario]
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    index = min(int(len(samples) * fraction), len(samples) - 1)
+    return round(samples[index] * 1000, 3)
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, event_ids: List[int],
+                       concurrency: int, total: int, queries: List[int]) -> dict:
+    """
+    Send total requests of one scenario with concurrency workers.
+
+    Args:
+        client (httpx.AsyncClient): Client bound to the ASGI app.
+        scenario (str): One of SCENARIOS.
+        event_ids (List[int]): Events that still accept registrations.
+        concurrency (int): Number of concurrent workers.
+        total (int): Number of requests to send.
+        queries (List[int]): Single-item counter incremented by the engine listener.
+
+    Returns:
+        dict: Latency percentiles, throughput, error count and queries per request.
+    """
+    make_request = _requests(scenario, event_ids)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            method, url, body = make_request()
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            # Each request acts as a new client, outside any read-your-writes window.
+            client.cookies.clear()
+
+    queries[0] = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": sum(count for code, count in statuses.items() if code >= 400),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "rps": round(total / elapsed, 1),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "queries_per_request": round(queries[0] / total, 3),
+    }
+
+
+async def run(scenarios: List[str], concurrency: int, total: int, warmup: int) -> dict:
+    """
+    Run every scenario against the ASGI app and collect the results.
+
+    Args:
+        scenarios (List[str]): Scenarios to run, in order.
+        concurrency (int): Number of concurrent workers per scenario.
+        total (int): Number of measured requests per scenario.
+        warmup (int): Number of unmeasured requests per scenario sent first.
+
+    Returns:
+        dict: Run metadata and per-scenario results.
+    """
+    from main import app
+
+    queries = [0]
+
+    def count_query(*args):
+        queries[0] += 1
+
+    engines = {engine.sync_engine, read_engine.sync_engine}
+    for sync_engine in engines:
+        event.listen(sync_engine, "before_cursor_execute", count_query)
+
+    event_ids = await _event_ids()
+    if not event_ids:
+        sys.exit("No open events found, run the seed command first")
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario in scenarios:
+            if warmup:
+                await run_scenario(client, scenario, event_ids, concurrency, warmup, queries)
+            results[scenario] = await run_scenario(
+                client, scenario, event_ids, concurrency, total, queries
+            )
+            print(f"{scenario:>18}: {json.dumps(results[scenario])}", file=sys.stderr)
+
+    for sync_engine in engines:
+        event.remove(sync_engine, "before_cursor_execute", count_query)
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "db_profile": settings.DB_PROFILE,
+            "concurrency": concurrency,
+            "requests": total,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(before: dict, after: dict, threshold: float) -> List[str]:
+    """
+    List the regressions of one run against another.
+
+    A scenario regresses when its p95 or p99 latency grows, or its
+    throughput drops, by more than threshold, or when it issues more
+    queries per request or errors.
+
+    Args:
+        before (dict): Output of a baseline run.
+        after (dict): Output of the run under test.
+        threshold (float): Allowed relative change, e.g. 0.1 for 10%.
+
+    Returns:
+        List[str]: One message per regression.
+    """
+    regressions = []
+    for scenario, new in after["scenarios"].items():
+        old = before["scenarios"].get(scenario)
+        if old is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if new[metric] > old[metric] * (1 + threshold):
+                regressions.append(f"{scenario}: {metric} {old[metric]} -> {new[metric]}")
+        if new["rps"] < old["rps"] * (1 - threshold):
+            regressions.append(f"{scenario}: rps {old['rps']} -> {new['rps']}")
+        if new["queries_per_request"] > old["queries_per_request"]:
+            regressions.append(
+                f"{scenario}: queries_per_request {old['queries_per_request']} -> {new['queries_per_request']}"
+            )
+        if new["errors"] > old["errors"]:
+            regressions.append(f"{scenario}: errors {old['errors']} -> {new['errors']}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="insert benchmark data")
+    seed_parser.add_argument("--events", type=int, default=100_000)
+    seed_parser.add_argument("--attendees", type=int, default=5_000_000)
+    seed_parser.add_argument("--capacity", type=int, default=10_000,
+                             help="free seats per event for register_attendee")
+
+    run_parser = commands.add_parser("run", help="drive the endpoints and report latencies")
+    run_parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    run_parser.add_argument("--concurrency", type=int, default=32)
+    run_parser.add_argument("--requests", type=int, default=2000)
+    run_parser.add_argument("--warmup", type=int, default=200)
+    run_parser.add_argument("--output", help="write the JSON report here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two runs")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == "seed":
+        print(json.dumps(asyncio.run(seed(args.events, args.attendees, args.capacity))))
+        return 0
+    if args.command == "run":
+        scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        report = json.dumps(
+            asyncio.run(run(scenarios, args.concurrency, args.requests, args.warmup)), indent=2
+        )
+        if args.output:
+            with open(args.output, "w") as output:
+                output.write(report + "\n")
+        else:
+            print(report)
+        return 0
+
+    with open(args.before) as before, open(args.after) as after:
+        regressions = compare(json.load(before), json.load(after), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of building and rendering a 100-event page of /events.
+
+Compares the previous EventResponse, which inherited the EventBase input
+validators, with the output-only model built by views._event_response.
+No database is needed:
+
+    python -m benchmarks.response_models
+"""
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytz
+from event_management.api.v1.schemas.events import EventBase, PaginatedEventsResponse
+from event_management.views import _event_response
+
+PAGE_SIZE = 100
+
+
+class LegacyEventResponse(EventBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    attendee_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+def _rows():
+    now = datetime.now(pytz.UTC)
+    return [
+        SimpleNamespace(
+            id=index,
+            name=f"Event {index}",
+            location="Bengaluru",
+            start_time=now + timedelta(days=1, minutes=index),
+            end_time=now + timedelta(days=1, hours=2, minutes=index),
+            max_capacity=500,
+            created_at=now,
+            updated_at=now,
+            attendee_count=index,
+        )
+        for index in range(PAGE_SIZE)
+    ]
+
+
+def _legacy_page(rows):
+    # Old path: keyword construction, then FastAPI re-validating the dumped page.
+    events = [
+        LegacyEventResponse(
+            id=row.id,
+            name=row.name,
+            location=row.location,
+            start_time=row.start_time,
+            end_time=row.end_time,
+            max_capacity=row.max_capacity,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            attendee_count=row.attendee_count,
+        )
+        for row in rows
+    ]
+    dumped = [event.model_dump() for event in events]
+    return [LegacyEventResponse.model_validate(event) for event in dumped]
+
+
+def _lean_page(rows):
+    page = PaginatedEventsResponse(
+        events=[_event_response(row) for row in rows], per_page=PAGE_SIZE
+    )
+    return PaginatedEventsResponse.model_validate(page.model_dump())
+
+
+def main(repeat: int = 5, number: int = 200) -> None:
+    rows = _rows()
+    for label, build in (("legacy", _legacy_page), ("lean", _lean_page)):
+        best = min(timeit.repeat(lambda: build(rows), repeat=repeat, number=number))
+        per_page = best / number
+        print(
+            f"{label:>6}: {per_page * 1e3:8.3f} ms/page  "
+            f"{PAGE_SIZE / per_page:12,.0f} events/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Admission control that sheds load before the database pool saturates.
+
+Every request, apart from exempt routes, takes a slot in the gate of its
+priority class, plus the gate of its route when that route has its own
+limit. Requests that cannot get a slot before their class's queue
+deadline are answered with a fast 503 and Retry-After instead of queueing
+for a pooled connection.
+
+The overload signal is the time requests recently spent waiting for a
+pooled connection, kept as a moving average that decays while no samples
+arrive. Once it passes the target, new reads are shed. Writes are only shed
+once it passes write_shed_factor times the target, so registrations keep
+the pool while reads back off.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+from fastapi import status
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from common import metrics
+from common.config import settings
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+# CORS preflights are answered by CORSMiddleware without touching the database.
+EXEMPT_METHODS = frozenset({"OPTIONS"})
+
+
+class ConcurrencyGate:
+    """Concurrency limit with a FIFO queue whose waiters give up at a deadline."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.admitted = 0
+        self.timed_out = 0
+        self.queue_seconds = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        """
+        Take a slot, waiting up to timeout seconds behind earlier requests.
+
+        Args:
+            timeout (float): Longest time to wait in the queue.
+
+        Returns:
+            bool: Whether a slot was taken; release() must follow if so.
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if timeout <= 0:
+            self.timed_out += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        timer = loop.call_later(timeout, self._expire, waiter)
+        try:
+            admitted = await waiter
+        except asyncio.CancelledError:
+            # The client went away; hand back a slot that was already passed on.
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        finally:
+            timer.cancel()
+        self.queue_seconds += time.monotonic() - started
+        if admitted:
+            self.admitted += 1
+        else:
+            self.timed_out += 1
+        return admitted
+
+    def _expire(self, waiter: asyncio.Future) -> None:
+        if not waiter.done():
+            self._waiters.remove(waiter)
+            waiter.set_result(False)
+
+    def release(self) -> None:
+        """Free a slot, passing it straight to the longest waiting request."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "queue_timeouts": self.timed_out,
+            "queue_seconds": round(self.queue_seconds, 6),
+        }
+
+
+class AdmissionController:
+    """
+    Decide which requests run, wait or are shed with 503.
+
+    Requests are classified as "read" (GET and HEAD) or "write", and
+    OPTIONS requests are exempt.
+    Each class has a concurrency limit and a queue deadline, and a route
+    listed in route_limits is also held to its own limit.
+    """
+
+    def __init__(
+        self,
+        read_limit: int = 32,
+        write_limit: int = 64,
+        read_queue_timeout: float = 0.5,
+        write_queue_timeout: float = 2.0,
+        route_limits: Optional[Dict[str, int]] = None,
+        exempt_routes: Iterable[str] = (),
+        pool_wait_target: float = 0.1,
+        write_shed_factor: float = 4.0,
+        pool_wait_half_life: float = 1.0,
+        retry_after: int = 1,
+    ):
+        self.gates = {"read": ConcurrencyGate(read_limit), "write": ConcurrencyGate(write_limit)}
+        self.queue_timeouts = {"read": read_queue_timeout, "write": write_queue_timeout}
+        # Pool wait, as a multiple of the target, above which a class is shed.
+        self.shed_levels = {"read": 1.0, "write": write_shed_factor}
+        self.route_gates = {
+            route: ConcurrencyGate(limit) for route, limit in (route_limits or {}).items()
+        }
+        self.exempt_routes = frozenset(exempt_routes)
+        self.pool_wait_target = pool_wait_target
+        self.pool_wait_half_life = pool_wait_half_life
+        self.retry_after = retry_after
+        self.shed: Dict[str, int] = {"read": 0, "write": 0}
+        self._pool_wait = 0.0
+        self._pool_wait_at = time.monotonic()
+
+    def classify(self, method: str, route: Optional[str]) -> Optional[str]:
+        """Return the priority class of a request, or None if it is exempt."""
+        if route is None or route in self.exempt_routes or method in EXEMPT_METHODS:
+            return None
+        return "read" if method in READ_METHODS else "write"
+
+    @property
+    def pool_wait(self) -> float:
+        """Recent pool wait per request in seconds, halved every pool_wait_half_life idle seconds."""
+        idle = time.monotonic() - self._pool_wait_at
+        return self._pool_wait * 0.5 ** (idle / self.pool_wait_half_life)
+
+    def observe_pool_wait(self, seconds: float, weight: float = 0.2) -> None:
+        """Fold the pool wait of a finished request into the moving average."""
+        self._pool_wait = self.pool_wait + weight * (seconds - self.pool_wait)
+        self._pool_wait_at = time.monotonic()
+
+    def overloaded(self, priority: str) -> bool:
+        return self.pool_wait > self.pool_wait_target * self.shed_levels[priority]
+
+    async def admit(self, priority: str, route: str) -> Optional[Tuple[ConcurrencyGate, ...]]:
+        """
+        Take the slots a request needs before its queue deadline.
+
+        Args:
+            priority (str): Class returned by classify().
+            route (str): Route path template of the request.
+
+        Returns:
+            Optional[Tuple[ConcurrencyGate, ...]]: Gates to release when the request
+            finishes, or None if it was shed.
+        """
+        if self.overloaded(priority):
+            self.shed[priority] += 1
+            return None
+        deadline = time.monotonic() + self.queue_timeouts[priority]
+        taken = []
+        for gate in (self.route_gates.get(route), self.gates[priority]):
+            if gate is None:
+                continue
+            try:
+                admitted = await gate.acquire(deadline - time.monotonic())
+            except BaseException:
+                self.release(taken)
+                raise
+            if not admitted:
+                self.release(taken)
+                self.shed[priority] += 1
+                return None
+            taken.append(gate)
+        return tuple(taken)
+
+    @staticmethod
+    def release(gates: Iterable[ConcurrencyGate]) -> None:
+        for gate in gates:
+            gate.release()
+
+    def shed_response(self) -> JSONResponse:
+        return JSONResponse(
+            {"detail": "Service is overloaded, retry later"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    def stats(self) -> dict:
+        return {
+            "pool_wait_ms": round(self.pool_wait * 1000, 3),
+            "pool_wait_target_ms": round(self.pool_wait_target * 1000, 3),
+            "classes": {
+                priority: {
+                    **gate.stats(),
+                    "shed": self.shed[priority],
+                    "overloaded": self.overloaded(priority),
+                }
+                for priority, gate in self.gates.items()
+            },
+            "routes": {route: gate.stats() for route, gate in self.route_gates.items()},
+        }
+
+
+def _match_route(scope):
+    # Runs before routing, so find the route the router will pick.
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match is Match.FULL:
+            return route
+    return None
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that admits, queues or sheds requests with an AdmissionController.
+
+    Install it inside MetricsMiddleware, which measures the pool wait the
+    controller feeds on and so also counts the shed requests, and inside
+    CORSMiddleware, so shed responses carry the CORS headers.
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = _match_route(scope)
+        route_path = getattr(route, "path", None)
+        priority = self.controller.classify(scope["method"], route_path)
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        gates = await self.controller.admit(priority, route_path)
+        if gates is None:
+            # Label the shed request with its route in the request metrics.
+            scope["route"] = route
+            await self.controller.shed_response()(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(gates)
+            stats = metrics.current_request_stats()
+            # A checkout that timed out waited without running a statement.
+            if stats is not None and (stats.statements or stats.pool_wait_seconds > 0):
+                self.controller.observe_pool_wait(stats.pool_wait_seconds)
+
+
+admission_controller = AdmissionController(
+    read_limit=settings.ADMISSION_READ_CONCURRENCY,
+    write_limit=settings.ADMISSION_WRITE_CONCURRENCY,
+    read_queue_timeout=settings.ADMISSION_READ_QUEUE_TIMEOUT,
+    write_queue_timeout=settings.ADMISSION_WRITE_QUEUE_TIMEOUT,
+    route_limits=settings.ADMISSION_ROUTE_LIMITS,
+    exempt_routes=settings.ADMISSION_EXEMPT_ROUTES,
+    pool_wait_target=settings.ADMISSION_POOL_WAIT_TARGET_MS / 1000,
+    write_shed_factor=settings.ADMISSION_WRITE_SHED_FACTOR,
+    pool_wait_half_life=settings.ADMISSION_POOL_WAIT_HALF_LIFE,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+)
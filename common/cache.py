@@ -0,0 +1,264 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Base class for the response caches, keeping hit/miss statistics.
+
+    Subclasses implement _get, _set, _invalidate and _clear. A failing
+    backend is treated as a miss so the cache can never take an endpoint
+    down. Entries can be stored with tags, and invalidate() drops only the
+    entries with a given tag, while clear() drops everything.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+        self.tag_invalidations = 0
+        # Bumped by every clear and invalidate; see changed_since().
+        self.version = 0
+        self._cleared_at = 0
+        self._tag_versions: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            value = await self._get(key)
+        except Exception:
+            logger.exception("Cache get failed for %s", key)
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        try:
+            await self._set(key, value, ttl, tuple(tags))
+        except Exception:
+            logger.exception("Cache set failed for %s", key)
+            self.errors += 1
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop the entries stored with any of tags, keeping every other entry."""
+        tags = tuple(tags)
+        self.tag_invalidations += 1
+        self.version += 1
+        for tag in tags:
+            self._tag_versions[tag] = self.version
+        try:
+            await self._invalidate(tags)
+        except Exception:
+            logger.exception("Cache invalidation failed for %s", tags)
+            self.errors += 1
+
+    def changed_since(self, version: int, tags: Iterable[str]) -> bool:
+        """
+        Whether this process cleared the cache, or invalidated one of tags, after version was read.
+
+        Args:
+            version (int): Value of version read before loading the value to cache.
+            tags (Iterable[str]): Tags the value would be stored with.
+
+        Returns:
+            bool: True if storing the value could bring back invalidated data.
+        """
+        if self._cleared_at > version:
+            return True
+        return any(self._tag_versions.get(tag, 0) > version for tag in tags)
+
+    async def clear(self) -> None:
+        self.invalidations += 1
+        self.version += 1
+        self._cleared_at = self.version
+        self._tag_versions.clear()
+        try:
+            await self._clear()
+        except Exception:
+            logger.exception("Cache clear failed")
+            self.errors += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "tag_invalidations": self.tag_invalidations,
+        }
+
+    async def _get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def _set(self, key: str, value: Any, ttl: float, tags: Tuple[str, ...]) -> None:
+        pass
+
+    async def _invalidate(self, tags: Tuple[str, ...]) -> None:
+        pass
+
+    async def _clear(self) -> None:
+        pass
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Per-process cache with TTL expiry and least-recently-used eviction.
+
+    Values are stored as-is, so callers must not mutate what they get back.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        super().__init__()
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._tags_by_key: Dict[str, Tuple[str, ...]] = {}
+
+    async def _get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._untag(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def _set(self, key: str, value: Any, ttl: float, tags: Tuple[str, ...]) -> None:
+        self._untag(key)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if tags:
+            self._tags_by_key[key] = tags
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._untag(evicted)
+            self.evictions += 1
+
+    async def _invalidate(self, tags: Tuple[str, ...]) -> None:
+        for tag in tags:
+            for key in self._keys_by_tag.pop(tag, set()):
+                self._entries.pop(key, None)
+                self._untag(key)
+
+    async def _clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._tags_by_key.clear()
+
+    def _untag(self, key: str) -> None:
+        for tag in self._tags_by_key.pop(key, ()):
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by every worker, stored in a Redis-compatible server.
+
+    Entries expire through the server's TTL and eviction policy. Each tag is
+    a set of the keys stored with it, expiring with them. The client only
+    needs the get, set (with ex), sadd, expire, smembers, scan_iter and
+    unlink commands of redis.asyncio.Redis, so tests can pass a local stub.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        client,
+        namespace: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+    ):
+        super().__init__()
+        self.client = client
+        self.namespace = namespace
+        self.dumps = dumps
+        self.loads = loads
+
+    async def _get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(f"{self.namespace}:{key}")
+        return None if raw is None else self.loads(raw)
+
+    async def _set(self, key: str, value: Any, ttl: float, tags: Tuple[str, ...]) -> None:
+        expires = max(int(ttl), 1)
+        await self.client.set(f"{self.namespace}:{key}", self.dumps(value), ex=expires)
+        for tag in tags:
+            await self.client.sadd(self._tag_key(tag), f"{self.namespace}:{key}")
+            await self.client.expire(self._tag_key(tag), expires)
+
+    async def _invalidate(self, tags: Tuple[str, ...]) -> None:
+        for tag in tags:
+            keys = await self.client.smembers(self._tag_key(tag))
+            await self.client.unlink(self._tag_key(tag), *keys)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    async def _clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.namespace}:*")]
+        if keys:
+            await self.client.unlink(*keys)
+
+
+def build_cache(
+    backend: str,
+    namespace: str,
+    max_entries: int,
+    redis_url: str,
+    dumps: Callable[[Any], bytes],
+    loads: Callable[[bytes], Any],
+) -> CacheBackend:
+    """
+    Create the cache backend selected in the settings.
+
+    Args:
+        backend (str): "memory", "redis" or "none".
+        namespace (str): Key prefix of the cache in a shared backend.
+        max_entries (int): Maximum number of entries of the in-memory backend.
+        redis_url (str): Connection URL of the Redis backend.
+        dumps (Callable[[Any], bytes]): Serializer for values stored in Redis.
+        loads (Callable[[bytes], Any]): Deserializer for values read from Redis.
+
+    Returns:
+        CacheBackend: The configured cache.
+    """
+    if backend == "memory":
+        return InMemoryCache(max_entries)
+    if backend == "redis":
+        from redis import asyncio as redis_asyncio
+
+        return RedisCache(redis_asyncio.from_url(redis_url), namespace, dumps, loads)
+    return CacheBackend()
@@ -1,5 +1,40 @@
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
+# Engine settings per DB_PROFILE. Any DB_* setting given explicitly wins.
+DB_PROFILES = {
+    "default": {
+        "echo": False,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "pool_timeout": 30.0,
+        "statement_cache_size": 100,
+        "statement_timeout_ms": 0,
+    },
+    "development": {
+        "echo": True,
+        "pool_size": 2,
+        "max_overflow": 5,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "pool_timeout": 30.0,
+        "statement_cache_size": 100,
+        "statement_timeout_ms": 0,
+    },
+    "production": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "pool_timeout": 5.0,
+        "statement_cache_size": 1024,
+        "statement_timeout_ms": 5000,
+    },
+}
+
 
 class Settings(BaseSettings):
     DB_USER: str
@@ -8,10 +43,126 @@ class Settings(BaseSettings):
     DB_PORT: str
     DB_NAME: str
     TEST_DB_NAME: str
+    DB_PROFILE: str = "default"
+    DB_ECHO: Optional[bool] = None
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_POOL_TIMEOUT: Optional[float] = None
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None
+    DB_APPLICATION_NAME: str = "event_management"
+    # Connections all serve.py workers together may open on one server; None leaves pools as configured.
+    DB_CONNECTION_BUDGET: Optional[int] = None
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[str] = None
+    DB_REPLICA_NAME: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    BULK_REGISTRATION_MAX_ROWS: int = 50000
+    REGISTRATION_COALESCING: bool = False
+    REGISTRATION_BATCH_MAX_SIZE: int = 100
+    REGISTRATION_BATCH_MAX_WAIT_MS: float = 5.0
+    IMPORT_CHUNK_SIZE: int = 10000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    EXPORT_BATCH_SIZE: int = 1000
+    EVENTS_CACHE_BACKEND: str = "memory"
+    EVENTS_CACHE_TTL: float = 5.0
+    EVENTS_CACHE_MAX_ENTRIES: int = 1024
+    UPCOMING_SNAPSHOT_SIZE: int = 500
+    UPCOMING_SNAPSHOT_INTERVAL: float = 5.0
+    UPCOMING_SNAPSHOT_MAX_STALENESS: float = 15.0
+    EVENTS_CACHE_CONTROL: str = "public, max-age=5"
+    # Attendee pages contain email addresses, so shared caches must not keep them.
+    ATTENDEES_CACHE_CONTROL: str = "private, no-cache"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    FAST_JSON_RENDERING: bool = True
+    METRICS_SERVER_TIMING: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: Optional[int] = None
+    IDEMPOTENCY_BACKEND: str = "memory"
+    IDEMPOTENCY_TTL: float = 86400.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 100000
+    PARTITION_MONTHS_AHEAD: int = 12
+    PARTITION_RETENTION_MONTHS: int = 3
+    PARTITION_ARCHIVE_SCHEMA: str = "archive"
+    PARTITION_MAINTENANCE_INTERVAL: float = 3600.0
+    REGISTRATION_JOBS: str = "off"
+    REGISTRATION_OUTBOX_BATCH_SIZE: int = 500
+    REGISTRATION_OUTBOX_POLL_INTERVAL: float = 1.0
+    REGISTRATION_JOB_MAX_RETRIES: int = 5
+    CELERY_BROKER_URL: str = "memory://"
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+    AVAILABILITY_STREAMING: bool = True
+    AVAILABILITY_COALESCE_MS: float = 250.0
+    AVAILABILITY_HEARTBEAT_SECONDS: float = 15.0
+    AVAILABILITY_MAX_SUBSCRIBERS: int = 50000
+    AVAILABILITY_MAX_EVENTS_PER_STREAM: int = 100
+    ADMISSION_CONTROL: bool = True
+    ADMISSION_READ_CONCURRENCY: int = 32
+    ADMISSION_WRITE_CONCURRENCY: int = 64
+    ADMISSION_READ_QUEUE_TIMEOUT: float = 0.5
+    ADMISSION_WRITE_QUEUE_TIMEOUT: float = 2.0
+    # Route path templates with a concurrency limit of their own, as JSON in the environment.
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {"/event/v1/{event_id}/attendees/export": 4}
+    # Never queued or shed: probes, stats and long-lived streams.
+    ADMISSION_EXEMPT_ROUTES: List[str] = [
+        "/event/v1/health_check",
+        "/event/v1/ready",
+        "/event/v1/stats",
+        "/metrics",
+        "/event/v1/availability/stream",
+        "/event/v1/{event_id}/availability/stream",
+    ]
+    ADMISSION_POOL_WAIT_TARGET_MS: float = 100.0
+    ADMISSION_WRITE_SHED_FACTOR: float = 4.0
+    ADMISSION_POOL_WAIT_HALF_LIFE: float = 1.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    WARMUP_ON_STARTUP: bool = True
+    WARMUP_TIMEOUT: float = 30.0
+    # A database request this fast counts as the end of the worker's cold start.
+    WARMUP_FAST_REQUEST_MS: float = 50.0
+    SERVE_HOST: str = "127.0.0.1"
+    SERVE_PORT: int = 8000
+    SERVE_WORKERS: int = 1
+    SERVE_GRACEFUL_TIMEOUT: float = 30.0
+    SERVE_READY_TIMEOUT: float = 60.0
+    # Set by serve.py for its workers, which then write status files there.
+    SERVE_STATUS_DIR: Optional[str] = None
+    SERVE_WORKER_INDEX: int = 0
+    SERVE_STATUS_INTERVAL: float = 1.0
 
     class Config:
         env_file = ".env"
         extra = "allow"
 
+    def db_engine_options(self) -> dict:
+        """
+        Resolve the engine settings of DB_PROFILE with explicit DB_* overrides.
+
+        Raises:
+            ValueError: If DB_PROFILE is not one of DB_PROFILES.
+
+        Returns:
+            dict: Engine settings keyed like the entries of DB_PROFILES.
+        """
+        if self.DB_PROFILE not in DB_PROFILES:
+            raise ValueError(
+                f"Unknown DB_PROFILE {self.DB_PROFILE!r}, expected one of {', '.join(DB_PROFILES)}"
+            )
+        overrides = {
+            "echo": self.DB_ECHO,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            "statement_timeout_ms": self.DB_STATEMENT_TIMEOUT_MS,
+        }
+        options = dict(DB_PROFILES[self.DB_PROFILE])
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        options["application_name"] = self.DB_APPLICATION_NAME
+        return options
+
 
 settings = Settings()
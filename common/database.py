@@ -1,17 +1,153 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    async_sessionmaker,
+    AsyncSession,
+)
 from sqlalchemy.orm import declarative_base
 from typing import AsyncGenerator
+import math
+import time
+from fastapi import Request, Response
 from common.config import settings
+from common.metrics import InstrumentedPool
 
 DATABASE_URL = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+REPLICA_DATABASE_URL = (
+    f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_REPLICA_HOST}:"
+    f"{settings.DB_REPLICA_PORT or settings.DB_PORT}/{settings.DB_REPLICA_NAME or settings.DB_NAME}"
+    if settings.DB_REPLICA_HOST
+    else None
+)
+PRIMARY_STICKY_COOKIE = "em_primary_until"
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+def build_engine(url: str, options: dict) -> AsyncEngine:
+    """
+    Create an async engine from resolved engine settings.
+
+    Args:
+        url (str): asyncpg database URL.
+        options (dict): Output of Settings.db_engine_options().
+
+    Returns:
+        AsyncEngine: Engine with the configured, instrumented pool and per-connection settings.
+    """
+    server_settings = {"application_name": options["application_name"]}
+    if options["statement_timeout_ms"]:
+        server_settings["statement_timeout"] = str(options["statement_timeout_ms"])
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        echo=options["echo"],
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        pool_recycle=options["pool_recycle"],
+        pool_pre_ping=options["pool_pre_ping"],
+        pool_timeout=options["pool_timeout"],
+        connect_args={
+            "statement_cache_size": options["statement_cache_size"],
+            "server_settings": server_settings,
+        },
+    )
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """
+    Report how much of an engine's connection pool is in use.
+
+    Args:
+        engine (AsyncEngine): Engine created by build_engine.
+
+    Returns:
+        dict: Pool size, connections checked in and out, overflow in use and utilization.
+    """
+    pool = engine.pool
+    capacity = pool.size() + max(pool.max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "max_overflow": pool.max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "utilization": round(checked_out / capacity, 4) if capacity else 0.0,
+    }
+
+
+engine = build_engine(DATABASE_URL, settings.db_engine_options())
+read_engine = (
+    build_engine(REPLICA_DATABASE_URL, settings.db_engine_options())
+    if REPLICA_DATABASE_URL
+    else engine
+)
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+read_session_maker = async_sessionmaker(bind=read_engine, expire_on_commit=False)
 
 Base = declarative_base()
 
 
+def mark_primary_sticky(response: Response) -> None:
+    """
+    Pin the client's reads to the primary for READ_YOUR_WRITES_SECONDS.
+
+    Write endpoints call this so that a client sees its own changes even
+    while the replica is lagging.
+
+    Args:
+        response (Response): Response of the write request.
+    """
+    window = settings.READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        PRIMARY_STICKY_COOKIE,
+        f"{time.time() + window:.3f}",
+        max_age=math.ceil(window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def reads_use_primary(request: Request) -> bool:
+    """
+    Check whether a client wrote recently enough to read from the primary.
+
+    Args:
+        request (Request): Incoming read request.
+
+    Returns:
+        bool: True while the client's read-your-writes window is open.
+    """
+    try:
+        return float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def select_session_maker(
+    request: Request,
+    primary: async_sessionmaker = async_session_maker,
+    replica: async_sessionmaker = read_session_maker,
+) -> async_sessionmaker:
+    """
+    Pick the session factory that should serve a read request.
+
+    Args:
+        request (Request): Incoming read request.
+        primary (async_sessionmaker, optional): Factory bound to the primary.
+        replica (async_sessionmaker, optional): Factory bound to the read replica.
+
+    Returns:
+        async_sessionmaker: The primary factory inside a read-your-writes window, otherwise the replica one.
+    """
+    return primary if reads_use_primary(request) else replica
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with select_session_maker(request)() as session:
+        yield session
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, NamedTuple, Tuple
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from common.cache import CacheBackend
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: int
+    body: bytes
+
+
+def dump_stored_response(stored: StoredResponse) -> bytes:
+    return json.dumps(
+        [stored.fingerprint, stored.status_code, stored.body.decode()]
+    ).encode()
+
+
+def load_stored_response(raw: bytes) -> StoredResponse:
+    fingerprint, status_code, body = json.loads(raw)
+    return StoredResponse(fingerprint, status_code, body.encode())
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    """
+    Hash a request body so a reused key can be told apart from a retry.
+
+    Args:
+        payload (BaseModel): Validated request body.
+
+    Returns:
+        str: Hex digest of the body's JSON form.
+    """
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+class IdempotencyGuard:
+    """
+    Run a write at most once per Idempotency-Key and replay its response.
+
+    Completed responses, including 4xx errors, are kept in a CacheBackend
+    for ttl seconds. Requests that arrive with a key whose write is still
+    running in this process wait for it instead of running it again.
+    """
+
+    def __init__(self, store: CacheBackend, ttl: float):
+        self.store = store
+        self.ttl = ttl
+        self.replays = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[BaseModel]],
+        status_code: int,
+    ) -> Tuple[StoredResponse, bool]:
+        """
+        Return the stored response for key, or run operation and store it.
+
+        Args:
+            key (str): Idempotency key, scoped to the endpoint by the caller.
+            fingerprint (str): request_fingerprint of the request body.
+            operation (Callable[[], Awaitable[BaseModel]]): The write to run once.
+            status_code (int): Status code of a successful operation.
+
+        Raises:
+            HTTPException: If the key was used with a different request body.
+
+        Returns:
+            Tuple[StoredResponse, bool]: The response, and whether it was replayed.
+        """
+        while True:
+            stored = await self.store.get(key)
+            if stored is None:
+                inflight = self._inflight.get(key)
+                if inflight is None:
+                    break
+                # A failed original leaves nothing stored, so loop and run it here.
+                await asyncio.shield(inflight)
+                continue
+            if stored.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used with a different request",
+                )
+            self.replays += 1
+            return stored, True
+
+        done = asyncio.get_running_loop().create_future()
+        self._inflight[key] = done
+        try:
+            try:
+                result = await operation()
+                stored = StoredResponse(
+                    fingerprint, status_code, result.model_dump_json().encode()
+                )
+            except HTTPException as exc:
+                if exc.status_code >= 500:
+                    raise
+                stored = StoredResponse(
+                    fingerprint, exc.status_code, json.dumps({"detail": exc.detail}, separators=(",", ":")).encode()
+                )
+            await self.store.set(key, stored, self.ttl)
+            return stored, False
+        finally:
+            del self._inflight[key]
+            done.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            **self.store.stats(),
+            "replays": self.replays,
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,309 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestStats:
+    """Database work done on behalf of one HTTP request."""
+
+    __slots__ = ("statements", "db_seconds", "pool_wait_seconds", "rows", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.rows = 0
+        self.shapes: Counter = Counter()
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Return the stats of the request being handled, if MetricsMiddleware is tracking one."""
+    return _current_request.get()
+
+
+class Histogram:
+    """Cumulative Prometheus histogram for one label set."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def samples(self, name: str, labels: str) -> Iterable[str]:
+        for bound, count in zip(self.buckets, self.counts):
+            yield f'{name}_bucket{{{labels},le="{bound:g}"}} {count}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.sum:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class MetricsRegistry:
+    """
+    Per-route request and SQL metrics rendered in Prometheus text format.
+
+    Labels are limited to the method, the route template and the status
+    code, so the number of series stays bounded. Also records how long after
+    start-up the first request that used the database finished within
+    fast_request_seconds, which measures the worker's cold start.
+    """
+
+    def __init__(self, fast_request_seconds: float = 0.05):
+        self.started_at = time.monotonic()
+        self.fast_request_seconds = fast_request_seconds
+        self.first_fast_request_seconds: Optional[float] = None
+        self.requests: Dict[Tuple[str, str, int], int] = Counter()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.statements_per_request: Dict[Tuple[str, str], Histogram] = {}
+        self.statements: Dict[Tuple[str, str], int] = Counter()
+        self.db_seconds: Dict[Tuple[str, str], float] = Counter()
+        self.pool_wait_seconds: Dict[Tuple[str, str], float] = Counter()
+        self.rows: Dict[Tuple[str, str], int] = Counter()
+        self.n_plus_one: Dict[Tuple[str, str], int] = Counter()
+        self.engines: Dict[str, AsyncEngine] = {}
+
+    def record(self, method: str, route: str, status_code: int, seconds: float,
+               stats: RequestStats) -> None:
+        key = (method, route)
+        self.requests[(method, route, status_code)] += 1
+        self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+        self.statements_per_request.setdefault(key, Histogram(STATEMENT_BUCKETS)).observe(
+            stats.statements
+        )
+        self.statements[key] += stats.statements
+        self.db_seconds[key] += stats.db_seconds
+        self.pool_wait_seconds[key] += stats.pool_wait_seconds
+        self.rows[key] += stats.rows
+        if (
+            self.first_fast_request_seconds is None
+            and stats.statements
+            and status_code < 500
+            and seconds <= self.fast_request_seconds
+        ):
+            self.first_fast_request_seconds = time.monotonic() - self.started_at
+
+    def request_summary(self) -> dict:
+        """Totals over all routes: requests, 5xx responses and mean latency."""
+        count = sum(histogram.count for histogram in self.latency.values())
+        seconds = sum(histogram.sum for histogram in self.latency.values())
+        return {
+            "requests": sum(self.requests.values()),
+            "errors": sum(value for (_, _, code), value in self.requests.items() if code >= 500),
+            "mean_latency_ms": round(seconds / count * 1000, 3) if count else None,
+        }
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("http_requests_total", "counter", "HTTP requests by route and status code.")
+        for (method, route, code), value in sorted(self.requests.items()):
+            lines.append(f'http_requests_total{{{_labels(method, route)},status="{code}"}} {value}')
+
+        family("http_request_duration_seconds", "histogram", "HTTP request latency by route.")
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines.extend(histogram.samples("http_request_duration_seconds", _labels(method, route)))
+
+        family("db_statements_per_request", "histogram", "SQL statements run by one request.")
+        for (method, route), histogram in sorted(self.statements_per_request.items()):
+            lines.extend(histogram.samples("db_statements_per_request", _labels(method, route)))
+
+        for name, values, help_text in (
+            ("db_statements_total", self.statements, "SQL statements run by route."),
+            ("db_query_seconds_total", self.db_seconds, "Time spent executing SQL by route."),
+            ("db_pool_wait_seconds_total", self.pool_wait_seconds,
+             "Time spent waiting for a pooled connection by route."),
+            ("db_rows_total", self.rows, "Rows returned or affected by SQL by route."),
+            ("db_n_plus_one_total", self.n_plus_one,
+             "Requests that repeated one statement more than SQL_N_PLUS_ONE_THRESHOLD times."),
+        ):
+            family(name, "counter", help_text)
+            for (method, route), value in sorted(values.items()):
+                formatted = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f"{name}{{{_labels(method, route)}}} {formatted}")
+
+        if self.first_fast_request_seconds is not None:
+            family("process_first_fast_request_seconds", "gauge",
+                   "Time from start-up until a database request first finished quickly.")
+            lines.append(f"process_first_fast_request_seconds {self.first_fast_request_seconds:.6f}")
+
+        family("db_pool_connections", "gauge", "Connections of each engine's pool by state.")
+        for engine_name, engine in sorted(self.engines.items()):
+            pool = engine.pool
+            for state, value in (
+                ("checked_out", pool.checkedout()),
+                ("checked_in", pool.checkedin()),
+                ("overflow", max(pool.overflow(), 0)),
+            ):
+                lines.append(f'db_pool_connections{{engine="{engine_name}",state="{state}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+registry = MetricsRegistry(fast_request_seconds=settings.WARMUP_FAST_REQUEST_MS / 1000)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that charges the time spent waiting for a connection to the request."""
+
+    def __init__(self, creator, max_overflow: int = 10, **kwargs):
+        super().__init__(creator, max_overflow=max_overflow, **kwargs)
+        # Kept for pool_status(); QueuePool only stores it privately.
+        self.max_overflow = max_overflow
+
+    def _do_get(self):
+        stats = _current_request.get()
+        if stats is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats.pool_wait_seconds += time.perf_counter() - started
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_request.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    if stats is None:
+        return
+    started = conn.info["query_started_at"].pop()
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - started
+    stats.rows += max(cursor.rowcount, 0)
+    stats.shapes[statement] += 1
+
+
+def instrument_engine(name: str, engine: AsyncEngine, metrics: MetricsRegistry = registry) -> None:
+    """
+    Attribute an engine's SQL statements to the request that runs them.
+
+    Args:
+        name (str): Label of the engine in db_pool_connections.
+        engine (AsyncEngine): Engine to instrument; instrumenting it twice is a no-op.
+        metrics (MetricsRegistry, optional): Registry reporting the engine's pool.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    metrics.engines.setdefault(name, engine)
+
+
+def server_timing(stats: RequestStats, app_seconds: float) -> str:
+    """
+    Format a request's timings for the Server-Timing response header.
+
+    Args:
+        stats (RequestStats): Database work of the request.
+        app_seconds (float): Time from receiving the request to sending the headers.
+
+    Returns:
+        str: Header value with db, pool and app entries in milliseconds.
+    """
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} queries", '
+        f"pool;dur={stats.pool_wait_seconds * 1000:.2f}, "
+        f"app;dur={app_seconds * 1000:.2f}"
+    )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that records per-route latency and SQL metrics.
+
+    Optionally adds a Server-Timing header and logs a warning when one
+    request runs the same statement more than n_plus_one_threshold times.
+    """
+
+    def __init__(self, app, server_timing: bool = False,
+                 n_plus_one_threshold: Optional[int] = None,
+                 metrics: MetricsRegistry = registry):
+        self.app = app
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    timing = server_timing(stats, time.perf_counter() - started)
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", timing.encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_request.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "<unmatched>")
+            self.metrics.record(
+                scope["method"], route_path, status_code, time.perf_counter() - started, stats
+            )
+            self._check_n_plus_one(scope["method"], route_path, stats)
+
+    def _check_n_plus_one(self, method: str, route: str, stats: RequestStats) -> None:
+        if self.n_plus_one_threshold is None or not stats.shapes:
+            return
+        statement, count = stats.shapes.most_common(1)[0]
+        if count > self.n_plus_one_threshold:
+            self.metrics.n_plus_one[(method, route)] += 1
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                method,
+                route,
+                count,
+                " ".join(statement.split())[:200],
+            )
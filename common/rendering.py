@@ -0,0 +1,155 @@
+import functools
+import hashlib
+import inspect
+from typing import Callable, Optional
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from common.config import settings
+
+
+def render_json(model: BaseModel, exclude_none: bool = False, status_code: int = 200) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+
+    pydantic-core writes the bytes in one pass, producing the same output as
+    response_model validation followed by FastAPI's JSONResponse.
+
+    Args:
+        model (BaseModel): Response model built by a view.
+        exclude_none (bool, optional): Drop fields that are None, like response_model_exclude_none.
+        status_code (int, optional): Status code of the response. Defaults to 200.
+
+    Returns:
+        Response: Raw application/json response.
+    """
+    return Response(
+        model.model_dump_json(exclude_none=exclude_none),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong entity tag from the values a representation depends on.
+
+    Args:
+        *parts: Bytes or values whose str() identifies the representation.
+
+    Returns:
+        str: Quoted entity tag.
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compare an If-None-Match header with an entity tag, weakly as RFC 9110 requires."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def _merge_injected_headers(response: Response, kwargs: dict) -> None:
+    # Keep headers and cookies the endpoint set on its injected Response.
+    for value in kwargs.values():
+        if isinstance(value, Response):
+            response.headers.raw.extend(value.headers.raw)
+
+
+def fast_json(exclude_none: bool = False, enabled: Optional[bool] = None) -> Callable:
+    """
+    Render a route's response model with render_json.
+
+    Skips FastAPI's second validation and jsonable_encoder pass over the
+    result. The route keeps its response_model for the OpenAPI schema.
+
+    Args:
+        exclude_none (bool, optional): Must match the route's response_model_exclude_none.
+        enabled (bool, optional): Per-route switch; defaults to the FAST_JSON_RENDERING setting.
+
+    Returns:
+        Callable: Decorator for an async endpoint.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            active = settings.FAST_JSON_RENDERING if enabled is None else enabled
+            if not active or not isinstance(result, BaseModel):
+                return result
+            response = render_json(result, exclude_none=exclude_none)
+            _merge_injected_headers(response, kwargs)
+            return response
+
+        # FastAPI resolves string annotations against the wrapper's module, so
+        # hand it the endpoint's signature with annotations already evaluated.
+        wrapper.__signature__ = inspect.signature(endpoint, eval_str=True)
+        return wrapper
+
+    return decorator
+
+
+def conditional_get(cache_control: str, exclude_none: bool = False) -> Callable:
+    """
+    Answer a GET route's If-None-Match with a bodyless 304.
+
+    A 200 response keeps the ETag the endpoint set on its injected Response,
+    usually a validator computed before the page query, or otherwise gets a
+    hash of its body. An endpoint can also return not_modified() itself
+    once its validator matches. Responses without a Cache-Control header
+    get cache_control. Apply it above fast_json, which does the rendering
+    while FAST_JSON_RENDERING is on; otherwise models are rendered the
+    standard way, with jsonable_encoder and JSONResponse. The endpoint must
+    take the Request.
+
+    Args:
+        cache_control (str): Default Cache-Control of 200 and 304 responses.
+        exclude_none (bool, optional): Must match the route's response_model_exclude_none.
+
+    Returns:
+        Callable: Decorator for an async endpoint.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, BaseModel):
+                # fast_json is switched off for this route, so keep FastAPI's rendering.
+                result = JSONResponse(jsonable_encoder(result, exclude_none=exclude_none))
+                _merge_injected_headers(result, kwargs)
+            if not isinstance(result, Response):
+                return result
+            if result.status_code == status.HTTP_200_OK:
+                etag = result.headers.get("etag")
+                if etag is None:
+                    etag = make_etag(result.body)
+                    result.headers["ETag"] = etag
+                request = next(value for value in kwargs.values() if isinstance(value, Request))
+                if etag_matches(request.headers.get("if-none-match"), etag):
+                    response = not_modified(etag)
+                    if "cache-control" in result.headers:
+                        response.headers["Cache-Control"] = result.headers["cache-control"]
+                    result = response
+            if result.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+                result.headers.setdefault("Cache-Control", cache_control)
+            return result
+
+        wrapper.__signature__ = inspect.signature(endpoint, eval_str=True)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,154 @@
+"""
+Connection budgeting and status files for multi-worker serving.
+
+serve.py runs several worker processes against the same PostgreSQL
+server. connection_budget() splits one global connection budget into each
+worker's pool_size and max_overflow, require_shared_backends() refuses
+backends that keep state per process, and every worker writes its pool and
+request statistics to a status file with WorkerStatusReporter, so
+`python serve.py status` can report on all of them.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def connection_budget(
+    budget: int, workers: int, pool_size: int, reserved_per_worker: int = 0
+) -> Tuple[int, int]:
+    """
+    Split a connection budget across workers.
+
+    Each worker keeps its profile's pool_size where the budget allows, and
+    the rest of its share becomes max_overflow, so the workers together
+    never open more than budget connections.
+
+    Args:
+        budget (int): Connections the whole deployment may open on one server.
+        workers (int): Number of worker processes.
+        pool_size (int): Preferred pool_size of each worker.
+        reserved_per_worker (int, optional): Connections each worker opens outside its pool.
+
+    Raises:
+        ValueError: If the budget leaves a worker without a single pooled connection.
+
+    Returns:
+        Tuple[int, int]: pool_size and max_overflow of each worker.
+    """
+    per_worker = budget // workers - reserved_per_worker
+    if per_worker < 1:
+        raise ValueError(
+            f"A budget of {budget} connections cannot serve {workers} workers "
+            f"with {reserved_per_worker} reserved connections each"
+        )
+    size = min(pool_size, per_worker)
+    return size, per_worker - size
+
+
+def require_shared_backends(workers: int, backends: Dict[str, str]) -> None:
+    """
+    Refuse per-process state backends when several workers serve the API.
+
+    With the "memory" backends each worker keeps its own idempotency keys
+    and events cache. A retried request that reaches another worker would
+    run its write again, and a write would only clear the cache of the
+    worker that handled it.
+
+    Args:
+        workers (int): Number of worker processes.
+        backends (Dict[str, str]): Backend settings by name, e.g. IDEMPOTENCY_BACKEND.
+
+    Raises:
+        ValueError: If more than one worker would use a "memory" backend.
+    """
+    per_process = [name for name, backend in backends.items() if backend == "memory"]
+    if workers > 1 and per_process:
+        raise ValueError(
+            f"{workers} workers cannot share state with "
+            f"{', '.join(f'{name}=memory' for name in per_process)}; "
+            "set them to redis, with REDIS_URL, or run a single worker"
+        )
+
+
+def read_status_files(directory: str) -> list:
+    """
+    Read the status files of a deployment's workers.
+
+    Args:
+        directory (str): Status directory given to serve.py.
+
+    Returns:
+        list: One dict per worker file, ordered by worker index, each with an
+        "alive" flag that is False when its process is gone.
+    """
+    statuses = []
+    for path in sorted(Path(directory).glob("worker-*.json")):
+        try:
+            status = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        status["alive"] = _process_alive(status.get("pid"))
+        statuses.append(status)
+    return sorted(statuses, key=lambda status: status.get("worker", 0))
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class WorkerStatusReporter:
+    """Write this worker's statistics to a JSON file every interval_seconds."""
+
+    def __init__(self, path: str, collect: Callable[[], dict], interval_seconds: float = 1.0):
+        self.path = Path(path)
+        self.collect = collect
+        self.interval_seconds = interval_seconds
+        self.writes = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def write(self) -> None:
+        """Replace the status file atomically, so readers never see half of it."""
+        status = {"pid": os.getpid(), "updated_at": time.time(), **self.collect()}
+        temporary = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_text(json.dumps(status, default=str))
+            os.replace(temporary, self.path)
+            self.writes += 1
+        except OSError:
+            self.failures += 1
+            logger.exception("Writing the worker status file %s failed", self.path)
+
+    async def _loop(self) -> None:
+        while True:
+            self.write()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {"path": str(self.path), "writes": self.writes, "failures": self.failures}
@@ -1,21 +1,84 @@
 from __future__ import annotations
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import pytz
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from common.database import get_db
-from event_management import views
+from common.admission import admission_controller
+from common.cache import build_cache
+from common.config import settings
+from common.database import (
+    engine,
+    get_db,
+    get_read_db,
+    mark_primary_sticky,
+    pool_status,
+    reads_use_primary,
+    select_session_maker,
+)
+from common.rendering import conditional_get, etag_matches, fast_json, make_etag, not_modified
+from common.idempotency import (
+    IdempotencyGuard,
+    StoredResponse,
+    dump_stored_response,
+    load_stored_response,
+    request_fingerprint,
+)
+from event_management import availability, exporter, importer, views
+from event_management.coalescer import registration_coalescer
+from event_management.jobs import registration_jobs
+from event_management.partitions import partition_maintainer
+from event_management.warmup import warmup
 from event_management.api.v1.schemas.events import (
     AttendeeCreate,
     AttendeeResponse,
+    BulkRegistrationResponse,
     EventCreate,
     EventResponse,
+    ImportReport,
     PaginatedAttendeesResponse,
     PaginatedEventsResponse,
 )
 
 event_management_router = APIRouter()
 
+idempotency_guard = IdempotencyGuard(
+    build_cache(
+        settings.IDEMPOTENCY_BACKEND,
+        namespace="idempotency",
+        max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+        redis_url=settings.REDIS_URL,
+        dumps=dump_stored_response,
+        loads=load_stored_response,
+    ),
+    ttl=settings.IDEMPOTENCY_TTL,
+)
+
+
+def _idempotent_response(stored: StoredResponse, replayed: bool) -> Response:
+    response = Response(
+        content=stored.body, status_code=stored.status_code, media_type="application/json"
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    if stored.status_code < 400:
+        mark_primary_sticky(response)
+    return response
+
 
 @event_management_router.get("/health_check")
 async def health_check():
@@ -28,15 +91,69 @@ async def health_check():
     return {"status": "active", "message": "Event Management Service is up and running"}
 
 
+@event_management_router.get("/ready")
+async def readiness_check(response: Response):
+    """
+    Readiness probe that fails until the worker has finished warming up.
+
+    Unlike health_check, which only shows the process is alive, this keeps
+    a new worker out of rotation while its pool and statements are cold.
+
+    Args:
+        response (Response): Response whose status is set to 503 while warming up.
+
+    Returns:
+        dict: Readiness and warm-up timings, including the cold start to the first fast request.
+    """
+    if not warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return warmup.stats()
+
+
+@event_management_router.get("/stats")
+async def service_stats():
+    """
+    Report runtime statistics of the service's caches and database pool.
+
+    Returns:
+        dict: Hit/miss statistics of the upcoming events snapshot and cache, pool utilization,
+              batch statistics of coalesced registrations, idempotent replays,
+              partition maintenance runs, the registration job pipeline,
+              seat availability streams, admission control and start-up warm-up.
+    """
+    return {
+        "events_cache": views.events_cache.stats(),
+        "upcoming_snapshot": views.upcoming_snapshot.stats(),
+        "database_pool": pool_status(engine),
+        "registration_batches": registration_coalescer.stats(),
+        "idempotency": idempotency_guard.stats(),
+        "partitions": partition_maintainer.stats(),
+        "registration_jobs": registration_jobs.stats(),
+        "availability": availability.availability_hub.stats(),
+        "admission": admission_controller.stats(),
+        "warmup": warmup.stats(),
+    }
+
+
 @event_management_router.post(
     "/create_events", response_model=EventResponse, status_code=status.HTTP_201_CREATED
 )
-async def create_event(event_data: EventCreate, db: AsyncSession = Depends(get_db)):
+async def create_event(
+    event_data: EventCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: AsyncSession = Depends(get_db),
+):
     """
     Create a new event.
 
+    A retry with the same Idempotency-Key gets the original response
+    without creating another event.
+
     Args:
         event_data (EventCreate): The data required to create a new event.
+        response (Response): Outgoing response, used to pin the client's reads to the primary.
+        idempotency_key (str, optional): Client-chosen key identifying this request across retries.
         db (AsyncSession, optional): Async database session dependency.
 
     Returns:
@@ -45,31 +162,120 @@ async def create_event(event_data: EventCreate, db: AsyncSession = Depends(get_d
     Raises:
         HTTPException: If event creation fails due to validation or database errors.
     """
-    return await views.EventService.create_event(db, event_data)
+    if idempotency_key is not None:
+
+        async def create():
+            event = await views.EventService.create_event(db, event_data)
+            return EventResponse.model_validate(event)
+
+        stored, replayed = await idempotency_guard.execute(
+            f"create_events:{idempotency_key}",
+            request_fingerprint(event_data),
+            create,
+            status.HTTP_201_CREATED,
+        )
+        return _idempotent_response(stored, replayed)
+
+    event = await views.EventService.create_event(db, event_data)
+    mark_primary_sticky(response)
+    return event
 
 
-@event_management_router.get("/events", response_model=PaginatedEventsResponse)
+@event_management_router.get(
+    "/events",
+    response_model=PaginatedEventsResponse,
+    response_model_exclude_none=True,
+)
+@conditional_get(settings.EVENTS_CACHE_CONTROL, exclude_none=True)
+@fast_json(exclude_none=True)
 async def fetch_upcoming_events(
+    request: Request,
+    response: Response,
     timezone: str = Query(
         "Asia/Kolkata", description="Timezone for filtering upcoming events"
     ),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor; pass an empty value to start without totals",
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Fetch a paginated list of upcoming events filtered by timezone.
 
+    Served from the read replica, or from the primary without the cache
+    during the client's read-your-writes window. Pages in the upcoming
+    events snapshot are validated against If-None-Match before any page is
+    built; other pages get an ETag hashed from their body.
+
     Args:
+        request (Request): Incoming request, used to route the read and check If-None-Match.
+        response (Response): Response whose ETag and Cache-Control headers are set.
         timezone (str, optional): Timezone to filter events. Defaults to "Asia/Kolkata".
         page (int, optional): Page number for pagination. Defaults to 1.
         per_page (int, optional): Number of events per page (max 100). Defaults to 10.
+        cursor (str, optional): Keyset cursor; when given, page is ignored and totals are omitted.
         db (AsyncSession, optional): Async database session dependency.
 
     Returns:
         PaginatedEventsResponse: Paginated list of upcoming events.
     """
-    return await views.EventService.fetch_upcoming_events(db, timezone, page, per_page)
+    use_cache = not reads_use_primary(request)
+    if not use_cache:
+        # This client's own writes must not be hidden behind a shared cache.
+        response.headers["Cache-Control"] = "private, no-cache"
+    elif cursor is None:
+        etag = views.upcoming_snapshot.etag(
+            datetime.now(pytz.timezone(timezone)), page, per_page
+        )
+        if etag is not None:
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified(etag)
+            response.headers["ETag"] = etag
+    return await views.EventService.fetch_upcoming_events(
+        db, timezone, page, per_page, cursor, use_cache=use_cache
+    )
+
+
+@event_management_router.get(
+    "/events/search",
+    response_model=PaginatedEventsResponse,
+    response_model_exclude_none=True,
+)
+@fast_json(exclude_none=True)
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match in name or location"),
+    starts_after: Optional[datetime] = Query(
+        None, description="Only events starting after this time (defaults to now)"
+    ),
+    starts_before: Optional[datetime] = Query(
+        None, description="Only events starting before this time"
+    ),
+    min_seats: int = Query(0, ge=0, description="Minimum seats remaining"),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(10, ge=1, le=100, description="Items per page"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Search upcoming events by name and location, best match first.
+
+    Args:
+        q (str): Words that must all appear in the name or location.
+        starts_after (datetime, optional): Lower bound of start_time, naive values are Asia/Kolkata.
+        starts_before (datetime, optional): Upper bound of start_time, naive values are Asia/Kolkata.
+        min_seats (int, optional): Minimum seats remaining. Defaults to 0.
+        page (int, optional): Page number for pagination. Defaults to 1.
+        per_page (int, optional): Number of events per page (max 100). Defaults to 10.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        PaginatedEventsResponse: Ranked page of matching events.
+    """
+    return await views.EventService.search_events(
+        db, q, starts_after, starts_before, min_seats, page, per_page
+    )
 
 
 @event_management_router.post(
@@ -78,14 +284,25 @@ async def fetch_upcoming_events(
     status_code=status.HTTP_201_CREATED,
 )
 async def register_attendee(
-    event_id: int, attendee_data: AttendeeCreate, db: AsyncSession = Depends(get_db)
+    event_id: int,
+    attendee_data: AttendeeCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Register a new attendee for a specific event.
 
+    With REGISTRATION_COALESCING enabled, the registration is applied in a
+    batch together with concurrent registrations for the same event. A
+    retry with the same Idempotency-Key gets the original response, or the
+    original error, without touching the database.
+
     Args:
         event_id (int): The ID of the event to register for.
         attendee_data (AttendeeCreate): The data of the attendee to register.
+        response (Response): Outgoing response, used to pin the client's reads to the primary.
+        idempotency_key (str, optional): Client-chosen key identifying this request across retries.
         db (AsyncSession, optional): Async database session dependency.
 
     Returns:
@@ -94,31 +311,269 @@ async def register_attendee(
     Raises:
         HTTPException: If the event does not exist or registration fails.
     """
-    return await views.EventService.register_attendee(db, event_id, attendee_data)
+
+    async def register():
+        if settings.REGISTRATION_COALESCING:
+            return await registration_coalescer.submit(event_id, attendee_data)
+        return await views.EventService.register_attendee(db, event_id, attendee_data)
+
+    if idempotency_key is not None:
+        stored, replayed = await idempotency_guard.execute(
+            f"register_attendee:{event_id}:{idempotency_key}",
+            request_fingerprint(attendee_data),
+            register,
+            status.HTTP_201_CREATED,
+        )
+        return _idempotent_response(stored, replayed)
+
+    attendee = await register()
+    mark_primary_sticky(response)
+    return attendee
+
+
+@event_management_router.post(
+    "/{event_id}/register_attendees", response_model=BulkRegistrationResponse
+)
+@fast_json()
+async def register_attendees(
+    event_id: int,
+    response: Response,
+    attendees_data: List[AttendeeCreate] = Body(
+        ..., min_length=1, max_length=settings.BULK_REGISTRATION_MAX_ROWS
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Register a batch of attendees for a specific event.
+
+    Args:
+        event_id (int): The ID of the event to register for.
+        response (Response): Outgoing response, used to pin the client's reads to the primary.
+        attendees_data (List[AttendeeCreate]): The attendees to register, in priority order.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        BulkRegistrationResponse: Per-row status (created, duplicate or over_capacity) and totals.
+
+    Raises:
+        HTTPException: If the event does not exist or has already started.
+    """
+    results = await views.EventService.register_attendees(db, event_id, attendees_data)
+    mark_primary_sticky(response)
+    return results
+
+
+@event_management_router.post("/import_events", response_model=ImportReport)
+async def import_events(
+    response: Response,
+    file: UploadFile = File(..., description="CSV, XLSX or NDJSON file of events"),
+    file_format: Optional[str] = Query(
+        None, alias="format", description="csv, xlsx or ndjson; defaults to the file extension"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import events from an uploaded file.
+
+    Args:
+        response (Response): Outgoing response, used to pin the client's reads to the primary.
+        file (UploadFile): File with name, location, start_time, end_time and max_capacity columns.
+        file_format (str, optional): Format of the file; detected from the file name when omitted.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        ImportReport: Number of processed, imported and failed rows with row errors.
+
+    Raises:
+        HTTPException: If the format is unsupported or required columns are missing.
+    """
+    file_format = importer.detect_format(file.filename, file_format)
+    report = await views.EventService.import_events(db, file.file, file_format)
+    mark_primary_sticky(response)
+    return report
+
+
+@event_management_router.post("/{event_id}/import_attendees", response_model=ImportReport)
+async def import_attendees(
+    event_id: int,
+    response: Response,
+    file: UploadFile = File(..., description="CSV, XLSX or NDJSON file of attendees"),
+    file_format: Optional[str] = Query(
+        None, alias="format", description="csv, xlsx or ndjson; defaults to the file extension"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Import attendees for a specific event from an uploaded file.
+
+    Args:
+        event_id (int): The ID of the event to register the attendees for.
+        response (Response): Outgoing response, used to pin the client's reads to the primary.
+        file (UploadFile): File with name and email columns.
+        file_format (str, optional): Format of the file; detected from the file name when omitted.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        ImportReport: Number of processed, imported and failed rows with row errors.
+
+    Raises:
+        HTTPException: If the format is unsupported, required columns are missing or the event cannot take registrations.
+    """
+    file_format = importer.detect_format(file.filename, file_format)
+    report = await views.EventService.import_attendees(db, event_id, file.file, file_format)
+    mark_primary_sticky(response)
+    return report
 
 
 @event_management_router.get(
-    "/{event_id}/attendees", response_model=PaginatedAttendeesResponse
+    "/{event_id}/attendees",
+    response_model=PaginatedAttendeesResponse,
+    response_model_exclude_none=True,
 )
+@conditional_get(settings.ATTENDEES_CACHE_CONTROL, exclude_none=True)
+@fast_json(exclude_none=True)
 async def fetch_event_attendees(
+    request: Request,
+    response: Response,
     event_id: int,
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor from next_cursor; pass an empty value to start without totals",
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Fetch a paginated list of attendees for a specific event.
 
+    The ETag is derived from the event's attendee count and updated_at, so
+    a matching If-None-Match is answered with 304 before attendees are read.
+
     Args:
+        request (Request): Incoming request, used to check If-None-Match.
+        response (Response): Response whose ETag header is set.
         event_id (int): The ID of the event whose attendees are to be fetched.
         page (int, optional): Page number for pagination. Defaults to 1.
         per_page (int, optional): Number of attendees per page (max 100). Defaults to 10.
+        cursor (str, optional): Keyset cursor; when given, page is ignored and totals are omitted.
         db (AsyncSession, optional): Async database session dependency.
 
     Returns:
         PaginatedAttendeesResponse: Paginated list of attendees for the event.
 
     Raises:
-        HTTPException: If the event does not exist.
+        HTTPException: If the event does not exist or the cursor is invalid.
+    """
+    event = await views.EventService.fetch_attendees_version(db, event_id)
+    etag = make_etag(
+        "attendees", event_id, event.attendee_count, event.updated_at, page, per_page, cursor
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return await views.EventService.fetch_event_attendees(
+        db, event_id, page, per_page, cursor, event=event
+    )
+
+
+@event_management_router.get("/{event_id}/attendees/export")
+async def export_event_attendees(
+    event_id: int,
+    request: Request,
+    file_format: str = Query("csv", alias="format", description="csv or ndjson"),
+    accept_encoding: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Stream every attendee of a specific event as CSV or NDJSON.
+
+    The response is gzip-compressed on the fly when the client accepts it.
+
+    Args:
+        event_id (int): The ID of the event whose attendees are exported.
+        request (Request): Incoming request, used to route the read.
+        file_format (str, optional): Export format, "csv" or "ndjson". Defaults to "csv".
+        accept_encoding (str, optional): Accept-Encoding header of the request.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        StreamingResponse: The attendee rows in registration order.
+
+    Raises:
+        HTTPException: If the event does not exist or the format is unsupported.
+    """
+    media_type = exporter.media_type_for(file_format)
+    chunks = await views.EventService.export_event_attendees(
+        db, event_id, file_format, session_factory=select_session_maker(request)
+    )
+    headers = {
+        "Content-Disposition": f'attachment; filename="event-{event_id}-attendees.{file_format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if exporter.accepts_gzip(accept_encoding):
+        chunks = exporter.gzip_stream(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+def _availability_response(chunks) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type="text/event-stream",
+        # Keep proxies from caching or buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@event_management_router.get("/availability/stream")
+async def stream_events_availability(
+    event_ids: List[int] = Query(..., min_length=1),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Stream the seats remaining of several upcoming events as Server-Sent Events.
+
+    Args:
+        event_ids (List[int]): IDs of the events to follow, as repeated event_ids parameters.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        StreamingResponse: "availability" events with event_id and seats_remaining.
+
+    Raises:
+        HTTPException: If streaming is disabled, more than AVAILABILITY_MAX_EVENTS_PER_STREAM events
+                       are requested, none of them is upcoming, or the worker has no room for
+                       another stream.
+    """
+    unique_ids = list(dict.fromkeys(event_ids))
+    if len(unique_ids) > settings.AVAILABILITY_MAX_EVENTS_PER_STREAM:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.AVAILABILITY_MAX_EVENTS_PER_STREAM} events per stream",
+        )
+    chunks = await views.EventService.stream_seat_availability(db, unique_ids)
+    return _availability_response(chunks)
+
+
+@event_management_router.get("/{event_id}/availability/stream")
+async def stream_event_availability(
+    event_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Stream the seats remaining of an upcoming event as Server-Sent Events.
+
+    Args:
+        event_id (int): The ID of the event to follow.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        StreamingResponse: "availability" events with event_id and seats_remaining.
+
+    Raises:
+        HTTPException: If streaming is disabled, the event does not exist or has started, or the
+                       worker has no room for another stream.
     """
-    return await views.EventService.fetch_event_attendees(db, event_id, page, per_page)
+    chunks = await views.EventService.stream_seat_availability(db, [event_id])
+    return _availability_response(chunks)
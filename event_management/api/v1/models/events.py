@@ -1,11 +1,31 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    Integer,
+    String,
+    DateTime,
+    ForeignKeyConstraint,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship, declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
 import pytz
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+SEARCH_DAY_SECONDS = 86400
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(location, '')), 'B') || "
+    "array_to_tsvector(ARRAY['@d' || floor(extract(epoch FROM "
+    f"start_time - '1970-01-01 00:00:00+00'::timestamptz) / {SEARCH_DAY_SECONDS})::bigint::text])"
+)
+
 
 class Event(Base):
     """
@@ -15,32 +35,69 @@ class Event(Base):
         id (int): Primary key, unique identifier of the event.
         name (str): Name of the event.
         location (str): Location where the event will take place.
-        start_time (datetime): Event start time with timezone information.
+        start_time (datetime): Event start time with timezone information, the partition key.
         end_time (datetime): Event end time with timezone information.
         max_capacity (int): Maximum number of attendees allowed.
+        attendee_count (int): Number of registered attendees, maintained on registration.
+        seats_remaining (int): Seats still available, derived from max_capacity and attendee_count.
         created_at (datetime): Timestamp when the event was created, defaulting to current UTC time.
         updated_at (datetime): Timestamp when the event was last updated, auto-updated on modification.
+        search_vector (str): Weighted full-text vector of name, location and start day, generated by the database.
         attendees (List[Attendee]): List of attendees registered for this event.
+
+    The table is range-partitioned by start_time into monthly partitions,
+    see event_management.partitions. Its primary key is (id, start_time),
+    but the ORM identifies events by id alone.
     """
 
     __tablename__ = "events"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False)
     location = Column(String(500), nullable=False)
-    start_time = Column(DateTime(timezone=True), nullable=False, index=True)
+    start_time = Column(DateTime(timezone=True), primary_key=True)
     end_time = Column(DateTime(timezone=True), nullable=False)
     max_capacity = Column(Integer, nullable=False)
+    attendee_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC))
     updated_at = Column(
         DateTime(timezone=True),
         default=lambda: datetime.now(pytz.UTC),
         onupdate=lambda: datetime.now(pytz.UTC),
     )
+    # Deferred so that loading an event does not fetch the vector. Besides the
+    # words of name and location it holds one "@d<days since epoch>" lexeme for
+    # the UTC day of start_time, which lets searches over a date range narrow
+    # the GIN lookup instead of rechecking start_time on every match.
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        )
+    )
     attendees = relationship(
         "Attendee", back_populates="event", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        # Covers the upcoming events page apart from attendee_count and
+        # updated_at, which every registration changes. Indexing them would
+        # rule out HOT updates, so the page fetches them from the heap.
+        Index(
+            "ix_events_start_time_id_covering",
+            "start_time",
+            "id",
+            postgresql_include=["name", "location", "end_time", "max_capacity", "created_at"],
+        ),
+        {"postgresql_partition_by": "RANGE (start_time)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+    @hybrid_property
+    def seats_remaining(self):
+        return self.max_capacity - self.attendee_count
+
     def __repr__(self):
         return f"<Event(id={self.id}, name='{self.name}', location='{self.location}')>"
 
@@ -53,28 +110,79 @@ class Attendee(Base):
         id (int): Primary key, unique identifier of the attendee.
         name (str): Name of the attendee.
         email (str): Email address of the attendee.
-        event_id (int): Foreign key referencing the associated event.
+        event_id (int): ID of the associated event.
+        event_start_time (datetime): Start time of the associated event, the partition key.
         registered_at (datetime): Timestamp when the attendee registered, defaulting to current UTC time.
         event (Event): Relationship back to the associated Event.
 
     Constraints:
+        fk_attendees_event: References the event by (id, start_time), following start_time changes.
         unique_email_per_event: Ensures an attendee's email is unique per event.
+
+    The table is range-partitioned by event_start_time with the same monthly
+    bounds as events, so an event's attendees share its partition month.
     """
 
     __tablename__ = "attendees"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), nullable=False)
-    email = Column(String(255), nullable=False, index=True)
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    email = Column(String(255), nullable=False)
+    event_id = Column(Integer, nullable=False)
+    event_start_time = Column(DateTime(timezone=True), primary_key=True)
     registered_at = Column(
         DateTime(timezone=True), default=lambda: datetime.now(pytz.UTC)
     )
     event = relationship("Event", back_populates="attendees")
 
     __table_args__ = (
-        UniqueConstraint("email", "event_id", name="unique_email_per_event"),
+        ForeignKeyConstraint(
+            ["event_id", "event_start_time"],
+            ["events.id", "events.start_time"],
+            name="fk_attendees_event",
+            onupdate="CASCADE",
+        ),
+        UniqueConstraint("email", "event_id", "event_start_time", name="unique_email_per_event"),
+        Index(
+            "ix_attendees_event_registered_at_id_covering",
+            "event_id",
+            "event_start_time",
+            "registered_at",
+            "id",
+            postgresql_include=["name", "email"],
+        ),
+        {"postgresql_partition_by": "RANGE (event_start_time)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
     def __repr__(self):
         return f"<Attendee(id={self.id}, name='{self.name}', email='{self.email}')>"
+
+
+class RegistrationOutbox(Base):
+    """
+    SQLAlchemy model of a registration waiting to be published to the job pipeline.
+
+    Rows are written in the registering transaction and deleted by
+    event_management.jobs.OutboxRelay once they were handed to Celery.
+
+    Attributes:
+        id (int): Primary key, also the publishing order.
+        attendee_id (int): ID of the registered attendee.
+        event_id (int): ID of the event registered for.
+        name (str): Name of the attendee.
+        email (str): Email address of the attendee.
+        registered_at (datetime): Timestamp when the attendee registered.
+    """
+
+    __tablename__ = "registration_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    attendee_id = Column(Integer, nullable=False)
+    event_id = Column(Integer, nullable=False)
+    name = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False)
+    registered_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<RegistrationOutbox(id={self.id}, attendee_id={self.attendee_id})>"
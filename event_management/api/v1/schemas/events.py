@@ -1,5 +1,6 @@
 from pydantic import BaseModel, EmailStr, field_validator, validator, Field
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional, Union
 import pytz
 
@@ -92,7 +93,16 @@ class AttendeeCreate(AttendeeBase):
     pass
 
 
-class AttendeeResponse(AttendeeBase):
+class AttendeeResponse(BaseModel):
+    """
+    Output-only view of an attendee.
+
+    Values come from the database, so the AttendeeBase input rules (name
+    length, email deliverability checks) are not run again.
+    """
+
+    name: str
+    email: str
     id: int
     registered_at: datetime
 
@@ -100,7 +110,52 @@ class AttendeeResponse(AttendeeBase):
         from_attributes = True
 
 
-class EventResponse(EventBase):
+class RegistrationStatus(str, Enum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"
+    OVER_CAPACITY = "over_capacity"
+
+
+class BulkRegistrationResult(BaseModel):
+    index: int
+    email: str
+    status: RegistrationStatus
+    attendee: Optional[AttendeeResponse] = None
+
+
+class BulkRegistrationResponse(BaseModel):
+    results: List[BulkRegistrationResult]
+    created: int
+    duplicates: int
+    over_capacity: int
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+
+
+class EventResponse(BaseModel):
+    """
+    Output-only view of an event.
+
+    Unlike EventCreate, this does not inherit the EventBase validators: a
+    stored event needs no string parsing or timezone localization, and a
+    past start_time is valid output.
+    """
+
+    name: str
+    location: str
+    start_time: datetime
+    end_time: datetime
+    max_capacity: int
     id: int
     created_at: datetime
     updated_at: datetime
@@ -116,15 +171,17 @@ class EventWithAttendees(EventResponse):
 
 class PaginatedAttendeesResponse(BaseModel):
     attendees: List[AttendeeResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class PaginatedEventsResponse(BaseModel):
     events: List[EventResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
@@ -0,0 +1,270 @@
+"""
+Live seat availability, fanned out from PostgreSQL LISTEN/NOTIFY.
+
+The statements that take seats call pg_notify(SEAT_AVAILABILITY_CHANNEL,
+'<event_id>:<seats_remaining>') in their RETURNING clause, so a
+notification is sent when, and only if, the registration commits. Each
+worker process keeps one dedicated LISTEN connection in AvailabilityHub and
+fans the notifications out to its subscribers as Server-Sent Events.
+
+Memory per subscriber is bounded by the number of events it follows: a
+Subscription keeps only the latest seat count of each event. Bursts are
+coalesced, and a slow consumer skips intermediate counts instead of
+queueing them or delaying anyone else.
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+import asyncpg
+from fastapi import HTTPException, status
+from common.config import settings
+from common.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+SEAT_AVAILABILITY_CHANNEL = "seat_availability"
+# Sent before the first event, so clients reconnect after 3 s if the stream drops.
+SSE_PREAMBLE = b"retry: 3000\n\n"
+SSE_KEEPALIVE = b": keepalive\n\n"
+
+
+def format_updates(seats: Dict[int, int]) -> bytes:
+    """Encode seat counts keyed by event id as one SSE message per event."""
+    return "".join(
+        "event: availability\n"
+        f"data: {json.dumps({'event_id': event_id, 'seats_remaining': max(remaining, 0)})}\n\n"
+        for event_id, remaining in seats.items()
+    ).encode()
+
+
+class Subscription:
+    """Latest seat counts not yet sent to one client."""
+
+    __slots__ = ("event_ids", "_pending", "_waiter")
+
+    def __init__(self, event_ids: Iterable[int]):
+        self.event_ids = frozenset(event_ids)
+        self._pending: Dict[int, int] = {}
+        self._waiter: Optional[asyncio.Future] = None
+
+    def offer(self, event_id: int, seats: int) -> None:
+        self._pending[event_id] = seats
+        if self._waiter is not None:
+            _wake(self._waiter)
+
+    async def next(self, timeout: float) -> Dict[int, int]:
+        """
+        Wait up to timeout seconds for changes and take them.
+
+        Args:
+            timeout (float): Longest time to wait for a change.
+
+        Returns:
+            Dict[int, int]: Latest seat counts keyed by event id, empty on timeout.
+        """
+        if not self._pending:
+            # A bare future and timer rather than asyncio.wait_for, which
+            # costs a task per wait and dominates fan-out to idle streams.
+            loop = asyncio.get_running_loop()
+            self._waiter = loop.create_future()
+            timer = loop.call_later(timeout, _wake, self._waiter)
+            try:
+                await self._waiter
+            finally:
+                timer.cancel()
+                self._waiter = None
+        updates, self._pending = self._pending, {}
+        return updates
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AvailabilityHub:
+    """
+    Fan seat availability notifications out to this process's subscribers.
+
+    Notifications for events without subscribers are dropped. The others
+    are collected for coalesce_seconds and then offered to every
+    subscription of the event, which never blocks. After a lost connection
+    the hub reconnects and re-reads the seat counts of every followed event,
+    so no change is missed for good.
+    """
+
+    def __init__(
+        self,
+        dsn: str = DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1),
+        coalesce_seconds: float = 0.25,
+        max_subscribers: int = 50000,
+        reconnect_seconds: float = 1.0,
+        ping_seconds: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.coalesce_seconds = coalesce_seconds
+        self.max_subscribers = max_subscribers
+        self.reconnect_seconds = reconnect_seconds
+        self.ping_seconds = ping_seconds
+        self.subscriptions = 0
+        self.notifications = 0
+        self.deliveries = 0
+        self.flushes = 0
+        self.reconnects = 0
+        self.rejected = 0
+        self.connected = False
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._changed: Dict[int, int] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def check_capacity(self) -> None:
+        """
+        Refuse a new subscriber once max_subscribers are connected.
+
+        Raises:
+            HTTPException: If the process already serves max_subscribers streams.
+        """
+        if self.subscriptions >= self.max_subscribers:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many availability subscribers, retry later",
+            )
+
+    def subscribe(self, event_ids: Iterable[int]) -> Subscription:
+        subscription = Subscription(event_ids)
+        for event_id in subscription.event_ids:
+            self._subscribers.setdefault(event_id, set()).add(subscription)
+        self.subscriptions += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for event_id in subscription.event_ids:
+            subscribers = self._subscribers.get(event_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[event_id]
+        self.subscriptions -= 1
+
+    async def stream(
+        self, subscription: Subscription, initial: Dict[int, int], heartbeat_seconds: float
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield SSE chunks: the initial seat counts, then changes and keepalives.
+
+        Args:
+            subscription (Subscription): Subscription taken before initial was read.
+            initial (Dict[int, int]): Seat counts keyed by event id at subscription time.
+            heartbeat_seconds (float): Idle time after which a keepalive comment is sent.
+        """
+        yield SSE_PREAMBLE + format_updates(initial)
+        while True:
+            updates = await subscription.next(heartbeat_seconds)
+            yield format_updates(updates) if updates else SSE_KEEPALIVE
+
+    def publish(self, event_id: int, seats: int) -> None:
+        """Queue a seat count for the subscribers of event_id at the next flush."""
+        self.notifications += 1
+        if event_id not in self._subscribers:
+            return
+        self._changed[event_id] = seats
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.coalesce_seconds, self._flush
+            )
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        changed, self._changed = self._changed, {}
+        self.flushes += 1
+        for event_id, seats in changed.items():
+            for subscription in self._subscribers.get(event_id, ()):
+                subscription.offer(event_id, seats)
+                self.deliveries += 1
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event_id, seats = map(int, payload.split(":"))
+        except ValueError:
+            logger.warning("Ignoring malformed seat availability payload %r", payload)
+            return
+        self.publish(event_id, seats)
+
+    async def _resync(self, connection: asyncpg.Connection) -> None:
+        event_ids = list(self._subscribers)
+        if not event_ids:
+            return
+        rows = await connection.fetch(
+            "SELECT id, max_capacity - attendee_count AS seats FROM events "
+            "WHERE id = ANY($1::int[]) AND start_time > now()",
+            event_ids,
+        )
+        for row in rows:
+            self._changed[row["id"]] = row["seats"]
+        self._flush()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except Exception:
+                logger.exception("Connecting the seat availability listener failed")
+                await asyncio.sleep(self.reconnect_seconds)
+                continue
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            try:
+                await connection.add_listener(SEAT_AVAILABILITY_CHANNEL, self._on_notification)
+                self.connected = True
+                if self.reconnects:
+                    await self._resync(connection)
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self.ping_seconds)
+                    except asyncio.TimeoutError:
+                        # An idle socket can die silently; a ping notices.
+                        await connection.fetchval("SELECT 1")
+            except Exception:
+                logger.exception("Seat availability listener lost its connection")
+            finally:
+                self.connected = False
+                connection.terminate()
+            self.reconnects += 1
+            await asyncio.sleep(self.reconnect_seconds)
+
+    def start(self) -> None:
+        """Open the LISTEN connection in a background task, reconnecting when it drops."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "subscribers": self.subscriptions,
+            "events_followed": len(self._subscribers),
+            "notifications": self.notifications,
+            "deliveries": self.deliveries,
+            "flushes": self.flushes,
+            "reconnects": self.reconnects,
+            "rejected": self.rejected,
+        }
+
+
+availability_hub = AvailabilityHub(
+    coalesce_seconds=settings.AVAILABILITY_COALESCE_MS / 1000,
+    max_subscribers=settings.AVAILABILITY_MAX_SUBSCRIBERS,
+)
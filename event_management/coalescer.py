@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from common.config import settings
+from common.database import async_session_maker
+from event_management.api.v1.schemas.events import (
+    AttendeeCreate,
+    AttendeeResponse,
+    RegistrationStatus,
+)
+from event_management.jobs import registration_jobs
+from event_management.views import EventService, REJECTION_MESSAGES, event_cache_tag, events_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRegistration:
+    attendee: AttendeeCreate
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class RegistrationCoalescer:
+    """
+    Group concurrent single registrations for the same event into batches.
+
+    Registrations wait at most max_wait_seconds, or until max_batch_size of
+    them are queued for the event, and are then applied in one transaction
+    with EventService.register_batch. Each caller gets the same result or
+    HTTPException that register_attendee would give it, in arrival order.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = async_session_maker,
+        max_batch_size: int = 100,
+        max_wait_seconds: float = 0.005,
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: Dict[int, List[_PendingRegistration]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._flushes = set()
+        self.batches = 0
+        self.registrations = 0
+        self.largest_batch = 0
+        self.total_wait = 0.0
+        self.longest_wait = 0.0
+
+    async def submit(self, event_id: int, attendee_data: AttendeeCreate) -> AttendeeResponse:
+        """
+        Queue a registration and wait for the batch it lands in.
+
+        Args:
+            event_id (int): ID of the event to register the attendee for.
+            attendee_data (AttendeeCreate): Pydantic schema containing attendee information.
+
+        Raises:
+            HTTPException: If the event is not found, is in the past, the email is already
+                           registered for the event, or the event is full.
+
+        Returns:
+            AttendeeResponse: Response schema with the registered attendee's details.
+        """
+        loop = asyncio.get_running_loop()
+        pending = _PendingRegistration(attendee_data, loop.create_future())
+        queue = self._pending.setdefault(event_id, [])
+        queue.append(pending)
+        if len(queue) >= self.max_batch_size:
+            self._start_flush(event_id)
+        elif len(queue) == 1:
+            self._timers[event_id] = loop.call_later(
+                self.max_wait_seconds, self._start_flush, event_id
+            )
+        return await pending.future
+
+    async def drain(self) -> None:
+        """Flush every queued registration and wait for in-flight batches."""
+        for event_id in list(self._pending):
+            self._start_flush(event_id)
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "registrations": self.registrations,
+            "mean_batch_size": round(self.registrations / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "mean_queue_ms": (
+                round(self.total_wait / self.registrations * 1000, 3) if self.registrations else 0.0
+            ),
+            "max_queue_ms": round(self.longest_wait * 1000, 3),
+            "queued": sum(len(queue) for queue in self._pending.values()),
+        }
+
+    def _start_flush(self, event_id: int) -> None:
+        timer = self._timers.pop(event_id, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(event_id, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._flush(event_id, batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, event_id: int, batch: List[_PendingRegistration]) -> None:
+        started_at = time.monotonic()
+        waits = [started_at - pending.enqueued_at for pending in batch]
+        self.batches += 1
+        self.registrations += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.total_wait += sum(waits)
+        self.longest_wait = max(self.longest_wait, *waits)
+
+        statuses = created = None
+        try:
+            async with self.session_factory() as db:
+                batch_statuses, batch_created = await EventService.register_batch(
+                    db,
+                    event_id,
+                    [pending.attendee.name for pending in batch],
+                    [pending.attendee.email for pending in batch],
+                )
+                await db.commit()
+                statuses, created = batch_statuses, batch_created
+                registration_jobs.committed(db)
+            if created:
+                await events_cache.invalidate([event_cache_tag(event_id)])
+        except BaseException as exc:
+            # Callers must not be left waiting, even when the flush is cancelled.
+            if statuses is None:
+                self._fail(event_id, batch, exc)
+            else:
+                self._resolve(batch, statuses, created)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        self._resolve(batch, statuses, created)
+
+    @staticmethod
+    def _fail(event_id: int, batch: List[_PendingRegistration], exc: BaseException) -> None:
+        if not isinstance(exc, Exception):
+            exc = HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Registration was interrupted, retry later",
+            )
+        elif not isinstance(exc, HTTPException):
+            logger.exception("Registration batch for event %s failed", event_id)
+        for pending in batch:
+            if not pending.future.done():
+                pending.future.set_exception(exc)
+
+    @staticmethod
+    def _resolve(
+        batch: List[_PendingRegistration],
+        statuses: List[RegistrationStatus],
+        created: Dict[str, Row],
+    ) -> None:
+        for pending, row_status in zip(batch, statuses):
+            if pending.future.done():
+                continue
+            if row_status == RegistrationStatus.CREATED:
+                row = created[pending.attendee.email]
+                pending.future.set_result(
+                    AttendeeResponse.model_construct(
+                        id=row.id,
+                        name=pending.attendee.name,
+                        email=pending.attendee.email,
+                        registered_at=row.registered_at,
+                    )
+                )
+            else:
+                pending.future.set_exception(
+                    HTTPException(
+                        status_code=(
+                            status.HTTP_409_CONFLICT
+                            if row_status == RegistrationStatus.DUPLICATE
+                            else status.HTTP_400_BAD_REQUEST
+                        ),
+                        detail=REJECTION_MESSAGES[row_status],
+                    )
+                )
+
+registration_coalescer = RegistrationCoalescer(
+    max_batch_size=settings.REGISTRATION_BATCH_MAX_SIZE,
+    max_wait_seconds=settings.REGISTRATION_BATCH_MAX_WAIT_MS / 1000,
+)
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Iterable, Optional
+from fastapi import HTTPException, status
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+ATTENDEE_EXPORT_COLUMNS = ("id", "name", "email", "registered_at")
+
+
+def media_type_for(file_format: str) -> str:
+    """
+    Return the media type of an export format.
+
+    Args:
+        file_format (str): One of "csv" or "ndjson".
+
+    Raises:
+        HTTPException: If the format is not supported.
+
+    Returns:
+        str: The media type to send with the export.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format, expected one of {', '.join(EXPORT_FORMATS)}",
+        )
+    return EXPORT_FORMATS[file_format]
+
+
+def encode_rows(rows: Iterable[tuple], file_format: str, header: bool = False) -> bytes:
+    """
+    Encode a batch of (id, name, email, registered_at) rows.
+
+    Args:
+        rows (Iterable[tuple]): Rows in ATTENDEE_EXPORT_COLUMNS order.
+        file_format (str): One of "csv" or "ndjson".
+        header (bool, optional): Whether to start a CSV batch with the header line.
+
+    Returns:
+        bytes: UTF-8 encoded rows.
+    """
+    if file_format == "ndjson":
+        return "".join(
+            json.dumps(
+                {
+                    "id": attendee_id,
+                    "name": name,
+                    "email": email,
+                    "registered_at": registered_at.isoformat() if registered_at else None,
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+            for attendee_id, name, email, registered_at in rows
+        ).encode()
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(ATTENDEE_EXPORT_COLUMNS)
+    writer.writerows(
+        (attendee_id, name, email, registered_at.isoformat() if registered_at else "")
+        for attendee_id, name, email, registered_at in rows
+    )
+    return buffer.getvalue().encode()
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """
+    Check whether a client accepts gzip-encoded responses.
+
+    Args:
+        accept_encoding (str, optional): Value of the Accept-Encoding header.
+
+    Returns:
+        bool: True if gzip is listed and not disabled with q=0.
+    """
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Gzip-compress a byte stream on the fly.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Uncompressed chunks.
+
+    Returns:
+        AsyncIterator[bytes]: Chunks of a single gzip member.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
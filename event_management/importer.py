@@ -0,0 +1,270 @@
+from datetime import datetime
+from typing import IO, Iterator, List, Optional, Tuple
+import os
+import openpyxl
+import pandas as pd
+from email_validator import EmailNotValidError, validate_email
+from fastapi import HTTPException, status
+
+IMPORT_FORMATS = ("csv", "xlsx", "ndjson")
+EVENT_COLUMNS = ("name", "location", "start_time", "end_time", "max_capacity")
+ATTENDEE_COLUMNS = ("name", "email")
+
+_OFFSET_PATTERN = r"(?:Z|[+-]\d{2}:?\d{2})$"
+# Upper bound of the integer max_capacity column.
+_MAX_CAPACITY = 2**31 - 1
+
+
+def detect_format(filename: Optional[str], file_format: Optional[str] = None) -> str:
+    """
+    Work out the format of an uploaded import file.
+
+    Args:
+        filename (str, optional): Name of the uploaded file.
+        file_format (str, optional): Format requested explicitly by the client.
+
+    Raises:
+        HTTPException: If the format is not supported.
+
+    Returns:
+        str: One of "csv", "xlsx" or "ndjson".
+    """
+    if not file_format and filename:
+        file_format = os.path.splitext(filename)[1].lstrip(".").lower()
+        if file_format == "jsonl":
+            file_format = "ndjson"
+    if file_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import format, expected one of {', '.join(IMPORT_FORMATS)}",
+        )
+    return file_format
+
+
+def iter_frames(file: IO, file_format: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Stream an import file as DataFrames of at most chunksize rows.
+
+    Every value is read as text so that validation sees what the client
+    sent. Each frame is indexed by the 1-based row number in the file.
+
+    Args:
+        file (IO): Binary file object positioned at the start of the data.
+        file_format (str): One of "csv", "xlsx" or "ndjson".
+        chunksize (int): Maximum number of rows per frame.
+
+    Returns:
+        Iterator[pd.DataFrame]: Frames in file order.
+    """
+    if file_format == "csv":
+        chunks = pd.read_csv(file, chunksize=chunksize, dtype=str, keep_default_na=False)
+    elif file_format == "ndjson":
+        chunks = pd.read_json(file, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        chunks = _iter_xlsx(file, chunksize)
+
+    start = 1
+    for chunk in chunks:
+        chunk = chunk.astype("string")
+        chunk.columns = [str(column).strip().lower() for column in chunk.columns]
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+def _iter_xlsx(file: IO, chunksize: int) -> Iterator[pd.DataFrame]:
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+
+def require_columns(frame: pd.DataFrame, columns: Tuple[str, ...]) -> None:
+    """
+    Ensure an import frame has every column the target schema needs.
+
+    Args:
+        frame (pd.DataFrame): Frame read from the import file.
+        columns (Tuple[str, ...]): Required column names.
+
+    Raises:
+        HTTPException: If a required column is missing.
+    """
+    missing = [column for column in columns if column not in frame.columns]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Import file is missing columns: {', '.join(missing)}",
+        )
+
+
+def _parse_datetimes(values: pd.Series, default_time: str) -> pd.Series:
+    """
+    Vectorized equivalent of the EventBase start_time/end_time parsing.
+
+    Date-only values get default_time, and naive values are localized to
+    Asia/Kolkata. Unparseable values become NaT.
+    """
+    text = values.str.strip()
+    text = text.where(text.str.len() != 10, text + "T" + default_time)
+    aware = text.str.contains(_OFFSET_PATTERN, regex=True).fillna(False).astype(bool)
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns, UTC]")
+    if aware.any():
+        parsed[aware] = pd.to_datetime(
+            text[aware], format="ISO8601", errors="coerce", utc=True
+        )
+    naive = ~aware
+    if naive.any():
+        local = pd.to_datetime(text[naive], format="ISO8601", errors="coerce")
+        parsed[naive] = local.dt.tz_localize(
+            "Asia/Kolkata", ambiguous="NaT", nonexistent="NaT"
+        ).dt.tz_convert("UTC")
+    return parsed
+
+
+def _normalize_emails(values: pd.Series) -> pd.Series:
+    """
+    Validate emails the way EmailStr does, returning the normalized form or NA.
+
+    Each distinct address is validated once per frame.
+    """
+    normalized = {}
+    for email in values.dropna().unique():
+        try:
+            normalized[email] = validate_email(email, check_deliverability=False).normalized
+        except EmailNotValidError:
+            normalized[email] = pd.NA
+    return values.map(normalized, na_action="ignore").astype("string")
+
+
+def _collect_errors(checks: List[Tuple[pd.Series, str]]) -> pd.Series:
+    """Return the first failing check's message for every invalid row."""
+    errors = pd.Series(pd.NA, index=checks[0][0].index, dtype="string")
+    for failed, message in checks:
+        errors = errors.mask(errors.isna() & failed, message)
+    return errors.dropna()
+
+
+def validate_events(frame: pd.DataFrame, current_time: datetime) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Validate a frame of events with the EventCreate rules.
+
+    Args:
+        frame (pd.DataFrame): Frame with the EVENT_COLUMNS columns.
+        current_time (datetime): Start times must be after this instant.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.Series]: Valid rows with parsed values, and error messages indexed by row number.
+    """
+    name = frame["name"].str.strip()
+    location = frame["location"].str.strip()
+    start_time = _parse_datetimes(frame["start_time"], "09:00:00")
+    end_time = _parse_datetimes(frame["end_time"], "18:00:00")
+    max_capacity = pd.to_numeric(frame["max_capacity"], errors="coerce")
+
+    now = pd.Timestamp(current_time).tz_convert("UTC")
+    errors = _collect_errors(
+        [
+            (name.isna() | (name == ""), "name is required"),
+            (name.str.len() > 255, "name must be at most 255 characters"),
+            (location.isna() | (location == ""), "location is required"),
+            (location.str.len() > 500, "location must be at most 500 characters"),
+            (
+                start_time.isna(),
+                "start_time must be a valid date/datetime string (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+            ),
+            (
+                end_time.isna(),
+                "end_time must be a valid date/datetime string (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+            ),
+            (start_time <= now, "start_time must be in the future."),
+            (end_time <= start_time, "end_time must be after start_time"),
+            (
+                max_capacity.isna() | (max_capacity != max_capacity.round()),
+                "max_capacity must be an integer",
+            ),
+            (
+                (max_capacity < 1) | (max_capacity > _MAX_CAPACITY),
+                f"max_capacity must be between 1 and {_MAX_CAPACITY}",
+            ),
+        ]
+    )
+    valid = ~frame.index.isin(errors.index)
+    events = pd.DataFrame(
+        {
+            "name": name[valid],
+            "location": location[valid],
+            "start_time": start_time[valid],
+            "end_time": end_time[valid],
+            "max_capacity": max_capacity[valid].astype("int64"),
+        }
+    )
+    return events, errors
+
+
+def validate_attendees(frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Validate a frame of attendees with the AttendeeCreate rules.
+
+    Emails are validated and normalized with email_validator, as EmailStr
+    does, so the same addresses are accepted as by the register endpoint.
+
+    Args:
+        frame (pd.DataFrame): Frame with the ATTENDEE_COLUMNS columns.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.Series]: Valid rows, and error messages indexed by row number.
+    """
+    name = frame["name"].str.strip()
+    email = _normalize_emails(frame["email"].str.strip())
+    errors = _collect_errors(
+        [
+            (
+                name.isna() | (name.str.len() < 1) | (name.str.len() > 255),
+                "name must be between 1 and 255 characters",
+            ),
+            (
+                email.isna(),
+                "value is not a valid email address",
+            ),
+        ]
+    )
+    valid = ~frame.index.isin(errors.index)
+    attendees = pd.DataFrame({"name": name[valid], "email": email[valid]})
+    return attendees, errors
+
+
+def event_records(events: pd.DataFrame, created_at: datetime) -> List[tuple]:
+    """
+    Convert validated events into records for COPY into the events table.
+
+    Args:
+        events (pd.DataFrame): Output of validate_events.
+        created_at (datetime): Value for created_at and updated_at.
+
+    Returns:
+        List[tuple]: Records in the order of the columns used by the importer.
+    """
+    return list(
+        zip(
+            events["name"].tolist(),
+            events["location"].tolist(),
+            events["start_time"].map(pd.Timestamp.to_pydatetime).tolist(),
+            events["end_time"].map(pd.Timestamp.to_pydatetime).tolist(),
+            events["max_capacity"].tolist(),
+            [created_at] * len(events),
+            [created_at] * len(events),
+        )
+    )
@@ -0,0 +1,348 @@
+"""
+Post-registration job pipeline on Celery.
+
+Every registration is described by a compact message: attendee and event
+ids, name, email and registration time. With REGISTRATION_JOBS=outbox the
+message is written to the registration_outbox table in the registering
+transaction, and OutboxRelay publishes committed rows to Celery in
+batches. With REGISTRATION_JOBS=direct it is published by a background
+task right after commit, and lost if the process stops first. Either way
+a registration pays for one insert or one scheduled task, however many
+handlers consume it.
+
+Handlers are plain functions taking a list of messages, registered with
+@registration_handler in a module the Celery workers import. Each handler
+runs as its own task, so a failing handler is retried alone. Start the
+workers with:
+
+    celery -A event_management.jobs worker
+
+and relay the outbox once from a shell with:
+
+    python -m event_management.jobs
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from celery import Celery
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import DateTime, Integer, String, bindparam, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from common.config import settings
+from common.database import engine as primary_engine
+from event_management.api.v1.models.events import RegistrationOutbox
+
+logger = logging.getLogger(__name__)
+
+# Session.info key of the messages queued in the session's open transaction.
+PENDING_MESSAGES = "registration_messages"
+
+celery_app = Celery("event_management", broker=settings.CELERY_BROKER_URL)
+celery_app.conf.update(
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    # Redeliver a batch whose worker died mid-task instead of dropping it.
+    task_acks_late=True,
+)
+
+REGISTRATION_HANDLERS: Dict[str, Callable[[List[dict]], None]] = {}
+
+
+def registration_handler(name: str):
+    """
+    Register a function consuming batches of registration messages.
+
+    Args:
+        name (str): Unique name of the handler, carried by its tasks.
+    """
+
+    def decorator(func: Callable[[List[dict]], None]):
+        REGISTRATION_HANDLERS[name] = func
+        return func
+
+    return decorator
+
+
+def registration_message(
+    attendee_id: int, event_id: int, name: str, email: str, registered_at: datetime
+) -> dict:
+    return {
+        "attendee_id": attendee_id,
+        "event_id": event_id,
+        "name": name,
+        "email": email,
+        "registered_at": registered_at,
+    }
+
+
+@celery_app.task(name="registrations.dispatch")
+def dispatch_registrations(messages: List[dict]) -> None:
+    """Fan a batch of registration messages out to one task per handler."""
+    for name in REGISTRATION_HANDLERS:
+        handle_registrations.delay(name, messages)
+
+
+@celery_app.task(
+    name="registrations.handle",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=settings.REGISTRATION_JOB_MAX_RETRIES,
+)
+def handle_registrations(name: str, messages: List[dict]) -> None:
+    """Run one registration handler on a batch of messages."""
+    handler = REGISTRATION_HANDLERS.get(name)
+    if handler is None:
+        logger.warning("No registration handler %s, dropping %s messages", name, len(messages))
+        return
+    handler(messages)
+
+
+def publish_registrations(messages: List[dict]) -> None:
+    """Send a batch of registration messages to the broker. Blocks on the broker."""
+    dispatch_registrations.delay(
+        [{**message, "registered_at": message["registered_at"].isoformat()} for message in messages]
+    )
+
+
+class OutboxRelay:
+    """
+    Publish committed registration_outbox rows to Celery in batches.
+
+    Each batch is claimed with FOR UPDATE SKIP LOCKED, so relays in several
+    workers never publish the same rows, and deleted in the same
+    transaction once the publish succeeded. A failed publish leaves the
+    rows for the next run, so delivery is at least once.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine = primary_engine,
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+        publish: Callable[[List[dict]], None] = publish_registrations,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.publish = publish
+        self.published = 0
+        self.batches = 0
+        self.failures = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def relay_batch(self) -> int:
+        """
+        Publish the oldest batch of outbox rows and delete them.
+
+        Returns:
+            int: Number of messages published.
+        """
+        # Materialized, so the rows are claimed once: as an IN subquery the
+        # planner may rescan the LIMIT per row and delete more than a batch.
+        claimed = (
+            select(RegistrationOutbox.id)
+            .order_by(RegistrationOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .cte("claimed")
+            .prefix_with("MATERIALIZED")
+        )
+        async with self.engine.begin() as conn:
+            deleted = await conn.execute(
+                delete(RegistrationOutbox)
+                .where(RegistrationOutbox.id.in_(select(claimed.c.id)))
+                .returning(
+                    RegistrationOutbox.id,
+                    RegistrationOutbox.attendee_id,
+                    RegistrationOutbox.event_id,
+                    RegistrationOutbox.name,
+                    RegistrationOutbox.email,
+                    RegistrationOutbox.registered_at,
+                )
+            )
+            rows = sorted(deleted.all(), key=lambda row: row.id)
+            if not rows:
+                return 0
+            messages = [
+                registration_message(
+                    row.attendee_id, row.event_id, row.name, row.email, row.registered_at
+                )
+                for row in rows
+            ]
+            await run_in_threadpool(self.publish, messages)
+        self.batches += 1
+        self.published += len(messages)
+        return len(messages)
+
+    async def run(self) -> int:
+        """
+        Publish batches until the outbox is empty.
+
+        Returns:
+            int: Number of messages published.
+        """
+        total = 0
+        while True:
+            count = await self.relay_batch()
+            total += count
+            if count < self.batch_size:
+                return total
+
+    def wake(self) -> None:
+        """Make the background task relay now instead of at its next poll."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Relay now, then whenever woken or every poll_interval seconds, in a background task."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.run()
+            except Exception:
+                self.failures += 1
+                logger.exception("Relaying the registration outbox failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "batches": self.batches,
+            "mean_batch_size": round(self.published / self.batches, 2) if self.batches else 0.0,
+            "failures": self.failures,
+        }
+
+
+class RegistrationJobs:
+    """
+    Hand registrations to the job pipeline in the configured mode.
+
+    queue() runs inside the registering transaction and committed() right
+    after its commit. Modes other than "outbox" and "direct" turn the
+    pipeline off.
+    """
+
+    def __init__(
+        self,
+        mode: str = "off",
+        relay: Optional[OutboxRelay] = None,
+        publish: Callable[[List[dict]], None] = publish_registrations,
+    ):
+        self.mode = mode
+        self.relay = relay
+        self.publish = publish
+        self.queued = 0
+        self.publish_failures = 0
+        self._publishes = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("outbox", "direct")
+
+    async def queue(self, db: AsyncSession, messages: List[dict]) -> None:
+        """
+        Queue registration messages in the session's open transaction.
+
+        Args:
+            db (AsyncSession): Session that registered the attendees, not yet committed.
+            messages (List[dict]): Output of registration_message, one per attendee.
+        """
+        if not self.enabled or not messages:
+            return
+        if self.mode == "outbox":
+            source = (
+                func.unnest(
+                    bindparam("attendee_ids", [m["attendee_id"] for m in messages], type_=ARRAY(Integer)),
+                    bindparam("event_ids", [m["event_id"] for m in messages], type_=ARRAY(Integer)),
+                    bindparam("names", [m["name"] for m in messages], type_=ARRAY(String)),
+                    bindparam("emails", [m["email"] for m in messages], type_=ARRAY(String)),
+                    bindparam(
+                        "registered_ats",
+                        [m["registered_at"] for m in messages],
+                        type_=ARRAY(DateTime(timezone=True)),
+                    ),
+                )
+                .table_valued("attendee_id", "event_id", "name", "email", "registered_at")
+                .render_derived()
+            )
+            await db.execute(
+                pg_insert(RegistrationOutbox).from_select(
+                    ["attendee_id", "event_id", "name", "email", "registered_at"],
+                    select(
+                        source.c.attendee_id,
+                        source.c.event_id,
+                        source.c.name,
+                        source.c.email,
+                        source.c.registered_at,
+                    ),
+                )
+            )
+        db.info.setdefault(PENDING_MESSAGES, []).extend(messages)
+
+    def committed(self, db: AsyncSession) -> None:
+        """
+        Release the messages queued in a transaction that was just committed.
+
+        Args:
+            db (AsyncSession): Session whose transaction was committed.
+        """
+        messages = db.info.pop(PENDING_MESSAGES, None)
+        if not messages:
+            return
+        self.queued += len(messages)
+        if self.mode == "outbox":
+            if self.relay is not None:
+                self.relay.wake()
+            return
+        task = asyncio.ensure_future(self._publish(messages))
+        self._publishes.add(task)
+        task.add_done_callback(self._publishes.discard)
+
+    async def _publish(self, messages: List[dict]) -> None:
+        try:
+            await run_in_threadpool(self.publish, messages)
+        except Exception:
+            self.publish_failures += 1
+            logger.exception("Publishing %s registrations failed", len(messages))
+
+    async def drain(self) -> None:
+        """Wait for direct publishes still in flight."""
+        if self._publishes:
+            await asyncio.gather(*self._publishes, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode if self.enabled else "off",
+            "queued": self.queued,
+            "publish_failures": self.publish_failures,
+            "outbox": self.relay.stats() if self.relay is not None else None,
+        }
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.REGISTRATION_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.REGISTRATION_OUTBOX_POLL_INTERVAL,
+)
+registration_jobs = RegistrationJobs(settings.REGISTRATION_JOBS, outbox_relay)
+
+
+if __name__ == "__main__":
+    print(asyncio.run(outbox_relay.run()))
@@ -0,0 +1,48 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """
+    Encode the keyset position of a row into an opaque cursor.
+
+    Args:
+        sort_value (datetime): Value of the leading sort column of the row.
+        row_id (int): Primary key of the row, used as the tie breaker.
+
+    Returns:
+        str: URL-safe cursor pointing just past the given row.
+    """
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    An empty cursor starts a keyset scan from the first row.
+
+    Args:
+        cursor (str): Cursor received from the client.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        Optional[Tuple[datetime, int]]: The keyset position, or None for the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -0,0 +1,329 @@
+"""
+Monthly range partitions of the events and attendees tables.
+
+events is partitioned by start_time and attendees by event_start_time with
+the same UTC month bounds, so an event and its attendees always sit in the
+partitions of the same month, named e.g. events_p2025_07 and
+attendees_p2025_07. PartitionMaintainer creates partitions months ahead of
+time and moves old months out of the live tables into an archive schema.
+Run it once from a shell with:
+
+    python -m event_management.partitions
+"""
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from common.config import settings
+from common.database import engine as primary_engine
+
+logger = logging.getLogger(__name__)
+
+# Parent tables with their partition keys; attendees reference events.
+PARTITIONED_TABLES = (("events", "start_time"), ("attendees", "event_start_time"))
+# Serializes maintenance across workers sharing the database.
+MAINTENANCE_LOCK_ID = 7_301_824
+# DDL on a parent table waits for running queries; give up rather than queue behind them.
+LOCK_TIMEOUT_SECONDS = 5
+LOCK_TIMEOUT = f"{LOCK_TIMEOUT_SECONDS}s"
+# SQLSTATE lock_not_available, raised when lock_timeout expires.
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def month_start(value: datetime) -> datetime:
+    """Return the first instant of value's month in UTC."""
+    value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_missing_partition(exc: Exception) -> bool:
+    """Whether exc was raised for a row whose month has no partition yet."""
+    return "no partition of relation" in str(getattr(exc, "orig", exc))
+
+
+def is_lock_timeout(exc: Exception) -> bool:
+    """Whether exc was raised because lock_timeout expired."""
+    return getattr(getattr(exc, "orig", exc), "sqlstate", None) == LOCK_NOT_AVAILABLE
+
+
+async def lock_maintenance(conn: AsyncConnection) -> None:
+    """
+    Take the maintenance advisory lock for the rest of the transaction.
+
+    lock_timeout is set for the transaction too, so waiting for the lock or
+    for the parent tables afterwards fails after LOCK_TIMEOUT instead of
+    queueing queries behind the DDL.
+
+    Args:
+        conn (AsyncConnection): Connection with an open transaction.
+    """
+    await conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:lock)"), {"lock": MAINTENANCE_LOCK_ID})
+
+
+async def attached_partitions(conn: AsyncConnection, table: str) -> Dict[datetime, str]:
+    """
+    List the monthly partitions attached to a parent table.
+
+    Args:
+        conn (AsyncConnection): Connection to the database.
+        table (str): One of the tables in PARTITIONED_TABLES.
+
+    Returns:
+        Dict[datetime, str]: Partition names keyed by the first instant of their month.
+    """
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    pattern = re.compile(rf"{table}_p(\d{{4}})_(\d{{2}})")
+    partitions = {}
+    for name in result.scalars():
+        match = pattern.fullmatch(name)
+        if match:
+            year, month = map(int, match.groups())
+            partitions[datetime(year, month, 1, tzinfo=timezone.utc)] = name
+    return partitions
+
+
+async def create_partitions(conn: AsyncConnection, first: datetime, last: datetime) -> List[str]:
+    """
+    Create the events and attendees partitions of every month from first to last.
+
+    Months that already have a partition are skipped. Runs in the caller's
+    transaction.
+
+    Args:
+        conn (AsyncConnection): Connection with an open transaction.
+        first (datetime): Any instant of the first month.
+        last (datetime): Any instant of the last month.
+
+    Returns:
+        List[str]: Names of the partitions created.
+    """
+    created = []
+    for table, _ in PARTITIONED_TABLES:
+        existing = await attached_partitions(conn, table)
+        month = month_start(first)
+        while month <= last:
+            upper = add_months(month, 1)
+            if month not in existing:
+                name = partition_name(table, month)
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                    )
+                )
+                created.append(name)
+            month = upper
+    return created
+
+
+async def archive_partition(conn: AsyncConnection, month: datetime, schema: str) -> List[str]:
+    """
+    Detach one month's events and attendees partitions into an archive schema.
+
+    The attendees partition is detached first and loses its foreign key to
+    the live events table. The key is recreated between the two archived
+    tables as NOT VALID, since the rows were already checked. Runs in the
+    caller's transaction.
+
+    Args:
+        conn (AsyncConnection): Connection with an open transaction.
+        month (datetime): First instant of the month to archive.
+        schema (str): Schema receiving the detached tables, created if missing.
+
+    Returns:
+        List[str]: Qualified names of the archived tables.
+    """
+    await conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+    events = (await attached_partitions(conn, "events")).get(month)
+    attendees = (await attached_partitions(conn, "attendees")).get(month)
+    archived = []
+    if attendees:
+        await conn.execute(text(f"ALTER TABLE attendees DETACH PARTITION {attendees}"))
+        await conn.execute(
+            text(f"ALTER TABLE {attendees} DROP CONSTRAINT IF EXISTS fk_attendees_event")
+        )
+        await conn.execute(text(f'ALTER TABLE {attendees} SET SCHEMA "{schema}"'))
+        archived.append(f"{schema}.{attendees}")
+    if events:
+        await conn.execute(text(f"ALTER TABLE events DETACH PARTITION {events}"))
+        await conn.execute(text(f'ALTER TABLE {events} SET SCHEMA "{schema}"'))
+        archived.append(f"{schema}.{events}")
+    if attendees and events:
+        await conn.execute(
+            text(
+                f'ALTER TABLE "{schema}".{attendees} ADD CONSTRAINT fk_attendees_event '
+                f'FOREIGN KEY (event_id, event_start_time) REFERENCES "{schema}".{events} '
+                "(id, start_time) NOT VALID"
+            )
+        )
+    return archived
+
+
+async def ensure_partitions(conn: AsyncConnection, start_times: Iterable[datetime]) -> List[str]:
+    """
+    Create the partitions of every month in start_times that has none yet.
+
+    Used for rows beyond the months kept ready by PartitionMaintainer. Runs
+    in the caller's transaction, with the same lock_timeout as maintenance.
+
+    Args:
+        conn (AsyncConnection): Connection with an open transaction.
+        start_times (Iterable[datetime]): Partition keys of the rows to be written.
+
+    Raises:
+        HTTPException: 503 with Retry-After if the locks were not granted within LOCK_TIMEOUT.
+
+    Returns:
+        List[str]: Names of the partitions created.
+    """
+    created = []
+    try:
+        await lock_maintenance(conn)
+        for month in sorted({month_start(start_time) for start_time in start_times}):
+            created.extend(await create_partitions(conn, month, month))
+    except DBAPIError as exc:
+        if not is_lock_timeout(exc):
+            raise
+        logger.warning("Creating partitions on demand timed out waiting for a lock")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Partitions for these events are being changed, retry later",
+            headers={"Retry-After": str(LOCK_TIMEOUT_SECONDS)},
+        ) from exc
+    if created:
+        logger.info("Created partitions %s on demand", ", ".join(created))
+    return created
+
+
+class PartitionMaintainer:
+    """
+    Create partitions ahead of time and archive old ones, periodically.
+
+    Each run makes sure the current month and the next months_ahead months
+    have partitions. It also archives every month that ended more than
+    retention_months before the current one, so hot-path queries on the
+    live tables only touch recent and upcoming partitions. Every step
+    takes a transaction-level advisory lock, so concurrent workers do not
+    race, and a short lock_timeout, so a step that cannot get its lock is
+    retried on the next run instead of blocking queries.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine = primary_engine,
+        months_ahead: int = 12,
+        retention_months: int = 3,
+        archive_schema: str = "archive",
+        interval_seconds: float = 3600.0,
+    ):
+        self.engine = engine
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive_schema = archive_schema
+        self.interval_seconds = interval_seconds
+        self.runs = 0
+        self.failures = 0
+        self.created: List[str] = []
+        self.archived: List[str] = []
+        self.last_run_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self, now: Optional[datetime] = None) -> dict:
+        """
+        Create upcoming partitions and archive expired ones.
+
+        Args:
+            now (datetime, optional): Current time. Defaults to the clock.
+
+        Returns:
+            dict: Names of the partitions created and the tables archived by this run.
+        """
+        current = month_start(now or datetime.now(timezone.utc))
+        async with self.engine.begin() as conn:
+            await lock_maintenance(conn)
+            created = await create_partitions(
+                conn, current, add_months(current, self.months_ahead)
+            )
+
+        archived = []
+        cutoff = add_months(current, -self.retention_months)
+        async with self.engine.connect() as conn:
+            expired = sorted(
+                month for month in await attached_partitions(conn, "events") if month < cutoff
+            )
+        # One transaction per month keeps each lock on the parent tables short.
+        for month in expired:
+            async with self.engine.begin() as conn:
+                await lock_maintenance(conn)
+                archived.extend(await archive_partition(conn, month, self.archive_schema))
+
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        self.created.extend(created)
+        self.archived.extend(archived)
+        if created or archived:
+            logger.info("Partitions created: %s; archived: %s", created, archived)
+        return {"created": created, "archived": archived}
+
+    def start(self) -> None:
+        """Run maintenance now and then every interval_seconds in a background task."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run()
+            except Exception:
+                self.failures += 1
+                logger.exception("Partition maintenance failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "created": len(self.created),
+            "archived": len(self.archived),
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+partition_maintainer = PartitionMaintainer(
+    months_ahead=settings.PARTITION_MONTHS_AHEAD,
+    retention_months=settings.PARTITION_RETENTION_MONTHS,
+    archive_schema=settings.PARTITION_ARCHIVE_SCHEMA,
+    interval_seconds=settings.PARTITION_MAINTENANCE_INTERVAL,
+)
+
+
+if __name__ == "__main__":
+    print(asyncio.run(partition_maintainer.run()))
@@ -0,0 +1,184 @@
+"""
+In-memory snapshot of the first upcoming events, refreshed by APScheduler.
+
+Most /events traffic is for the first few offset pages, which change
+slowly. UpcomingEventsSnapshot keeps the first `size` upcoming events, with
+their attendee counts, and serves any offset page that lies within them
+while the snapshot is younger than max_staleness seconds. Events whose
+start_time has passed are skipped at serve time, so they drop out between
+refreshes too. Deeper pages, stale snapshots and keyset pages return None,
+and the caller falls back to a live query.
+"""
+import logging
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Tuple
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from event_management.api.v1.schemas.events import EventResponse, PaginatedEventsResponse
+from common.rendering import make_etag
+from event_management.pagination import encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Loads at most `limit` upcoming events in (start_time, id) order, and the
+# total number of upcoming events.
+SnapshotLoader = Callable[[int], Awaitable[Tuple[List[EventResponse], int]]]
+
+
+@dataclass
+class _Snapshot:
+    built_at: float
+    events: List[EventResponse]
+    start_times: List[datetime]
+    total: int
+    # Identifies the content, so workers holding the same events agree on ETags.
+    digest: str
+
+
+class UpcomingEventsSnapshot:
+    """
+    Serve shallow offset pages of upcoming events from a periodic snapshot.
+
+    The snapshot is rebuilt every interval_seconds by an APScheduler job
+    that never overlaps itself. Pages are served while the snapshot is at
+    most max_staleness seconds old, so attendee counts and newly created
+    events can lag the database by that much.
+    """
+
+    def __init__(
+        self,
+        load: SnapshotLoader,
+        size: int = 500,
+        interval_seconds: float = 5.0,
+        max_staleness: float = 15.0,
+    ):
+        self.load = load
+        self.size = size
+        self.interval_seconds = interval_seconds
+        self.max_staleness = max_staleness
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.failures = 0
+        self._current: Optional[_Snapshot] = None
+        self._scheduler: Optional[AsyncIOScheduler] = None
+
+    async def refresh(self) -> None:
+        """Rebuild the snapshot from the database."""
+        # Age is measured from before the query, so it bounds how old the data is.
+        started_at = time.monotonic()
+        try:
+            events, total = await self.load(self.size)
+        except Exception:
+            self.failures += 1
+            logger.exception("Refreshing the upcoming events snapshot failed")
+            return
+        # updated_at moves on every write to an event, registrations included.
+        digest = make_etag(
+            total, *((event.id, event.updated_at, event.attendee_count) for event in events)
+        )
+        self._current = _Snapshot(
+            started_at, events, [event.start_time for event in events], total, digest
+        )
+        self.refreshes += 1
+
+    def _locate(
+        self, current_time: datetime, page: int, per_page: int
+    ) -> Optional[Tuple[_Snapshot, int]]:
+        snapshot = self._current
+        if snapshot is None or time.monotonic() - snapshot.built_at > self.max_staleness:
+            return None
+        started = bisect_right(snapshot.start_times, current_time)
+        complete = len(snapshot.events) == snapshot.total
+        if not complete and started + page * per_page > len(snapshot.events):
+            return None
+        return snapshot, started
+
+    def page(
+        self, current_time: datetime, page: int, per_page: int
+    ) -> Optional[PaginatedEventsResponse]:
+        """
+        Build an offset page of upcoming events from the snapshot.
+
+        Args:
+            current_time (datetime): Events starting at or before this instant are skipped.
+            page (int): Page number, starting at 1.
+            per_page (int): Number of events per page.
+
+        Returns:
+            Optional[PaginatedEventsResponse]: The page, or None if the snapshot is missing,
+            older than max_staleness or does not reach that deep.
+        """
+        located = self._locate(current_time, page, per_page)
+        if located is None:
+            self.misses += 1
+            return None
+        snapshot, started = located
+
+        self.hits += 1
+        total = snapshot.total - started
+        offset = (page - 1) * per_page
+        events = snapshot.events[started + offset:started + offset + per_page]
+        next_cursor = None
+        if offset + len(events) < total:
+            next_cursor = encode_cursor(events[-1].start_time, events[-1].id)
+        return PaginatedEventsResponse(
+            events=events,
+            total=total,
+            page=page,
+            per_page=per_page,
+            total_pages=(total + per_page - 1) // per_page,
+            next_cursor=next_cursor,
+        )
+
+    def etag(self, current_time: datetime, page: int, per_page: int) -> Optional[str]:
+        """
+        Entity tag of the page that page() would build, without building it.
+
+        Args:
+            current_time (datetime): Events starting at or before this instant are skipped.
+            page (int): Page number, starting at 1.
+            per_page (int): Number of events per page.
+
+        Returns:
+            Optional[str]: The tag, or None if the page would not come from the snapshot.
+        """
+        located = self._locate(current_time, page, per_page)
+        if located is None:
+            return None
+        snapshot, started = located
+        return make_etag("events", snapshot.digest, started, page, per_page)
+
+    def start(self) -> None:
+        """Build the snapshot now and then every interval_seconds."""
+        if self._scheduler is None:
+            self._scheduler = AsyncIOScheduler()
+            self._scheduler.add_job(
+                self.refresh,
+                "interval",
+                seconds=self.interval_seconds,
+                next_run_time=datetime.now(),
+                max_instances=1,
+                coalesce=True,
+            )
+            self._scheduler.start()
+
+    async def stop(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.shutdown(wait=False)
+            self._scheduler = None
+
+    def stats(self) -> dict:
+        snapshot = self._current
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "events": len(snapshot.events) if snapshot else 0,
+            "age_seconds": round(time.monotonic() - snapshot.built_at, 3) if snapshot else None,
+        }
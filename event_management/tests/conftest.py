@@ -1,8 +1,11 @@
 import pytest
 import pytest_asyncio
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 from event_management.api.v1.models.events import Base
+from event_management.partitions import create_partitions
 from common.config import settings
 
 
@@ -18,8 +21,23 @@ async def async_session():
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        now = datetime.now(timezone.utc)
+        await create_partitions(conn, now - timedelta(days=400), now + timedelta(days=400))
 
     async with async_session_maker() as session:
         yield session
 
     await engine.dispose()
+
+
+@pytest.fixture
+def query_counter(async_session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = async_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
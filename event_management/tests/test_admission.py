@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+from common import metrics
+from common.admission import AdmissionController, AdmissionMiddleware, ConcurrencyGate
+
+
+@pytest.mark.asyncio
+async def test_gate_queues_in_order_and_times_out():
+    gate = ConcurrencyGate(1)
+    assert await gate.acquire(0)
+    first = asyncio.ensure_future(gate.acquire(1.0))
+    second = asyncio.ensure_future(gate.acquire(0.05))
+    await asyncio.sleep(0.1)
+    assert second.done() and not second.result()
+    assert gate.queued == 1
+
+    gate.release()
+    assert await first
+    assert gate.in_flight == 1
+    gate.release()
+    assert gate.stats()["in_flight"] == 0
+    assert gate.stats()["queue_timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_are_shed_before_writes_as_pool_wait_grows():
+    controller = AdmissionController(
+        pool_wait_target=0.1, write_shed_factor=4.0, pool_wait_half_life=0.05
+    )
+    controller.observe_pool_wait(1.0)
+    assert controller.overloaded("read") and not controller.overloaded("write")
+    assert await controller.admit("read", "/events") is None
+    gates = await controller.admit("write", "/register")
+    controller.release(gates)
+
+    for _ in range(10):
+        controller.observe_pool_wait(2.0)
+    assert await controller.admit("write", "/register") is None
+    assert controller.stats()["classes"]["write"]["shed"] == 1
+
+    # Without new samples the signal decays and traffic is let back in.
+    await asyncio.sleep(0.5)
+    assert not controller.overloaded("read")
+
+
+def test_middleware_sheds_with_retry_after_but_not_exempt_routes():
+    controller = AdmissionController(
+        read_limit=1,
+        read_queue_timeout=0.05,
+        route_limits={"/export": 1},
+        exempt_routes=["/health"],
+        retry_after=2,
+    )
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    app.add_middleware(metrics.MetricsMiddleware, metrics=metrics.MetricsRegistry())
+    release = asyncio.Event()
+
+    @app.get("/export")
+    async def export():
+        await release.wait()
+        return {}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "active"}
+
+    @app.post("/register")
+    async def register():
+        release.set()
+        return {}
+
+    with TestClient(app) as client, ThreadPoolExecutor(1) as executor:
+        blocked = executor.submit(client.get, "/export")
+        while controller.stats()["routes"]["/export"]["in_flight"] == 0:
+            time.sleep(0.01)
+        shed = client.get("/export")
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "2"
+        assert client.get("/health").status_code == 200
+        assert client.post("/register").status_code == 200
+        assert blocked.result(5).status_code == 200
+
+    stats = controller.stats()
+    assert stats["classes"]["read"]["shed"] == 1
+    assert stats["routes"]["/export"]["in_flight"] == 0
+
+
+def test_shed_responses_carry_cors_headers_and_preflights_pass():
+    controller = AdmissionController(pool_wait_target=0.1, pool_wait_half_life=60.0)
+    controller.observe_pool_wait(10.0)
+    app = FastAPI()
+    # The order of main.py: CORS outermost, admission inside metrics.
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    app.add_middleware(metrics.MetricsMiddleware, metrics=metrics.MetricsRegistry())
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"])
+
+    @app.get("/events")
+    async def events():
+        return {}
+
+    with TestClient(app) as client:
+        shed = client.get("/events", headers={"Origin": "https://example.com"})
+        preflight = client.options(
+            "/events",
+            headers={"Origin": "https://example.com", "Access-Control-Request-Method": "GET"},
+        )
+
+    assert shed.status_code == 503
+    assert shed.headers["access-control-allow-origin"] == "*"
+    assert preflight.status_code == 200
+    assert controller.classify("OPTIONS", "/events") is None
+    assert controller.stats()["classes"]["read"]["shed"] == 1
+
+
+def test_timed_out_pool_checkouts_feed_the_pool_wait():
+    controller = AdmissionController(pool_wait_half_life=60.0)
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    app.add_middleware(metrics.MetricsMiddleware, metrics=metrics.MetricsRegistry())
+
+    @app.get("/events")
+    async def events():
+        # A checkout that gave up after waiting, before any statement ran.
+        metrics.current_request_stats().pool_wait_seconds += 0.5
+        raise HTTPException(status_code=503)
+
+    with TestClient(app) as client:
+        assert client.get("/events").status_code == 503
+
+    assert controller.pool_wait > 0.09
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from common.config import settings
+from event_management import availability
+from event_management.api.v1.schemas.events import AttendeeCreate, EventCreate
+from event_management.availability import AvailabilityHub
+from event_management.tests.conftest import DATABASE_URL
+from event_management.views import EventService
+
+
+def _seats(chunk):
+    return {
+        message["event_id"]: message["seats_remaining"]
+        for message in (
+            json.loads(line[len("data: "):])
+            for line in chunk.decode().splitlines()
+            if line.startswith("data: ")
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_slow_subscribers_only_get_the_latest_count():
+    hub = AvailabilityHub(coalesce_seconds=0, max_subscribers=2)
+    fast, slow = hub.subscribe([1]), hub.subscribe([1, 2])
+    with pytest.raises(HTTPException) as exc_info:
+        hub.check_capacity()
+    assert exc_info.value.status_code == 503
+
+    hub.publish(1, 5)
+    await asyncio.sleep(0.01)
+    assert await fast.next(0.1) == {1: 5}
+    hub.publish(1, 4)
+    hub.publish(1, 3)
+    hub.publish(3, 9)
+    await asyncio.sleep(0.01)
+
+    assert await fast.next(0.1) == {1: 3}
+    assert await slow.next(0.1) == {1: 3}
+    assert await slow.next(0.01) == {}
+    assert hub.stats()["deliveries"] == 4
+
+    hub.unsubscribe(fast)
+    hub.unsubscribe(slow)
+    assert hub.stats()["events_followed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_committed_registrations_are_streamed(async_session, monkeypatch):
+    hub = AvailabilityHub(
+        dsn=DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"), coalesce_seconds=0.01
+    )
+    monkeypatch.setattr(availability, "availability_hub", hub)
+    hub.start()
+    event = await EventService.create_event(
+        async_session,
+        EventCreate(
+            name="Availability Event",
+            location="Kochi",
+            start_time=datetime.now() + timedelta(days=1),
+            end_time=datetime.now() + timedelta(days=1, hours=2),
+            max_capacity=5,
+        ),
+    )
+    # The duplicate registration below rolls back, which expires the event.
+    event_id = event.id
+    for _ in range(100):
+        if hub.connected:
+            break
+        await asyncio.sleep(0.05)
+
+    chunks = await EventService.stream_seat_availability(
+        async_session,
+        [event_id],
+        session_factory=async_sessionmaker(async_session.bind, expire_on_commit=False),
+    )
+    assert _seats(await chunks.__anext__()) == {event_id: 5}
+
+    attendee = AttendeeCreate(name="Farah", email="farah@gmail.com")
+    await EventService.register_attendee(async_session, event_id, attendee)
+    with pytest.raises(HTTPException):
+        await EventService.register_attendee(async_session, event_id, attendee)
+    assert _seats(await asyncio.wait_for(chunks.__anext__(), 5)) == {event_id: 4}
+
+    await EventService.register_attendees(
+        async_session,
+        event_id,
+        [AttendeeCreate(name=name, email=f"{name}@gmail.com") for name in ("gita", "hari")],
+    )
+    assert _seats(await asyncio.wait_for(chunks.__anext__(), 5)) == {event_id: 2}
+
+    await chunks.aclose()
+    assert hub.stats()["subscribers"] == 0
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_of_unknown_event_is_not_found(async_session):
+    with pytest.raises(HTTPException) as exc_info:
+        await EventService.stream_seat_availability(async_session, [2_000_000_000])
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stream_is_not_found_while_streaming_is_disabled(async_session, monkeypatch):
+    monkeypatch.setattr(settings, "AVAILABILITY_STREAMING", False)
+    with pytest.raises(HTTPException) as exc_info:
+        await EventService.stream_seat_availability(async_session, [1])
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "Seat availability streaming is disabled"
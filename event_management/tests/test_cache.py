@@ -0,0 +1,94 @@
+import fnmatch
+import pytest
+from common.cache import InMemoryCache, RedisCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def scan_iter(self, match):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def unlink(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_lru_and_ttl():
+    cache = InMemoryCache(max_entries=2)
+    await cache.set("a", 1, ttl=60)
+    await cache.set("b", 2, ttl=60)
+    assert await cache.get("a") == 1
+    await cache.set("c", 3, ttl=60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
+
+    await cache.set("d", 4, ttl=-1)
+    assert await cache.get("d") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 2, 2)
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_round_trip_and_clear():
+    client = FakeRedis()
+    cache = RedisCache(client, "events", dumps=str.encode, loads=bytes.decode)
+    await cache.set("upcoming:1:10", "page", ttl=5)
+    client.data["other:key"] = b"kept"
+
+    assert await cache.get("upcoming:1:10") == "page"
+    await cache.clear()
+    assert await cache.get("upcoming:1:10") is None
+    assert client.data == {"other:key": b"kept"}
+    assert cache.stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_only_tagged_entries():
+    for cache in (
+        InMemoryCache(max_entries=10),
+        RedisCache(FakeRedis(), "events", dumps=str.encode, loads=bytes.decode),
+    ):
+        await cache.set("upcoming:1:10", "first", ttl=60, tags=["event:1", "event:2"])
+        await cache.set("upcoming:2:10", "second", ttl=60, tags=["event:3"])
+        version = cache.version
+
+        await cache.invalidate(["event:2"])
+
+        assert await cache.get("upcoming:1:10") is None
+        assert await cache.get("upcoming:2:10") == "second"
+        assert cache.changed_since(version, ["event:2"])
+        assert not cache.changed_since(version, ["event:3"])
+        assert cache.stats()["tag_invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_errors_are_misses():
+    class BrokenRedis(FakeRedis):
+        async def get(self, key):
+            raise ConnectionError("redis is down")
+
+    cache = RedisCache(BrokenRedis(), "events", dumps=str.encode, loads=bytes.decode)
+    assert await cache.get("upcoming:1:10") is None
+    assert cache.stats()["errors"] == 1
@@ -1,7 +1,19 @@
+import asyncio
+import io
 import pytest
+import pytz
+import uuid
 from datetime import datetime, timedelta
-from event_management.api.v1.schemas.events import EventCreate, AttendeeCreate
+from event_management.api.v1.schemas.events import (
+    AttendeeCreate,
+    EventCreate,
+    EventResponse,
+)
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from event_management.api.v1.models.events import Event
+from event_management.coalescer import RegistrationCoalescer
 from event_management.views import EventService
 
 
@@ -120,3 +132,496 @@ async def test_fetch_event_attendees(async_session):
     attendees = await EventService.fetch_event_attendees(async_session, event.id)
     assert attendees.total == 2
     assert attendees.attendees[0].email == "arjun@gmail.com"
+
+
+@pytest.mark.asyncio
+async def test_fetch_event_attendees_past_the_real_rows(async_session):
+    event = await EventService.create_event(
+        async_session,
+        EventCreate(
+            name="Overcounted Event",
+            location="Thrissur",
+            start_time=datetime.now() + timedelta(hours=5),
+            end_time=datetime.now() + timedelta(hours=6),
+            max_capacity=10,
+        ),
+    )
+    await EventService.register_attendee(
+        async_session, event.id, AttendeeCreate(name="Meera", email="meera@gmail.com")
+    )
+    # The maintained count can run ahead of the rows, e.g. after a manual fix.
+    await async_session.execute(
+        update(Event).where(Event.id == event.id).values(attendee_count=5)
+    )
+    await async_session.commit()
+
+    attendees = await EventService.fetch_event_attendees(
+        async_session, event.id, page=2, per_page=2
+    )
+    assert attendees.attendees == []
+    assert attendees.total == 5
+    assert attendees.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_upcoming_events_query_count(async_session, query_counter):
+    event_ids = []
+    for index in range(3):
+        event = await EventService.create_event(
+            async_session,
+            EventCreate(
+                name=f"Query Count Event {index}",
+                location="Chennai",
+                start_time=datetime.now() + timedelta(minutes=30),
+                end_time=datetime.now() + timedelta(hours=2),
+                max_capacity=5,
+            ),
+        )
+        event_ids.append(event.id)
+        await EventService.register_attendee(
+            async_session,
+            event.id,
+            AttendeeCreate(name="Meera", email=f"meera{index}@gmail.com"),
+        )
+
+    query_counter.clear()
+    response = await EventService.fetch_upcoming_events(async_session, per_page=100)
+    assert len(query_counter) == 1
+    counts = {event.id: event.attendee_count for event in response.events}
+    assert all(counts[event_id] == 1 for event_id in event_ids)
+
+
+@pytest.mark.asyncio
+async def test_register_attendee_concurrent_last_seat(async_session):
+    event_data = EventCreate(
+        name="Flash Sale Event",
+        location="Mumbai",
+        start_time=datetime.now() + timedelta(hours=3),
+        end_time=datetime.now() + timedelta(hours=4),
+        max_capacity=1,
+    )
+    event = await EventService.create_event(async_session, event_data)
+
+    async def register(email):
+        async with AsyncSession(async_session.bind, expire_on_commit=False) as session:
+            return await EventService.register_attendee(
+                session, event.id, AttendeeCreate(name="Rahul", email=email)
+            )
+
+    results = await asyncio.gather(
+        register("rahul1@gmail.com"),
+        register("rahul2@gmail.com"),
+        return_exceptions=True,
+    )
+    assert sum(not isinstance(result, Exception) for result in results) == 1
+    assert any("maximum capacity" in str(result) for result in results)
+
+    attendees = await EventService.fetch_event_attendees(async_session, event.id)
+    assert attendees.total == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_event_attendees_with_cursor(async_session):
+    event_data = EventCreate(
+        name="Cursor Event",
+        location="Pune",
+        start_time=datetime.now() + timedelta(hours=5),
+        end_time=datetime.now() + timedelta(hours=6),
+        max_capacity=10,
+    )
+    event = await EventService.create_event(async_session, event_data)
+    for index in range(5):
+        await EventService.register_attendee(
+            async_session,
+            event.id,
+            AttendeeCreate(name="Kiran", email=f"kiran{index}@gmail.com"),
+        )
+
+    first = await EventService.fetch_event_attendees(async_session, event.id, per_page=2)
+    assert first.total == 5
+    assert first.next_cursor is not None
+
+    emails = []
+    cursor = ""
+    while cursor is not None:
+        page = await EventService.fetch_event_attendees(
+            async_session, event.id, per_page=2, cursor=cursor
+        )
+        assert page.total is None and page.total_pages is None
+        emails.extend(attendee.email for attendee in page.attendees)
+        cursor = page.next_cursor
+    assert emails == [f"kiran{index}@gmail.com" for index in range(5)]
+
+    resumed = await EventService.fetch_event_attendees(
+        async_session, event.id, per_page=2, cursor=first.next_cursor
+    )
+    assert resumed.attendees[0].email == "kiran2@gmail.com"
+
+
+@pytest.mark.asyncio
+async def test_fetch_event_attendees_invalid_cursor(async_session):
+    event_data = EventCreate(
+        name="Invalid Cursor Event",
+        location="Goa",
+        start_time=datetime.now() + timedelta(hours=5),
+        end_time=datetime.now() + timedelta(hours=6),
+        max_capacity=10,
+    )
+    event = await EventService.create_event(async_session, event_data)
+
+    with pytest.raises(Exception) as exc:
+        await EventService.fetch_event_attendees(
+            async_session, event.id, cursor="not-a-cursor"
+        )
+    assert "Invalid cursor" in str(exc.value)
+
+
+@pytest.mark.asyncio
+async def test_register_attendees_bulk(async_session):
+    event_data = EventCreate(
+        name="Group Booking Event",
+        location="Kochi",
+        start_time=datetime.now() + timedelta(hours=3),
+        end_time=datetime.now() + timedelta(hours=4),
+        max_capacity=3,
+    )
+    event = await EventService.create_event(async_session, event_data)
+    await EventService.register_attendee(
+        async_session, event.id, AttendeeCreate(name="Chitra", email="chitra@gmail.com")
+    )
+
+    response = await EventService.register_attendees(
+        async_session,
+        event.id,
+        [
+            AttendeeCreate(name="Anu", email="anu@gmail.com"),
+            AttendeeCreate(name="Chitra", email="chitra@gmail.com"),
+            AttendeeCreate(name="Anu", email="anu@gmail.com"),
+            AttendeeCreate(name="Biju", email="biju@gmail.com"),
+            AttendeeCreate(name="Deepa", email="deepa@gmail.com"),
+        ],
+    )
+    assert [result.status for result in response.results] == [
+        "created",
+        "duplicate",
+        "duplicate",
+        "created",
+        "over_capacity",
+    ]
+    assert (response.created, response.duplicates, response.over_capacity) == (2, 2, 1)
+    assert response.results[0].attendee.email == "anu@gmail.com"
+
+    attendees = await EventService.fetch_event_attendees(async_session, event.id)
+    assert attendees.total == 3
+
+
+@pytest.mark.asyncio
+async def test_register_attendees_bulk_large_batch(async_session, query_counter):
+    event_data = EventCreate(
+        name="Partner Import Event",
+        location="Mysuru",
+        start_time=datetime.now() + timedelta(hours=3),
+        end_time=datetime.now() + timedelta(hours=4),
+        max_capacity=10000,
+    )
+    event = await EventService.create_event(async_session, event_data)
+    attendees = [
+        AttendeeCreate(name=f"Guest {index}", email=f"guest{index}@gmail.com")
+        for index in range(10000)
+    ]
+
+    query_counter.clear()
+    response = await EventService.register_attendees(async_session, event.id, attendees)
+    assert response.created == 10000
+    assert len(query_counter) <= 5
+
+
+@pytest.mark.asyncio
+async def test_import_attendees_reports_row_errors(async_session):
+    event_data = EventCreate(
+        name="Import Event",
+        location="Thrissur",
+        start_time=datetime.now() + timedelta(hours=3),
+        end_time=datetime.now() + timedelta(hours=4),
+        max_capacity=2,
+    )
+    event = await EventService.create_event(async_session, event_data)
+    content = (
+        "name,email\n"
+        "Lakshmi,lakshmi@gmail.com\n"
+        "Broken,not-an-email\n"
+        "Lakshmi,lakshmi@gmail.com\n"
+        "Manu,manu@gmail.com\n"
+        "Nila,nila@gmail.com\n"
+    )
+
+    report = await EventService.import_attendees(
+        async_session, event.id, io.BytesIO(content.encode()), "csv"
+    )
+    assert (report.processed, report.imported, report.failed) == (5, 2, 3)
+    assert [(error.row, error.error) for error in report.errors] == [
+        (2, "value is not a valid email address"),
+        (3, "Email already registered for this event"),
+        (5, "Event has reached maximum capacity"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_event_attendees(async_session):
+    event_data = EventCreate(
+        name="Export Event",
+        location="Kozhikode",
+        start_time=datetime.now() + timedelta(hours=3),
+        end_time=datetime.now() + timedelta(hours=4),
+        max_capacity=10,
+    )
+    event = await EventService.create_event(async_session, event_data)
+    await EventService.register_attendees(
+        async_session,
+        event.id,
+        [AttendeeCreate(name=f"Vinod {index}", email=f"vinod{index}@gmail.com") for index in range(3)],
+    )
+
+    chunks = await EventService.export_event_attendees(
+        async_session,
+        event.id,
+        "csv",
+        session_factory=lambda: AsyncSession(async_session.bind),
+    )
+    lines = b"".join([chunk async for chunk in chunks]).decode().splitlines()
+    assert lines[0] == "id,name,email,registered_at"
+    assert [line.split(",")[2] for line in lines[1:]] == [
+        f"vinod{index}@gmail.com" for index in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_upcoming_events_cached_until_write(async_session, query_counter):
+    first = await EventService.fetch_upcoming_events(async_session, page=1, per_page=7)
+    query_counter.clear()
+    second = await EventService.fetch_upcoming_events(
+        async_session, timezone="UTC", page=1, per_page=7
+    )
+    assert second is first
+    assert query_counter == []
+
+    await EventService.create_event(
+        async_session,
+        EventCreate(
+            name="Cache Busting Event",
+            location="Alappuzha",
+            start_time=datetime.now() + timedelta(hours=1),
+            end_time=datetime.now() + timedelta(hours=2),
+            max_capacity=10,
+        ),
+    )
+    query_counter.clear()
+    await EventService.fetch_upcoming_events(async_session, page=1, per_page=7)
+    assert len(query_counter) == 1
+
+
+@pytest.mark.asyncio
+async def test_registration_keeps_pages_without_its_event_cached(async_session, query_counter):
+    first_page = await EventService.fetch_upcoming_events(async_session, page=1, per_page=2)
+    later_page = await EventService.fetch_upcoming_events(async_session, page=2, per_page=2)
+    event_id = first_page.events[0].id
+    assert event_id not in [event.id for event in later_page.events]
+
+    await EventService.register_attendee(
+        async_session, event_id, AttendeeCreate(name="Kiran", email=f"{uuid.uuid4()}@gmail.com")
+    )
+    query_counter.clear()
+    assert await EventService.fetch_upcoming_events(async_session, page=2, per_page=2) is later_page
+    assert query_counter == []
+
+    refreshed = await EventService.fetch_upcoming_events(async_session, page=1, per_page=2)
+    assert len(query_counter) == 1
+    assert refreshed.events[0].attendee_count == first_page.events[0].attendee_count + 1
+
+
+@pytest.mark.asyncio
+async def test_coalesced_registrations_share_one_batch(async_session):
+    event_data = EventCreate(
+        name="Coalesced Event",
+        location="Hyderabad",
+        start_time=datetime.now() + timedelta(hours=3),
+        end_time=datetime.now() + timedelta(hours=4),
+        max_capacity=3,
+    )
+    event = await EventService.create_event(async_session, event_data)
+    coalescer = RegistrationCoalescer(
+        async_sessionmaker(async_session.bind, expire_on_commit=False),
+        max_batch_size=50,
+        max_wait_seconds=0.05,
+    )
+
+    emails = ["anu@gmail.com", "binu@gmail.com", "anu@gmail.com", "cinu@gmail.com", "dinu@gmail.com"]
+    results = await asyncio.gather(
+        *(coalescer.submit(event.id, AttendeeCreate(name="Anu", email=email)) for email in emails),
+        return_exceptions=True,
+    )
+
+    assert [result.email for result in results if not isinstance(result, Exception)] == [
+        "anu@gmail.com",
+        "binu@gmail.com",
+        "cinu@gmail.com",
+    ]
+    assert results[2].status_code == 409
+    assert results[4].status_code == 400
+    assert coalescer.stats()["batches"] == 1
+    assert coalescer.stats()["largest_batch"] == 5
+
+    attendees = await EventService.fetch_event_attendees(async_session, event.id)
+    assert attendees.total == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_fails_its_waiting_registrations():
+    started = asyncio.Event()
+
+    class BlockingSession:
+        async def __aenter__(self):
+            started.set()
+            await asyncio.Event().wait()
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    coalescer = RegistrationCoalescer(BlockingSession, max_batch_size=50, max_wait_seconds=60)
+    waiting = [
+        asyncio.ensure_future(coalescer.submit(1, AttendeeCreate(name="Anu", email=email)))
+        for email in ("anu@gmail.com", "binu@gmail.com")
+    ]
+    await asyncio.sleep(0)
+    drained = asyncio.ensure_future(coalescer.drain())
+    await started.wait()
+    for flush in list(coalescer._flushes):
+        flush.cancel()
+    await drained
+
+    results = await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), 5)
+    assert [result.status_code for result in results] == [503, 503]
+    assert coalescer.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_registration_for_missing_event(async_session):
+    coalescer = RegistrationCoalescer(
+        async_sessionmaker(async_session.bind, expire_on_commit=False),
+        max_batch_size=2,
+        max_wait_seconds=10,
+    )
+    results = await asyncio.gather(
+        coalescer.submit(999999, AttendeeCreate(name="Sanu", email="sanu1@gmail.com")),
+        coalescer.submit(999999, AttendeeCreate(name="Sanu", email="sanu2@gmail.com")),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, HTTPException) for result in results)
+    assert {result.status_code for result in results} == {404}
+
+
+def test_event_response_does_not_rerun_input_validators():
+    started = datetime(2020, 1, 1, 9, 0, tzinfo=pytz.UTC)
+    event = Event(
+        id=1,
+        name="Past Event",
+        location="Kochi",
+        start_time=started,
+        end_time=started + timedelta(hours=2),
+        max_capacity=10,
+        created_at=started,
+        updated_at=started,
+        attendee_count=3,
+    )
+
+    response = EventResponse.model_validate(event)
+
+    assert response.start_time == started
+    assert list(response.model_dump()) == [
+        "name",
+        "location",
+        "start_time",
+        "end_time",
+        "max_capacity",
+        "id",
+        "created_at",
+        "updated_at",
+        "attendee_count",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_events_ranks_and_filters(async_session):
+    # Unique word so rows left by earlier runs do not match.
+    tag = f"quokka{uuid.uuid4().hex[:8]}"
+    start = datetime.now() + timedelta(days=3)
+    for name, location, capacity, days in (
+        (f"{tag} Jazz Night", "Bangalore", 10, 0),
+        (f"{tag} Rock Fest", "Bangalore", 10, 0),
+        ("Sunday Brunch", f"{tag} Bay, Bangalore", 1, 0),
+        (f"{tag} Jazz Retreat", "Bangalore", 10, 30),
+    ):
+        await EventService.create_event(
+            async_session,
+            EventCreate(
+                name=name,
+                location=location,
+                start_time=start + timedelta(days=days),
+                end_time=start + timedelta(days=days, hours=2),
+                max_capacity=capacity,
+            ),
+        )
+
+    week = await EventService.search_events(
+        async_session, f"{tag} bangalore", starts_before=start + timedelta(days=7)
+    )
+    assert week.total == 3
+    # Name matches rank above location-only matches.
+    assert week.events[-1].name == "Sunday Brunch"
+
+    jazz = await EventService.search_events(async_session, f"{tag.upper()} JAZZ")
+    assert sorted(event.name for event in jazz.events) == [
+        f"{tag} Jazz Night",
+        f"{tag} Jazz Retreat",
+    ]
+
+    roomy = await EventService.search_events(async_session, tag, min_seats=2)
+    assert "Sunday Brunch" not in {event.name for event in roomy.events}
+
+    with pytest.raises(HTTPException):
+        await EventService.search_events(async_session, "!!")
+
+
+@pytest.mark.asyncio
+async def test_registration_changes_attendees_version(async_session):
+    event = await EventService.create_event(
+        async_session,
+        EventCreate(
+            name="Versioned Event",
+            location="Kozhikode",
+            start_time=datetime.now() + timedelta(days=1),
+            end_time=datetime.now() + timedelta(days=1, hours=2),
+            max_capacity=10,
+        ),
+    )
+    before = await EventService.fetch_attendees_version(async_session, event.id)
+
+    await EventService.register_attendee(
+        async_session, event.id, AttendeeCreate(name="Indu", email="indu@gmail.com")
+    )
+    after_single = await EventService.fetch_attendees_version(async_session, event.id)
+    assert after_single.attendee_count == before.attendee_count + 1
+    assert after_single.updated_at > before.updated_at
+
+    await EventService.register_attendees(
+        async_session, event.id, [AttendeeCreate(name="Jose", email="jose@gmail.com")]
+    )
+    after_bulk = await EventService.fetch_attendees_version(async_session, event.id)
+    assert after_bulk.updated_at > after_single.updated_at
+
+    page = await EventService.fetch_event_attendees(async_session, event.id, event=after_bulk)
+    assert page.total == 2
+
+    with pytest.raises(HTTPException) as exc_info:
+        await EventService.fetch_attendees_version(async_session, 2_000_000_000)
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,37 @@
+import gzip
+from datetime import datetime
+import pytest
+import pytz
+from event_management import exporter
+
+
+def test_encode_rows_csv_and_ndjson():
+    rows = [(1, "Ayush", "ayush@gmail.com", datetime(2025, 6, 7, 6, 32, tzinfo=pytz.UTC))]
+
+    assert exporter.encode_rows(rows, "csv", header=True) == (
+        b"id,name,email,registered_at\n1,Ayush,ayush@gmail.com,2025-06-07T06:32:00+00:00\n"
+    )
+    assert exporter.encode_rows(rows, "ndjson") == (
+        b'{"id": 1, "name": "Ayush", "email": "ayush@gmail.com", '
+        b'"registered_at": "2025-06-07T06:32:00+00:00"}\n'
+    )
+
+
+def test_accepts_gzip():
+    assert exporter.accepts_gzip("gzip, deflate, br")
+    assert exporter.accepts_gzip("br;q=1.0, gzip;q=0.8")
+    assert not exporter.accepts_gzip("gzip;q=0")
+    assert not exporter.accepts_gzip("identity")
+    assert not exporter.accepts_gzip(None)
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_round_trip():
+    async def chunks():
+        for index in range(100):
+            yield f"{index},row\n".encode()
+
+    compressed = b"".join([chunk async for chunk in exporter.gzip_stream(chunks())])
+    assert gzip.decompress(compressed) == b"".join(
+        f"{index},row\n".encode() for index in range(100)
+    )
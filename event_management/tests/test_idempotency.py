@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+from common.cache import InMemoryCache
+from common.idempotency import (
+    IdempotencyGuard,
+    dump_stored_response,
+    load_stored_response,
+)
+
+
+class Ticket(BaseModel):
+    id: int
+
+
+def _guard():
+    return IdempotencyGuard(InMemoryCache(max_entries=10), ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_retries_run_the_write_once():
+    guard = _guard()
+    calls = []
+
+    async def operation():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Ticket(id=len(calls))
+
+    results = await asyncio.gather(
+        *(guard.execute("key", "fp", operation, 201) for _ in range(3))
+    )
+
+    assert len(calls) == 1
+    assert [replayed for _, replayed in results] == [False, True, True]
+    assert {stored.body for stored, _ in results} == {b'{"id":1}'}
+    assert all(stored.status_code == 201 for stored, _ in results)
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_replayed():
+    guard = _guard()
+
+    async def operation():
+        raise HTTPException(status_code=409, detail="Email already registered for this event")
+
+    first, replayed = await guard.execute("key", "fp", operation, 201)
+    again, replayed_again = await guard.execute("key", "fp", operation, 201)
+
+    assert (first.status_code, replayed, replayed_again) == (409, False, True)
+    assert again == first
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_different_body_is_rejected():
+    guard = _guard()
+
+    async def operation():
+        return Ticket(id=1)
+
+    await guard.execute("key", "fp", operation, 201)
+    with pytest.raises(HTTPException) as exc_info:
+        await guard.execute("key", "other", operation, 201)
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_not_stored():
+    guard = _guard()
+    attempts = []
+
+    async def operation():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("connection lost")
+        return Ticket(id=2)
+
+    with pytest.raises(RuntimeError):
+        await guard.execute("key", "fp", operation, 201)
+    stored, replayed = await guard.execute("key", "fp", operation, 201)
+
+    assert (stored.body, replayed) == (b'{"id":2}', False)
+
+
+def test_stored_response_round_trip():
+    stored = load_stored_response(
+        dump_stored_response(load_stored_response(b'["fp", 201, "{\\"id\\":1}"]'))
+    )
+    assert (stored.fingerprint, stored.status_code, stored.body) == ("fp", 201, b'{"id":1}')
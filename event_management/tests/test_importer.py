@@ -0,0 +1,105 @@
+import io
+from datetime import datetime
+import pytest
+import pytz
+from event_management import importer
+
+
+def read_frames(content, file_format="csv", chunksize=100):
+    return list(importer.iter_frames(io.BytesIO(content.encode()), file_format, chunksize))
+
+
+def test_iter_frames_numbers_rows_across_chunks():
+    frames = read_frames("name,email\na,a@x.com\nb,b@x.com\nc,c@x.com\n", chunksize=2)
+    assert [frame.index.tolist() for frame in frames] == [[1, 2], [3]]
+
+
+def test_validate_events_applies_event_create_rules():
+    frames = read_frames(
+        "name,location,start_time,end_time,max_capacity\n"
+        "Tech Conference,Bangalore,2099-07-01,2099-07-02,100\n"
+        "No Location,,2099-07-01,2099-07-02,100\n"
+        "Past Event,Kochi,2020-07-01,2020-07-02,100\n"
+        "Backwards,Kochi,2099-07-02,2099-07-01,100\n"
+        "Bad Date,Kochi,07/01/2099,2099-07-02,100\n"
+        "Fractional,Kochi,2099-07-01T10:00:00+05:30,2099-07-01T12:00:00Z,2.5\n"
+    )
+    events, errors = importer.validate_events(frames[0], datetime.now(pytz.UTC))
+
+    assert events.index.tolist() == [1]
+    assert events.loc[1, "start_time"] == datetime(2099, 7, 1, 3, 30, tzinfo=pytz.UTC)
+    assert events.loc[1, "end_time"] == datetime(2099, 7, 2, 12, 30, tzinfo=pytz.UTC)
+    assert errors.to_dict() == {
+        2: "location is required",
+        3: "start_time must be in the future.",
+        4: "end_time must be after start_time",
+        5: "start_time must be a valid date/datetime string (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)",
+        6: "max_capacity must be an integer",
+    }
+
+
+def test_validate_attendees_normalizes_email_domain():
+    frames = read_frames(
+        '{"name": "Ayush", "email": "Ayush@Example.COM"}\n'
+        '{"name": "", "email": "empty@example.com"}\n'
+        '{"name": "Pooja", "email": "not-an-email"}\n',
+        file_format="ndjson",
+    )
+    attendees, errors = importer.validate_attendees(frames[0])
+
+    assert attendees.to_dict("records") == [{"name": "Ayush", "email": "Ayush@example.com"}]
+    assert errors.to_dict() == {
+        2: "name must be between 1 and 255 characters",
+        3: "value is not a valid email address",
+    }
+
+
+def test_validate_events_rejects_values_beyond_column_limits():
+    frames = read_frames(
+        "name,location,start_time,end_time,max_capacity\n"
+        f"{'n' * 256},Kochi,2099-07-01,2099-07-02,100\n"
+        f"Long Location,{'l' * 501},2099-07-01,2099-07-02,100\n"
+        "Huge,Kochi,2099-07-01,2099-07-02,2147483648\n"
+        "Empty,Kochi,2099-07-01,2099-07-02,0\n"
+        f"{'n' * 255},{'l' * 500},2099-07-01,2099-07-02,2147483647\n"
+    )
+    events, errors = importer.validate_events(frames[0], datetime.now(pytz.UTC))
+
+    assert events.index.tolist() == [5]
+    assert errors.to_dict() == {
+        1: "name must be at most 255 characters",
+        2: "location must be at most 500 characters",
+        3: "max_capacity must be between 1 and 2147483647",
+        4: "max_capacity must be between 1 and 2147483647",
+    }
+
+
+def test_validate_attendees_rejects_emails_email_str_rejects():
+    too_long = "a" * 64 + "@" + ("b" * 60 + ".") * 4 + "com"
+    frames = read_frames(
+        "name,email\n"
+        "Double Dot,a..b@x.com\n"
+        "Bad Domain,x@-bad-.com\n"
+        f"Too Long,{too_long}\n"
+        "Valid,valid@Example.com\n"
+        "Valid Again,valid@example.com\n"
+    )
+    attendees, errors = importer.validate_attendees(frames[0])
+
+    assert attendees.to_dict("records") == [
+        {"name": "Valid", "email": "valid@example.com"},
+        {"name": "Valid Again", "email": "valid@example.com"},
+    ]
+    assert errors.to_dict() == {
+        1: "value is not a valid email address",
+        2: "value is not a valid email address",
+        3: "value is not a valid email address",
+    }
+
+
+def test_detect_format_rejects_unknown_extension():
+    assert importer.detect_format("attendees.jsonl") == "ndjson"
+    assert importer.detect_format("events.csv", "xlsx") == "xlsx"
+    with pytest.raises(Exception) as exc:
+        importer.detect_format("events.txt")
+    assert "Unsupported import format" in str(exc.value)
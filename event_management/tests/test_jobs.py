@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select
+from event_management import jobs, views
+from event_management.api.v1.models.events import RegistrationOutbox
+from event_management.api.v1.schemas.events import AttendeeCreate, EventCreate
+from event_management.jobs import OutboxRelay, RegistrationJobs
+from event_management.views import EventService
+
+
+async def _create_event(db, name):
+    return await EventService.create_event(
+        db,
+        EventCreate(
+            name=name,
+            location="Kochi",
+            start_time=datetime.now() + timedelta(days=1),
+            end_time=datetime.now() + timedelta(days=1, hours=2),
+            max_capacity=10,
+        ),
+    )
+
+
+async def _outbox_size(db):
+    return (await db.execute(select(func.count()).select_from(RegistrationOutbox))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_outbox_registrations_reach_every_handler_in_batches(async_session, monkeypatch):
+    await async_session.execute(delete(RegistrationOutbox))
+    await async_session.commit()
+    relay = OutboxRelay(engine=async_session.bind, batch_size=2)
+    monkeypatch.setattr(views, "registration_jobs", RegistrationJobs("outbox", relay))
+    monkeypatch.setattr(jobs.celery_app.conf, "task_always_eager", True)
+    received = {"email": [], "crm": []}
+    for name, batches in received.items():
+        monkeypatch.setitem(jobs.REGISTRATION_HANDLERS, name, batches.append)
+
+    event = await _create_event(async_session, "Outbox Event")
+    await EventService.register_attendee(
+        async_session, event.id, AttendeeCreate(name="Asha", email="asha@gmail.com")
+    )
+    await EventService.register_attendees(
+        async_session,
+        event.id,
+        [
+            AttendeeCreate(name="Binu", email="binu@gmail.com"),
+            AttendeeCreate(name="Asha", email="asha@gmail.com"),
+            AttendeeCreate(name="Chitra", email="chitra@gmail.com"),
+        ],
+    )
+    assert await _outbox_size(async_session) == 3
+
+    assert await relay.run() == 3
+
+    for batches in received.values():
+        assert [[message["email"] for message in batch] for batch in batches] == [
+            ["asha@gmail.com", "binu@gmail.com"],
+            ["chitra@gmail.com"],
+        ]
+    assert received["email"][0][0]["event_id"] == event.id
+    assert isinstance(received["email"][0][0]["registered_at"], str)
+    assert await _outbox_size(async_session) == 0
+    assert relay.stats()["batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_keeps_outbox_rows(async_session, monkeypatch):
+    await async_session.execute(delete(RegistrationOutbox))
+    await async_session.commit()
+    monkeypatch.setattr(views, "registration_jobs", RegistrationJobs("outbox"))
+    event = await _create_event(async_session, "Broker Down Event")
+    await EventService.register_attendee(
+        async_session, event.id, AttendeeCreate(name="Devi", email="devi@gmail.com")
+    )
+
+    def broker_down(messages):
+        raise ConnectionError("broker unavailable")
+
+    with pytest.raises(ConnectionError):
+        await OutboxRelay(engine=async_session.bind, publish=broker_down).run()
+    assert await _outbox_size(async_session) == 1
+
+    published = []
+    assert await OutboxRelay(engine=async_session.bind, publish=published.extend).run() == 1
+    assert [message["email"] for message in published] == ["devi@gmail.com"]
+    assert await _outbox_size(async_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_direct_mode_publishes_only_committed_registrations(async_session, monkeypatch):
+    published = []
+    registration_jobs = RegistrationJobs("direct", publish=published.extend)
+    monkeypatch.setattr(views, "registration_jobs", registration_jobs)
+    event = await _create_event(async_session, "Direct Event")
+    attendee = AttendeeCreate(name="Elan", email="elan@gmail.com")
+
+    await EventService.register_attendee(async_session, event.id, attendee)
+    with pytest.raises(Exception):
+        await EventService.register_attendee(async_session, event.id, attendee)
+    await registration_jobs.drain()
+
+    assert [message["email"] for message in published] == ["elan@gmail.com"]
+    assert registration_jobs.stats()["queued"] == 1
+    assert await _outbox_size(async_session) == 0
@@ -0,0 +1,30 @@
+from benchmarks.load import compare
+
+
+def _run(p99_ms, rps, queries_per_request, errors=0):
+    return {
+        "scenarios": {
+            "events": {
+                "p95_ms": 10.0,
+                "p99_ms": p99_ms,
+                "rps": rps,
+                "queries_per_request": queries_per_request,
+                "errors": errors,
+            }
+        }
+    }
+
+
+def test_compare_accepts_changes_within_threshold():
+    assert compare(_run(20.0, 1000.0, 1.0), _run(21.0, 950.0, 1.0), threshold=0.1) == []
+
+
+def test_compare_flags_latency_throughput_and_query_regressions():
+    regressions = compare(_run(20.0, 1000.0, 1.0), _run(30.0, 800.0, 2.0, errors=3), threshold=0.1)
+
+    assert regressions == [
+        "events: p99_ms 20.0 -> 30.0",
+        "events: rps 1000.0 -> 800.0",
+        "events: queries_per_request 1.0 -> 2.0",
+        "events: errors 0 -> 3",
+    ]
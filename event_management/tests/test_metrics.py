@@ -0,0 +1,73 @@
+import logging
+import pytest
+from sqlalchemy import text
+from common.metrics import (
+    MetricsMiddleware,
+    MetricsRegistry,
+    RequestStats,
+    instrument_engine,
+)
+
+
+def _app(session, statements):
+    async def app(scope, receive, send):
+        for _ in range(statements):
+            await session.execute(text("SELECT 1"))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return app
+
+
+async def _call(app):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "method": "GET", "path": "/probe", "headers": []}, receive, send)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_middleware_records_sql_per_request(async_session):
+    metrics = MetricsRegistry()
+    instrument_engine("test", async_session.bind, metrics)
+    app = MetricsMiddleware(_app(async_session, 2), server_timing=True, metrics=metrics)
+
+    messages = await _call(app)
+
+    headers = dict(messages[0]["headers"])
+    assert b'desc="2 queries"' in headers[b"server-timing"]
+    assert metrics.statements[("GET", "<unmatched>")] == 2
+    assert metrics.rows[("GET", "<unmatched>")] == 2
+    rendered = metrics.render()
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="200"} 1' in rendered
+    assert 'db_pool_connections{engine="test",state="checked_out"}' in rendered
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_is_reported_as_n_plus_one(async_session, caplog):
+    metrics = MetricsRegistry()
+    instrument_engine("test", async_session.bind, metrics)
+    app = MetricsMiddleware(_app(async_session, 4), n_plus_one_threshold=3, metrics=metrics)
+
+    with caplog.at_level(logging.WARNING, logger="common.metrics"):
+        await _call(app)
+
+    assert metrics.n_plus_one[("GET", "<unmatched>")] == 1
+    assert "statement ran 4 times: SELECT 1" in caplog.text
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = MetricsRegistry()
+    metrics.record("GET", "/x", 200, 0.03, RequestStats())
+    metrics.record("GET", "/x", 200, 0.3, RequestStats())
+    rendered = metrics.render()
+
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.05"} 1' in rendered
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/x",le="0.5"} 2' in rendered
+    assert 'http_request_duration_seconds_count{method="GET",route="/x"} 2' in rendered
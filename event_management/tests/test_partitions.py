@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from event_management.api.v1.models.events import Base
+from event_management.api.v1.schemas.events import EventCreate
+from event_management import partitions
+from event_management.partitions import (
+    MAINTENANCE_LOCK_ID,
+    PartitionMaintainer,
+    add_months,
+    archive_partition,
+    attached_partitions,
+    create_partitions,
+    month_start,
+    partition_name,
+)
+from event_management.tests.conftest import DATABASE_URL
+from event_management.views import EventService
+
+SCHEMA = "partition_maintenance"
+ARCHIVE = "partition_maintenance_archive"
+SCRATCH = "partition_scratch"
+
+
+def test_month_arithmetic_crosses_years():
+    month = month_start(datetime(2025, 11, 30, 22, 0, tzinfo=timezone(timedelta(hours=-5))))
+
+    assert month == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert add_months(month, 1) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -12) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+    assert partition_name("events", month) == "events_p2025_12"
+
+
+@pytest.mark.asyncio
+async def test_maintainer_creates_months_ahead_and_archives_old_ones():
+    engine = create_async_engine(
+        DATABASE_URL, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    now = datetime.now(timezone.utc)
+    current = month_start(now)
+    old = add_months(current, -3)
+    async with engine.begin() as conn:
+        for schema in (SCHEMA, ARCHIVE):
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+        await create_partitions(conn, old, current)
+        event_id = (
+            await conn.execute(
+                text(
+                    "INSERT INTO events (name, location, start_time, end_time, max_capacity) "
+                    "VALUES ('Old', 'Kochi', :start, :start, 5) RETURNING id"
+                ),
+                {"start": old + timedelta(days=2)},
+            )
+        ).scalar()
+        await conn.execute(
+            text(
+                "INSERT INTO attendees (event_id, event_start_time, name, email) "
+                "VALUES (:event_id, :start, 'Pooja', 'pooja@gmail.com')"
+            ),
+            {"event_id": event_id, "start": old + timedelta(days=2)},
+        )
+
+    maintainer = PartitionMaintainer(
+        engine=engine, months_ahead=2, retention_months=1, archive_schema=ARCHIVE
+    )
+    result = await maintainer.run(now)
+
+    assert result["created"] == [
+        partition_name(table, add_months(current, months))
+        for table in ("events", "attendees")
+        for months in (1, 2)
+    ]
+    archived_months = [add_months(current, -3), add_months(current, -2)]
+    assert result["archived"] == [
+        f"{ARCHIVE}.{partition_name(table, month)}"
+        for month in archived_months
+        for table in ("attendees", "events")
+    ]
+    async with engine.connect() as conn:
+        for table in ("events", "attendees"):
+            assert sorted(await attached_partitions(conn, table)) == [
+                add_months(current, months) for months in (-1, 0, 1, 2)
+            ]
+        assert (await conn.execute(text("SELECT count(*) FROM events"))).scalar() == 0
+        archived_attendee = await conn.execute(
+            text(
+                f"SELECT attendees.email FROM {ARCHIVE}.{partition_name('attendees', old)} AS attendees "
+                f"JOIN {ARCHIVE}.{partition_name('events', old)} AS events ON events.id = attendees.event_id"
+            )
+        )
+        assert archived_attendee.scalars().all() == ["pooja@gmail.com"]
+
+    # A second run has nothing left to do.
+    assert await maintainer.run(now) == {"created": [], "archived": []}
+    assert maintainer.stats()["runs"] == 2
+    await engine.dispose()
+
+
+async def _drop_month(engine, month):
+    # Partitions referenced by a foreign key must be detached before they are dropped.
+    async with engine.begin() as conn:
+        await archive_partition(conn, month, SCRATCH)
+        await conn.execute(text(f"DROP SCHEMA {SCRATCH} CASCADE"))
+
+
+@pytest.mark.asyncio
+async def test_create_event_beyond_partitions_creates_them(async_session):
+    start = datetime.now(timezone.utc) + timedelta(days=40 * 365)
+    await _drop_month(async_session.bind, month_start(start))
+
+    event = await EventService.create_event(
+        async_session,
+        EventCreate(
+            name="Far Future Summit",
+            location="Kochi",
+            start_time=start,
+            end_time=start + timedelta(hours=2),
+            max_capacity=10,
+        ),
+    )
+
+    assert event.id is not None
+    await async_session.close()
+    async with async_session.bind.connect() as conn:
+        for table in ("events", "attendees"):
+            assert month_start(start) in await attached_partitions(conn, table)
+    await _drop_month(async_session.bind, month_start(start))
+
+
+@pytest.mark.asyncio
+async def test_create_event_answers_503_while_maintenance_holds_the_lock(async_session, monkeypatch):
+    monkeypatch.setattr(partitions, "LOCK_TIMEOUT", "100ms")
+    start = datetime.now(timezone.utc) + timedelta(days=41 * 365)
+    await _drop_month(async_session.bind, month_start(start))
+
+    async with async_session.bind.begin() as maintenance:
+        await maintenance.execute(
+            text("SELECT pg_advisory_xact_lock(:lock)"), {"lock": MAINTENANCE_LOCK_ID}
+        )
+        with pytest.raises(HTTPException) as exc:
+            await EventService.create_event(
+                async_session,
+                EventCreate(
+                    name="Locked Out Summit",
+                    location="Kochi",
+                    start_time=start,
+                    end_time=start + timedelta(hours=2),
+                    max_capacity=10,
+                ),
+            )
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers == {"Retry-After": "5"}
+    await async_session.close()
+    async with async_session.bind.connect() as conn:
+        assert month_start(start) not in await attached_partitions(conn, "events")
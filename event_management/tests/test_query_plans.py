@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta
+import pytest
+import pytest_asyncio
+import pytz
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+from event_management.api.v1.models.events import Base, Event
+from event_management.partitions import create_partitions, month_start, partition_name
+from event_management.tests.conftest import DATABASE_URL
+from event_management.views import (
+    _event_attendees_query,
+    _registered_emails_query,
+    _reserve_seat_statement,
+    _search_events_query,
+    _upcoming_events_query,
+)
+
+SCHEMA = "query_plans"
+EVENTS = 20000
+ATTENDEES = 200000
+NOW = datetime.now(pytz.UTC)
+# Event 42 of the seed starts 323 days ago.
+EVENT_START = NOW + timedelta(days=42 % 730 - 365)
+_seeded = False
+
+
+@pytest_asyncio.fixture
+async def plan_connection():
+    """Connection to a separate schema with the current indexes and seeded data."""
+    global _seeded
+    engine = create_async_engine(
+        DATABASE_URL, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    if not _seeded:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(Base.metadata.create_all)
+            await create_partitions(conn, NOW - timedelta(days=366), NOW + timedelta(days=366))
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO events (name, location, start_time, end_time, max_capacity,
+                                        attendee_count, created_at, updated_at)
+                    SELECT 'Event ' || g, 'Location ' || (g % 50),
+                           now + (g % 730 - 365) * interval '1 day',
+                           now + (g % 730 - 365) * interval '1 day' + interval '2 hours',
+                           100, 10, now, now
+                    FROM generate_series(1, :events) AS g,
+                         (SELECT CAST(:now AS timestamptz) AS now) AS seed
+                    """
+                ),
+                {"events": EVENTS, "now": NOW},
+            )
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO attendees (event_id, event_start_time, name, email, registered_at)
+                    SELECT 1 + g % :events, now + ((1 + g % :events) % 730 - 365) * interval '1 day',
+                           'Attendee ' || g, 'attendee' || g || '@example.com',
+                           now - g * interval '1 second'
+                    FROM generate_series(1, :attendees) AS g,
+                         (SELECT CAST(:now AS timestamptz) AS now) AS seed
+                    """
+                ),
+                {"events": EVENTS, "attendees": ATTENDEES, "now": NOW},
+            )
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE events"))
+            await conn.execute(text("VACUUM ANALYZE attendees"))
+        _seeded = True
+
+    async with engine.connect() as conn:
+        yield conn
+    await engine.dispose()
+
+
+async def _plan_nodes(conn, statement):
+    compiled = statement.compile(dialect=postgresql.asyncpg.dialect())
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", parameters)
+    nodes, pending = [], [result.scalar()[0]["Plan"]]
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+QUERIES = {
+    "upcoming_events_page": _upcoming_events_query(NOW)
+    .add_columns(func.count().over().label("total"))
+    .offset(40)
+    .limit(20),
+    "upcoming_events_keyset": _upcoming_events_query(NOW, (NOW, 1000)).limit(21),
+    "event_attendee_count": select(Event.attendee_count).where(Event.id == 42),
+    "event_attendees_page": _event_attendees_query(42, EVENT_START).offset(0).limit(10),
+    "event_attendees_keyset": _event_attendees_query(42, EVENT_START, (NOW, 5)).limit(11),
+    "event_attendees_export": _event_attendees_query(42, EVENT_START),
+    "registered_emails": _registered_emails_query(
+        42, EVENT_START, ["attendee42@example.com", "new@example.com"]
+    ),
+    "reserve_seat": _reserve_seat_statement(42, NOW),
+    "search_events": _search_events_query(
+        "location & 7", NOW, NOW + timedelta(days=7), min_seats=1
+    ).limit(10),
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(QUERIES))
+async def test_query_plan_uses_an_index(plan_connection, name):
+    nodes = await _plan_nodes(plan_connection, QUERIES[name])
+
+    seq_scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert seq_scans == [], f"{name} scans {seq_scans} sequentially"
+    assert any("Index" in node["Node Type"] for node in nodes)
+
+
+@pytest.mark.asyncio
+async def test_attendee_pages_are_index_only_scans(plan_connection):
+    nodes = await _plan_nodes(plan_connection, QUERIES["event_attendees_page"])
+
+    assert [node["Relation Name"] for node in nodes if node["Node Type"] == "Index Only Scan"] == [
+        partition_name("attendees", month_start(EVENT_START))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_events_page_index_leaves_registration_columns_out(plan_connection):
+    # Registrations update attendee_count and updated_at, which stay HOT
+    # updates only while no index contains them.
+    indexed = await plan_connection.execute(
+        text(
+            """
+            SELECT DISTINCT attribute.attname
+            FROM pg_index AS index
+            JOIN pg_attribute AS attribute
+              ON attribute.attrelid = index.indrelid AND attribute.attnum = ANY(index.indkey)
+            WHERE index.indrelid = 'events'::regclass
+            """
+        )
+    )
+    assert {"attendee_count", "updated_at"}.isdisjoint(indexed.scalars().all())
+
+    # The page reads its rows through the covering index, with a heap fetch for the rest.
+    nodes = await _plan_nodes(plan_connection, QUERIES["upcoming_events_keyset"])
+    scans = [node["Index Name"] for node in nodes if node["Node Type"] == "Index Scan"]
+    assert scans and all("_start_time_id_" in index_name for index_name in scans), scans
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name", ["upcoming_events_page", "upcoming_events_keyset", "reserve_seat", "search_events"]
+)
+async def test_hot_path_queries_skip_past_partitions(plan_connection, name):
+    nodes = await _plan_nodes(plan_connection, QUERIES[name])
+
+    scanned = {node["Relation Name"] for node in nodes if node.get("Relation Name", "").startswith("events_p")}
+    assert scanned
+    # Partition names sort by month.
+    assert min(scanned) >= partition_name("events", month_start(NOW)), scanned
+
+
+@pytest.mark.asyncio
+async def test_event_attendee_queries_touch_one_partition(plan_connection):
+    for name in ("event_attendees_export", "registered_emails"):
+        nodes = await _plan_nodes(plan_connection, QUERIES[name])
+
+        scanned = {node["Relation Name"] for node in nodes if "Relation Name" in node}
+        assert scanned == {partition_name("attendees", month_start(EVENT_START))}, name
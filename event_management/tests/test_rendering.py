@@ -0,0 +1,115 @@
+from __future__ import annotations
+from datetime import datetime, timedelta
+import pytz
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from common import rendering
+from common.rendering import conditional_get, fast_json, make_etag, not_modified
+from event_management.api.v1.schemas.events import (
+    EventResponse,
+    PaginatedEventsResponse,
+)
+
+
+def _page():
+    created = datetime(2025, 6, 7, 6, 32, 32, 979206, tzinfo=pytz.UTC)
+    return PaginatedEventsResponse(
+        events=[
+            EventResponse.model_construct(
+                id=index,
+                name=f"Onam Sadhya – ഓണം {index}",
+                location="Thiruvananthapuram",
+                start_time=created + timedelta(days=index),
+                end_time=created + timedelta(days=index, hours=3),
+                max_capacity=100,
+                created_at=created,
+                updated_at=created,
+                attendee_count=index,
+            )
+            for index in range(3)
+        ],
+        per_page=3,
+        next_cursor="abc",
+    )
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/standard", response_model=PaginatedEventsResponse, response_model_exclude_none=True)
+    async def standard():
+        return _page()
+
+    @app.get("/fast", response_model=PaginatedEventsResponse, response_model_exclude_none=True)
+    @fast_json(exclude_none=True, enabled=True)
+    async def fast(request: Request, response: Response):
+        response.set_cookie("seen", request.method)
+        return _page()
+
+    @app.get("/conditional", response_model=PaginatedEventsResponse, response_model_exclude_none=True)
+    @conditional_get("public, max-age=5", exclude_none=True)
+    @fast_json(exclude_none=True, enabled=True)
+    async def conditional(request: Request, response: Response, version: str = ""):
+        if not version:
+            return _page()
+        etag = make_etag(version)
+        if request.headers.get("if-none-match") == etag:
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        return _page()
+
+    @app.get("/conditional-standard", response_model=PaginatedEventsResponse, response_model_exclude_none=True)
+    @conditional_get("public, max-age=5", exclude_none=True)
+    @fast_json(exclude_none=True, enabled=False)
+    async def conditional_standard(request: Request):
+        return _page()
+
+    return app
+
+
+def test_fast_json_matches_standard_rendering():
+    client = TestClient(_app())
+    standard = client.get("/standard")
+    fast = client.get("/fast")
+
+    assert fast.content == standard.content
+    assert fast.headers["content-type"] == standard.headers["content-type"]
+    assert b'"total"' not in fast.content
+
+
+def test_fast_json_keeps_headers_set_by_the_endpoint():
+    assert TestClient(_app()).get("/fast").cookies["seen"] == "GET"
+
+
+def test_conditional_get_answers_matching_etags_with_304():
+    client = TestClient(_app())
+    first = client.get("/conditional")
+    assert first.content == client.get("/standard").content
+    assert first.headers["cache-control"] == "public, max-age=5"
+
+    repeat = client.get("/conditional", headers={"If-None-Match": f'W/{first.headers["etag"]}'})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["etag"] == first.headers["etag"]
+    assert client.get("/conditional", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    versioned = client.get("/conditional?version=7")
+    assert versioned.headers["etag"] == make_etag("7")
+    assert versioned.headers["cache-control"] == "private, no-cache"
+    revalidated = client.get("/conditional?version=7", headers={"If-None-Match": make_etag("7")})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == "public, max-age=5"
+
+
+def test_conditional_get_leaves_rendering_to_fast_json(monkeypatch):
+    def render_json(*args, **kwargs):
+        raise AssertionError("rendered with render_json while fast_json is off")
+
+    monkeypatch.setattr(rendering, "render_json", render_json)
+    client = TestClient(_app())
+    first = client.get("/conditional-standard")
+    assert first.content == client.get("/standard").content
+
+    repeat = client.get("/conditional-standard", headers={"If-None-Match": first.headers["etag"]})
+    assert repeat.status_code == 304
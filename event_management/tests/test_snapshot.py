@@ -0,0 +1,126 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func
+from event_management import views
+from event_management.api.v1.schemas.events import EventCreate, EventResponse
+from event_management.snapshot import UpcomingEventsSnapshot
+from event_management.views import EventService, _event_response, _upcoming_events_query
+
+NOW = datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _events(count):
+    return [
+        EventResponse.model_construct(
+            id=index,
+            name=f"Event {index}",
+            location="Kochi",
+            start_time=NOW + timedelta(hours=index),
+            end_time=NOW + timedelta(hours=index + 1),
+            max_capacity=10,
+            created_at=NOW,
+            updated_at=NOW,
+            attendee_count=0,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def _loader(events, total):
+    async def load(limit):
+        return events[:limit], total
+
+    return load
+
+
+@pytest.mark.asyncio
+async def test_snapshot_skips_started_events_and_misses_deep_pages():
+    snapshot = UpcomingEventsSnapshot(_loader(_events(30), 100), size=30)
+    assert snapshot.page(NOW, 1, 10) is None
+    await snapshot.refresh()
+
+    first = snapshot.page(NOW, 1, 10)
+    assert [event.id for event in first.events] == list(range(1, 11))
+    assert (first.total, first.total_pages) == (100, 10)
+    assert first.next_cursor is not None
+
+    # Two events have started since the snapshot was built.
+    later = snapshot.page(NOW + timedelta(hours=2), 2, 10)
+    assert [event.id for event in later.events] == list(range(13, 23))
+    assert later.total == 98
+
+    assert snapshot.page(NOW + timedelta(hours=2), 3, 10) is None
+    assert snapshot.stats()["hits"] == 2
+
+    snapshot._current.built_at -= snapshot.max_staleness + 1
+    assert snapshot.page(NOW, 1, 10) is None
+
+
+@pytest.mark.asyncio
+async def test_complete_snapshot_serves_the_last_page():
+    snapshot = UpcomingEventsSnapshot(_loader(_events(12), 12), size=30)
+    await snapshot.refresh()
+
+    last = snapshot.page(NOW, 2, 10)
+    assert [event.id for event in last.events] == [11, 12]
+    assert last.next_cursor is None
+    assert snapshot.page(NOW, 3, 10).events == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_etag_follows_content_without_counting_lookups():
+    events = _events(12)
+    snapshot = UpcomingEventsSnapshot(_loader(events, 12), size=30)
+    assert snapshot.etag(NOW, 1, 10) is None
+    await snapshot.refresh()
+
+    etag = snapshot.etag(NOW, 1, 10)
+    assert etag == snapshot.etag(NOW, 1, 10)
+    assert etag != snapshot.etag(NOW, 2, 10)
+    assert etag != snapshot.etag(NOW + timedelta(hours=1), 1, 10)
+    assert snapshot.stats()["hits"] == snapshot.stats()["misses"] == 0
+
+    await snapshot.refresh()
+    assert snapshot.etag(NOW, 1, 10) == etag
+    events[0] = events[0].model_copy(
+        update={"attendee_count": 1, "updated_at": NOW + timedelta(seconds=1)}
+    )
+    await snapshot.refresh()
+    assert snapshot.etag(NOW, 1, 10) != etag
+
+
+@pytest.mark.asyncio
+async def test_fetch_upcoming_events_served_from_snapshot(async_session, query_counter, monkeypatch):
+    for hours in (1, 2):
+        await EventService.create_event(
+            async_session,
+            EventCreate(
+                name="Snapshot Event",
+                location="Kochi",
+                start_time=datetime.now() + timedelta(hours=hours),
+                end_time=datetime.now() + timedelta(hours=hours + 1),
+                max_capacity=10,
+            ),
+        )
+
+    async def load(limit):
+        result = await async_session.execute(
+            _upcoming_events_query(datetime.now(timezone.utc))
+            .add_columns(func.count().over().label("total"))
+            .limit(limit)
+        )
+        rows = result.all()
+        return [_event_response(event) for event, _ in rows], rows[0].total
+
+    snapshot = UpcomingEventsSnapshot(load, size=2)
+    monkeypatch.setattr(views, "upcoming_snapshot", snapshot)
+    await snapshot.refresh()
+    query_counter.clear()
+
+    served = await EventService.fetch_upcoming_events(async_session, per_page=2)
+    assert query_counter == []
+    assert len(served.events) == 2
+
+    deeper = await EventService.fetch_upcoming_events(async_session, page=2, per_page=2)
+    assert query_counter
+    assert deeper.total == served.total
@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+from fastapi import Response
+from sqlalchemy import event
+from common.config import settings
+from common.database import build_engine
+from event_management.api.v1.endpoints import routes
+from event_management.tests.conftest import DATABASE_URL
+from event_management.warmup import Warmup, warm_pool, warm_schemas
+
+
+@pytest.mark.asyncio
+async def test_not_ready_until_warmup_finishes(monkeypatch):
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.05)
+
+    async def broken():
+        raise RuntimeError("database is down")
+
+    warmup = Warmup({"slow": slow, "broken": broken, "schemas": warm_schemas})
+    monkeypatch.setattr(routes, "warmup", warmup)
+    warmup.start()
+    await started.wait()
+    response = Response()
+    assert (await routes.readiness_check(response))["ready"] is False
+    assert response.status_code == 503
+
+    await warmup._task
+    response = Response()
+    stats = await routes.readiness_check(response)
+    assert response.status_code == 200
+    assert stats["ready"] and stats["failures"] == ["broken"]
+    assert list(stats["steps"]) == ["slow", "broken", "schemas"]
+    assert stats["warmup_seconds"] >= 0.05
+    await warmup.stop()
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_opens_and_warms_every_connection(async_session):
+    options = {**settings.db_engine_options(), "pool_size": 3}
+    engine = build_engine(DATABASE_URL, options)
+    connections_used = set()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        connections_used.add(id(conn.connection.dbapi_connection))
+
+    try:
+        assert await warm_pool(engine) == 3
+        assert len(connections_used) == 3
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,52 @@
+import argparse
+import os
+import pytest
+import serve
+from common.config import settings
+from common.workers import (
+    WorkerStatusReporter,
+    connection_budget,
+    read_status_files,
+    require_shared_backends,
+)
+
+
+def test_connection_budget_caps_all_workers():
+    assert connection_budget(100, 4, pool_size=5, reserved_per_worker=1) == (5, 19)
+    assert connection_budget(12, 4, pool_size=5, reserved_per_worker=1) == (2, 0)
+    for workers in (1, 3, 7):
+        pool_size, max_overflow = connection_budget(90, workers, pool_size=20, reserved_per_worker=1)
+        assert workers * (pool_size + max_overflow + 1) <= 90
+
+    with pytest.raises(ValueError):
+        connection_budget(7, 4, pool_size=5, reserved_per_worker=1)
+
+
+@pytest.mark.asyncio
+async def test_status_files_report_live_workers(tmp_path):
+    reporter = WorkerStatusReporter(
+        str(tmp_path / "worker-1.json"), lambda: {"worker": 1, "ready": True}
+    )
+    reporter.write()
+    (tmp_path / "worker-0.json").write_text('{"worker": 0, "pid": 999999999}')
+
+    statuses = read_status_files(str(tmp_path))
+    assert [(status["worker"], status["alive"]) for status in statuses] == [(0, False), (1, True)]
+    assert statuses[1]["pid"] == os.getpid() and statuses[1]["ready"]
+
+    await reporter.stop()
+    assert not (tmp_path / "worker-1.json").exists()
+
+
+def test_supervisor_refuses_per_process_backends_for_several_workers(monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_BACKEND", "memory")
+    monkeypatch.setattr(settings, "EVENTS_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(serve, "Supervisor", None)
+    args = argparse.Namespace(workers=4, connection_budget=80)
+
+    assert serve.run(args) == 2
+
+    require_shared_backends(1, {"IDEMPOTENCY_BACKEND": "memory"})
+    require_shared_backends(4, {"IDEMPOTENCY_BACKEND": "redis", "EVENTS_CACHE_BACKEND": "none"})
+    with pytest.raises(ValueError, match="EVENTS_CACHE_BACKEND=memory"):
+        require_shared_backends(2, {"EVENTS_CACHE_BACKEND": "memory"})
@@ -1,22 +1,243 @@
+from collections import Counter
 from datetime import datetime, time
 import math
+import re
+import asyncpg
 from dateutil import parser
 from fastapi import HTTPException
-from sqlalchemy import and_, select
-from typing import List
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    String,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSQUERY, insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 import pytz
+from common.config import settings
+from common.cache import build_cache
+from common.database import async_session_maker, read_session_maker
 from event_management.api.v1.schemas.events import (
     AttendeeCreate,
     AttendeeResponse,
+    BulkRegistrationResponse,
+    BulkRegistrationResult,
     EventCreate,
+    ImportReport,
+    ImportRowError,
     EventResponse,
     PaginatedAttendeesResponse,
     PaginatedEventsResponse,
+    RegistrationStatus,
+)
+from event_management.api.v1.models.events import SEARCH_DAY_SECONDS, Attendee, Event
+from event_management.pagination import decode_cursor, encode_cursor
+from event_management.snapshot import UpcomingEventsSnapshot
+from event_management import availability, exporter, importer, partitions
+from event_management.jobs import registration_jobs, registration_message
+
+
+events_cache = build_cache(
+    settings.EVENTS_CACHE_BACKEND,
+    namespace="events",
+    max_entries=settings.EVENTS_CACHE_MAX_ENTRIES,
+    redis_url=settings.REDIS_URL,
+    dumps=lambda page: page.model_dump_json().encode(),
+    loads=PaginatedEventsResponse.model_validate_json,
+)
+
+
+def event_cache_tag(event_id: int) -> str:
+    """Tag of the events_cache pages that list an event."""
+    return f"event:{event_id}"
+
+
+def _event_response(event: Event) -> EventResponse:
+    # Columns are already typed by the database, so skip validation entirely.
+    return EventResponse.model_construct(
+        id=event.id,
+        name=event.name,
+        location=event.location,
+        start_time=event.start_time,
+        end_time=event.end_time,
+        max_capacity=event.max_capacity,
+        created_at=event.created_at,
+        updated_at=event.updated_at,
+        attendee_count=event.attendee_count,
+    )
+
+
+def _attendee_response(attendee: Row) -> AttendeeResponse:
+    return AttendeeResponse.model_construct(
+        id=attendee.id,
+        name=attendee.name,
+        email=attendee.email,
+        registered_at=attendee.registered_at,
+    )
+
+
+def _record_import_errors(report: ImportReport, errors: List[tuple]) -> None:
+    report.failed += len(errors)
+    room = settings.IMPORT_MAX_REPORTED_ERRORS - len(report.errors)
+    for row, error in errors[: max(room, 0)]:
+        report.errors.append(ImportRowError(row=row, error=error))
+
+
+# Error details of rejected registrations, also used by the registration coalescer.
+REJECTION_MESSAGES = {
+    RegistrationStatus.DUPLICATE: "Email already registered for this event",
+    RegistrationStatus.OVER_CAPACITY: "Event has reached maximum capacity",
+}
+
+
+# Query builders shared by EventService and the query plan tests, which
+# check that each one is served by an index.
+
+
+def _upcoming_events_query(current_time: datetime, position: Optional[tuple] = None):
+    query = (
+        select(Event)
+        .where(Event.start_time > current_time)
+        .order_by(Event.start_time, Event.id)
+    )
+    if position:
+        query = query.where(tuple_(Event.start_time, Event.id) > position)
+    return query
+
+
+def _event_attendees_query(
+    event_id: int, event_start_time: datetime, position: Optional[tuple] = None
+):
+    # Only columns in the covering index, so pages and exports are index-only
+    # scans, and the partition key limits them to the event's partition.
+    query = (
+        select(Attendee.id, Attendee.name, Attendee.email, Attendee.registered_at)
+        .where(Attendee.event_id == event_id, Attendee.event_start_time == event_start_time)
+        .order_by(Attendee.registered_at, Attendee.id)
+    )
+    if position:
+        query = query.where(tuple_(Attendee.registered_at, Attendee.id) > position)
+    return query
+
+
+def _registered_emails_query(event_id: int, event_start_time: datetime, emails: List[str]):
+    return select(Attendee.email).where(
+        Attendee.event_id == event_id,
+        Attendee.event_start_time == event_start_time,
+        Attendee.email == any_(bindparam("batch_emails", emails, type_=ARRAY(String))),
+    )
+
+
+# Longer ranges match too many day lexemes to narrow the index lookup.
+_MAX_SEARCH_DAYS = 62
+
+
+def _search_terms(query_text: str) -> Optional[str]:
+    """Turn free text into a tsquery, e.g. "Bangalore jazz" -> "bangalore & jazz"."""
+    # Whole words only: GIN expands a prefix query into a bitmap of every match,
+    # which costs tens of milliseconds on common words.
+    return " & ".join(re.findall(r"\w+", query_text.lower())) or None
+
+
+def _search_days(starts_after: datetime, starts_before: Optional[datetime]) -> Optional[str]:
+    """Return a tsquery matching the start-day lexemes of a short date range, else None."""
+    if starts_before is None or starts_before <= starts_after:
+        return None
+    first = int(starts_after.timestamp() // SEARCH_DAY_SECONDS)
+    last = int(starts_before.timestamp() // SEARCH_DAY_SECONDS)
+    if last - first >= _MAX_SEARCH_DAYS:
+        return None
+    return " | ".join(f"'@d{day}'" for day in range(first, last + 1))
+
+
+def _search_events_query(
+    terms: str,
+    starts_after: datetime,
+    starts_before: Optional[datetime] = None,
+    min_seats: int = 0,
+):
+    tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), terms)
+    rank = func.ts_rank(Event.search_vector, tsquery)
+    match = tsquery
+    days = _search_days(starts_after, starts_before)
+    if days is not None:
+        # Lets the GIN index apply the date range; start_time is still checked below.
+        match = tsquery.op("&&")(cast(literal(days), TSQUERY))
+    query = (
+        select(Event, func.count().over().label("total"))
+        .where(Event.search_vector.op("@@")(match), Event.start_time > starts_after)
+        .order_by(rank.desc(), Event.start_time, Event.id)
+    )
+    if starts_before is not None:
+        query = query.where(Event.start_time < starts_before)
+    if min_seats:
+        query = query.where(Event.seats_remaining >= min_seats)
+    return query
+
+
+def _seat_notifications() -> tuple:
+    # Returned by the statements that take seats; PostgreSQL delivers the
+    # notification on commit, so the availability feed costs no round trip.
+    if not settings.AVAILABILITY_STREAMING:
+        return ()
+    return (
+        func.pg_notify(
+            availability.SEAT_AVAILABILITY_CHANNEL,
+            func.concat(Event.id, ":", Event.max_capacity - Event.attendee_count),
+        ),
+    )
+
+
+def _reserve_seat_statement(event_id: int, current_time: datetime):
+    return (
+        update(Event)
+        .where(
+            Event.id == event_id,
+            Event.start_time > current_time,
+            Event.attendee_count < Event.max_capacity,
+        )
+        .values(attendee_count=Event.attendee_count + 1)
+        .returning(Event.start_time, *_seat_notifications())
+    )
+
+
+def _seats_remaining_query(event_ids: List[int], current_time: datetime):
+    return select(Event.id, Event.max_capacity - Event.attendee_count).where(
+        Event.id.in_(event_ids), Event.start_time > current_time
+    )
+
+
+async def _load_upcoming_snapshot(limit: int) -> Tuple[List[EventResponse], int]:
+    async with read_session_maker() as db:
+        result = await db.execute(
+            _upcoming_events_query(datetime.now(pytz.UTC))
+            .add_columns(func.count().over().label("total"))
+            .limit(limit)
+        )
+        rows = result.all()
+    return [_event_response(event) for event, _ in rows], rows[0].total if rows else 0
+
+
+upcoming_snapshot = UpcomingEventsSnapshot(
+    _load_upcoming_snapshot,
+    size=settings.UPCOMING_SNAPSHOT_SIZE,
+    interval_seconds=settings.UPCOMING_SNAPSHOT_INTERVAL,
+    max_staleness=settings.UPCOMING_SNAPSHOT_MAX_STALENESS,
 )
-from event_management.api.v1.models.events import Attendee, Event
 
 
 class EventService:
@@ -25,6 +246,10 @@ class EventService:
         """
         Create a new event in the database.
 
+        Partitions are normally created ahead of time by the partition
+        maintainer. An event starting beyond them gets its month's
+        partitions created on demand, and the insert is retried once.
+
         Args:
             db (AsyncSession): Async SQLAlchemy session instance.
             event_data (EventCreate): Pydantic schema containing event creation data.
@@ -33,10 +258,19 @@ class EventService:
             Event: The created Event ORM instance.
         """
         event_dict = event_data.model_dump()
-        tz = pytz.timezone("Asia/Kolkata")
         event_obj = Event(**event_dict)
         db.add(event_obj)
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError as exc:
+            await db.rollback()
+            if not partitions.is_missing_partition(exc):
+                raise
+            await partitions.ensure_partitions(await db.connection(), [event_obj.start_time])
+            await db.commit()
+            db.add(event_obj)
+            await db.commit()
+        await events_cache.clear()
         await db.refresh(event_obj)
         return event_obj
 
@@ -46,64 +280,103 @@ class EventService:
         timezone: str = "Asia/Kolkata",
         page: int = 1,
         per_page: int = 10,
+        cursor: Optional[str] = None,
+        use_cache: bool = True,
     ) -> PaginatedEventsResponse:
         """
         Fetch upcoming events filtered by timezone with pagination.
 
+        The page and its window total are loaded in a single statement and
+        attendee counts are read from the maintained Event.attendee_count
+        column, so the number of round trips does not grow with per_page.
+        When a cursor is given, the page is read by keyset on
+        (start_time, id) instead and no total is computed. Offset pages
+        within the first UPCOMING_SNAPSHOT_SIZE events are served from
+        upcoming_snapshot while it is at most UPCOMING_SNAPSHOT_MAX_STALENESS
+        seconds old. Other offset pages are served from events_cache for
+        EVENTS_CACHE_TTL seconds. New events clear the cache, and
+        registrations only invalidate the cached pages listing their event.
+
         Args:
             db (AsyncSession): Async SQLAlchemy session instance.
             timezone (str, optional): Timezone string to filter upcoming events. Defaults to "Asia/Kolkata".
             page (int, optional): Page number for pagination. Defaults to 1.
             per_page (int, optional): Number of items per page. Defaults to 10.
+            cursor (str, optional): Keyset cursor from a previous page; an empty string starts from the first event.
+            use_cache (bool, optional): Whether offset pages may be served from upcoming_snapshot or
+                                        events_cache. Defaults to True.
 
         Returns:
             PaginatedEventsResponse: Paginated response containing list of upcoming events and metadata.
         """
         tz = pytz.timezone(timezone)
         current_time = datetime.now(tz)
-        offset = (page - 1) * per_page
-        count_result = await db.execute(
-            select(func.count()).select_from(
-                select(Event).where(Event.start_time > current_time).subquery()
+
+        if cursor is not None:
+            result = await db.execute(
+                _upcoming_events_query(current_time, decode_cursor(cursor)).limit(per_page + 1)
             )
-        )
-        total_events = count_result.scalar() or 0
+            events = result.scalars().all()
+            next_cursor = None
+            if len(events) > per_page:
+                events = events[:per_page]
+                next_cursor = encode_cursor(events[-1].start_time, events[-1].id)
+            return PaginatedEventsResponse(
+                events=[_event_response(event) for event in events],
+                per_page=per_page,
+                next_cursor=next_cursor,
+            )
+
+        # The filter compares absolute instants, so the timezone is not part of the key.
+        cache_key = f"upcoming:{page}:{per_page}"
+        if use_cache:
+            snapshot_page = upcoming_snapshot.page(current_time, page, per_page)
+            if snapshot_page is not None:
+                return snapshot_page
+            cached = await events_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        generation = events_cache.version
+
+        offset = (page - 1) * per_page
         result = await db.execute(
-            select(Event)
-            .where(Event.start_time > current_time)
-            .order_by(Event.start_time)
+            _upcoming_events_query(current_time)
+            .add_columns(func.count().over().label("total"))
             .offset(offset)
             .limit(per_page)
         )
-        events = result.scalars().all()
+        rows = result.all()
 
-        response_events = []
-        for event in events:
+        if rows:
+            total_events = rows[0].total
+        elif offset:
+            # The window total is only available when the page has rows.
             count_result = await db.execute(
-                select(func.count(Attendee.id)).where(Attendee.event_id == event.id)
-            )
-            attendee_count = count_result.scalar() or 0
-            response_events.append(
-                EventResponse(
-                    id=event.id,
-                    name=event.name,
-                    location=event.location,
-                    start_time=event.start_time,
-                    end_time=event.end_time,
-                    max_capacity=event.max_capacity,
-                    created_at=event.created_at,
-                    updated_at=event.updated_at,
-                    attendee_count=attendee_count,
-                )
+                select(func.count(Event.id)).where(Event.start_time > current_time)
             )
+            total_events = count_result.scalar() or 0
+        else:
+            total_events = 0
+
+        events = [event for event, _ in rows]
+        next_cursor = None
+        if offset + len(events) < total_events:
+            next_cursor = encode_cursor(events[-1].start_time, events[-1].id)
         total_pages = (total_events + per_page - 1) // per_page
-        return PaginatedEventsResponse(
-            events=response_events,
+        response = PaginatedEventsResponse(
+            events=[_event_response(event) for event in events],
             total=total_events,
             page=page,
             per_page=per_page,
             total_pages=total_pages,
+            next_cursor=next_cursor,
         )
+        # Registrations only invalidate the pages listing their event.
+        tags = [event_cache_tag(event.id) for event in events]
+        # Skip caching a page read before a concurrent write invalidated it.
+        if use_cache and not events_cache.changed_since(generation, tags):
+            await events_cache.set(cache_key, response, settings.EVENTS_CACHE_TTL, tags)
+        return response
 
     @staticmethod
     async def register_attendee(
@@ -112,6 +385,13 @@ class EventService:
         """
         Register a new attendee for an event.
 
+        A seat is reserved with a single conditional UPDATE on the event's
+        attendee_count, and the attendee is inserted in the same transaction.
+        Concurrent registrations therefore cannot oversell the event, and
+        duplicate emails are detected from the unique_email_per_event
+        constraint instead of a separate lookup. Follow-up work runs in the
+        job pipeline of event_management.jobs, off the request path.
+
         Args:
             db (AsyncSession): Async SQLAlchemy session instance.
             event_id (int): ID of the event to register the attendee for.
@@ -124,67 +404,658 @@ class EventService:
         Returns:
             AttendeeResponse: Response schema with the registered attendee's details.
         """
+        tz = pytz.timezone("Asia/Kolkata")
+        current_time = datetime.now(tz)
+        reserved = await db.execute(_reserve_seat_statement(event_id, current_time))
+        event_start_time = reserved.scalar()
+        if event_start_time is None:
+            raise await EventService._registration_rejection(
+                db, event_id, attendee_data.email, current_time
+            )
+
+        # Partitions name their copies of the constraint after themselves, so
+        # let PostgreSQL resolve it rather than matching the error message.
+        inserted = await db.execute(
+            pg_insert(Attendee)
+            .values(
+                event_id=event_id,
+                event_start_time=event_start_time,
+                **attendee_data.model_dump(),
+            )
+            .on_conflict_do_nothing(constraint="unique_email_per_event")
+            .returning(Attendee.id, Attendee.registered_at)
+        )
+        attendee = inserted.first()
+        if attendee is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Email already registered for this event",
+            )
+        await registration_jobs.queue(
+            db,
+            [
+                registration_message(
+                    attendee.id,
+                    event_id,
+                    attendee_data.name,
+                    attendee_data.email,
+                    attendee.registered_at,
+                )
+            ],
+        )
+        await db.commit()
+        await events_cache.invalidate([event_cache_tag(event_id)])
+        registration_jobs.committed(db)
+
+        return AttendeeResponse.model_construct(
+            id=attendee.id,
+            name=attendee_data.name,
+            email=attendee_data.email,
+            registered_at=attendee.registered_at,
+        )
+
+    @staticmethod
+    async def register_attendees(
+        db: AsyncSession, event_id: int, attendees_data: List[AttendeeCreate]
+    ) -> BulkRegistrationResponse:
+        """
+        Register a batch of attendees for an event in a single transaction.
+
+        Rows are processed in order with the same rules as register_attendee:
+        an email already registered for the event, or repeated earlier in the
+        batch, is reported as a duplicate, and rows past the remaining
+        capacity are reported as over capacity. The event row is locked once,
+        and all created attendees are inserted with one multi-row statement.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            event_id (int): ID of the event to register the attendees for.
+            attendees_data (List[AttendeeCreate]): Attendees to register, in priority order.
+
+        Raises:
+            HTTPException: If the event is not found or registration is attempted for a past event.
+
+        Returns:
+            BulkRegistrationResponse: Per-row registration results and totals.
+        """
+        statuses, created = await EventService.register_batch(
+            db,
+            event_id,
+            [attendee.name for attendee in attendees_data],
+            [attendee.email for attendee in attendees_data],
+        )
+        await db.commit()
+        if created:
+            await events_cache.invalidate([event_cache_tag(event_id)])
+            registration_jobs.committed(db)
+
+        results = []
+        for index, (attendee, row_status) in enumerate(zip(attendees_data, statuses)):
+            row = created.get(attendee.email) if row_status == RegistrationStatus.CREATED else None
+            # Rows were validated on the way in, so skip re-validating emails.
+            results.append(
+                BulkRegistrationResult.model_construct(
+                    index=index,
+                    email=attendee.email,
+                    status=row_status,
+                    attendee=(
+                        AttendeeResponse.model_construct(
+                            id=row.id,
+                            name=attendee.name,
+                            email=attendee.email,
+                            registered_at=row.registered_at,
+                        )
+                        if row is not None
+                        else None
+                    ),
+                )
+            )
+
+        counts = Counter(statuses)
+        return BulkRegistrationResponse(
+            results=results,
+            created=counts[RegistrationStatus.CREATED],
+            duplicates=counts[RegistrationStatus.DUPLICATE],
+            over_capacity=counts[RegistrationStatus.OVER_CAPACITY],
+        )
+
+    @staticmethod
+    async def register_batch(
+        db: AsyncSession, event_id: int, names: List[str], emails: List[str]
+    ) -> Tuple[List[RegistrationStatus], Dict[str, Row]]:
+        """
+        Reserve seats for and insert a batch of attendees without committing.
+
+        Created attendees are queued for the job pipeline in the same transaction.
+        Used by register_attendees, import_attendees and the registration
+        coalescer, which commit and invalidate the event's cached pages.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            event_id (int): ID of the event to register the attendees for.
+            names (List[str]): Validated attendee names, in priority order.
+            emails (List[str]): Validated attendee emails, aligned with names.
+
+        Raises:
+            HTTPException: If the event is not found or registration is attempted for a past event.
+
+        Returns:
+            Tuple[List[RegistrationStatus], Dict[str, Row]]: One status per input row, and the
+            (id, email, registered_at) row of every created attendee keyed by email.
+        """
+        tz = pytz.timezone("Asia/Kolkata")
+        current_time = datetime.now(tz)
+        # Bounded by start_time so that only current partitions are searched.
+        event_obj = await db.execute(
+            select(Event.start_time, Event.attendee_count, Event.max_capacity)
+            .where(Event.id == event_id, Event.start_time > current_time)
+            .with_for_update()
+        )
+        event = event_obj.first()
+        if not event:
+            found = await db.execute(select(Event.id).where(Event.id == event_id))
+            if found.first() is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot register for past events",
+            )
+
+        existing_obj = await db.execute(
+            _registered_emails_query(event_id, event.start_time, list(set(emails)))
+        )
+        seen = set(existing_obj.scalars().all())
+
+        statuses = []
+        granted_names = []
+        granted_emails = []
+        seats = max(event.max_capacity - event.attendee_count, 0)
+        for name, email in zip(names, emails):
+            if email in seen:
+                statuses.append(RegistrationStatus.DUPLICATE)
+                continue
+            seen.add(email)
+            if len(granted_emails) < seats:
+                statuses.append(RegistrationStatus.CREATED)
+                granted_names.append(name)
+                granted_emails.append(email)
+            else:
+                statuses.append(RegistrationStatus.OVER_CAPACITY)
+
+        if not granted_emails:
+            return statuses, {}
+
+        source = (
+            func.unnest(
+                bindparam("names", granted_names, type_=ARRAY(String)),
+                bindparam("emails", granted_emails, type_=ARRAY(String)),
+            )
+            .table_valued("name", "email")
+            .render_derived()
+        )
+        registered_at = datetime.now(pytz.UTC)
+        inserted = await db.execute(
+            pg_insert(Attendee)
+            .from_select(
+                ["event_id", "event_start_time", "name", "email", "registered_at"],
+                select(
+                    literal(event_id, Integer),
+                    literal(event.start_time, DateTime(timezone=True)),
+                    source.c.name,
+                    source.c.email,
+                    literal(registered_at, DateTime(timezone=True)),
+                ),
+            )
+            .on_conflict_do_nothing(constraint="unique_email_per_event")
+            .returning(Attendee.id, Attendee.email, Attendee.registered_at)
+        )
+        created = {row.email: row for row in inserted.all()}
+        await db.execute(
+            update(Event)
+            .where(Event.id == event_id, Event.start_time == event.start_time)
+            .values(attendee_count=Event.attendee_count + len(created))
+            .returning(*_seat_notifications())
+        )
+        await registration_jobs.queue(
+            db,
+            [
+                registration_message(row.id, event_id, name, email, row.registered_at)
+                for name, email in zip(granted_names, granted_emails)
+                if (row := created.get(email)) is not None
+            ],
+        )
+
+        if len(created) < len(granted_emails):
+            # Rows that lost a race with a concurrent insert of the same email.
+            statuses = [
+                RegistrationStatus.DUPLICATE
+                if row_status == RegistrationStatus.CREATED and email not in created
+                else row_status
+                for email, row_status in zip(emails, statuses)
+            ]
+        return statuses, created
+
+    @staticmethod
+    async def export_event_attendees(
+        db: AsyncSession,
+        event_id: int,
+        file_format: str,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+    ) -> AsyncIterator[bytes]:
+        """
+        Export every attendee of an event as a stream of CSV or NDJSON bytes.
+
+        The event is checked with the request session. The rows are then
+        read through a server-side cursor on a session owned by the stream,
+        EXPORT_BATCH_SIZE rows at a time, so memory stays flat however large
+        the event is.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            event_id (int): ID of the event to export the attendees of.
+            file_format (str): One of "csv" or "ndjson".
+            session_factory (Callable[[], AsyncSession], optional): Factory for the streaming session.
+
+        Raises:
+            HTTPException: If the event is not found or the format is unsupported.
+
+        Returns:
+            AsyncIterator[bytes]: Encoded attendee rows in registration order.
+        """
+        exporter.media_type_for(file_format)
+        event_obj = await db.execute(select(Event.start_time).where(Event.id == event_id))
+        event_start_time = event_obj.scalar()
+        if event_start_time is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+            )
+        return EventService._stream_attendee_rows(
+            event_id, event_start_time, file_format, session_factory
+        )
+
+    @staticmethod
+    async def _stream_attendee_rows(
+        event_id: int,
+        event_start_time: datetime,
+        file_format: str,
+        session_factory: Callable[[], AsyncSession],
+    ) -> AsyncIterator[bytes]:
+        async with session_factory() as session:
+            result = await session.stream(
+                _event_attendees_query(event_id, event_start_time).execution_options(
+                    yield_per=settings.EXPORT_BATCH_SIZE
+                )
+            )
+            header = file_format == "csv"
+            async for rows in result.partitions():
+                yield exporter.encode_rows(rows, file_format, header=header)
+                header = False
+            if header:
+                yield exporter.encode_rows([], file_format, header=True)
+
+    @staticmethod
+    async def stream_seat_availability(
+        db: AsyncSession,
+        event_ids: List[int],
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream the seats remaining of upcoming events as Server-Sent Events.
+
+        The stream starts with the current count of every event, then sends
+        an "availability" event whenever registrations change a count, as
+        pushed by availability.availability_hub, and a keepalive comment
+        after AVAILABILITY_HEARTBEAT_SECONDS of silence.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance, used to check the events.
+            event_ids (List[int]): IDs of the events to follow.
+            session_factory (Callable[[], AsyncSession], optional): Factory of the session reading
+                                                                    the initial counts once streaming starts.
+
+        Raises:
+            HTTPException: If AVAILABILITY_STREAMING is off, none of the events exists or is
+                           upcoming, or the worker already serves AVAILABILITY_MAX_SUBSCRIBERS streams.
+
+        Returns:
+            AsyncIterator[bytes]: SSE chunks, until the client disconnects.
+        """
+        if not settings.AVAILABILITY_STREAMING:
+            # No availability_hub is listening, so the stream would only send keepalives.
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Seat availability streaming is disabled",
+            )
+        found = await db.execute(_seats_remaining_query(event_ids, datetime.now(pytz.UTC)))
+        upcoming = [event_id for event_id, _ in found.all()]
+        if not upcoming:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+        availability.availability_hub.check_capacity()
+        return EventService._stream_seat_availability(upcoming, session_factory)
+
+    @staticmethod
+    async def _stream_seat_availability(
+        event_ids: List[int], session_factory: Callable[[], AsyncSession]
+    ) -> AsyncIterator[bytes]:
+        hub = availability.availability_hub
+        subscription = hub.subscribe(event_ids)
+        try:
+            # Read after subscribing, so a change in between is not missed.
+            async with session_factory() as session:
+                seats = await session.execute(
+                    _seats_remaining_query(event_ids, datetime.now(pytz.UTC))
+                )
+                initial = dict(seats.all())
+            async for chunk in hub.stream(
+                subscription, initial, settings.AVAILABILITY_HEARTBEAT_SECONDS
+            ):
+                yield chunk
+        finally:
+            hub.unsubscribe(subscription)
+
+    @staticmethod
+    async def import_events(db: AsyncSession, file, file_format: str) -> ImportReport:
+        """
+        Import events from an uploaded CSV, XLSX or NDJSON file.
+
+        The file is read in chunks of IMPORT_CHUNK_SIZE rows. Each chunk is
+        validated with vectorized EventCreate rules and its valid rows are
+        written with COPY and committed, so memory use does not depend on the
+        size of the file. A chunk with events in months that have no
+        partition yet creates them and is copied again.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            file: Binary file object with the uploaded data.
+            file_format (str): One of "csv", "xlsx" or "ndjson".
+
+        Raises:
+            HTTPException: If the file is missing required columns.
+
+        Returns:
+            ImportReport: Row counts and the first IMPORT_MAX_REPORTED_ERRORS row errors.
+        """
+        report = ImportReport()
+        frames = importer.iter_frames(file, file_format, settings.IMPORT_CHUNK_SIZE)
+        while (frame := await run_in_threadpool(next, frames, None)) is not None:
+            importer.require_columns(frame, importer.EVENT_COLUMNS)
+            current_time = datetime.now(pytz.UTC)
+            events, errors = await run_in_threadpool(
+                importer.validate_events, frame, current_time
+            )
+            report.processed += len(frame)
+            _record_import_errors(report, list(errors.items()))
+            if events.empty:
+                continue
+
+            records = importer.event_records(events, current_time)
+            try:
+                await EventService._copy_events(db, records)
+            except asyncpg.CheckViolationError as exc:
+                if not partitions.is_missing_partition(exc):
+                    raise
+                await db.rollback()
+                await partitions.ensure_partitions(
+                    await db.connection(), [record[2] for record in records]
+                )
+                await db.commit()
+                await EventService._copy_events(db, records)
+            await db.commit()
+            await events_cache.clear()
+            report.imported += len(events)
+        return report
+
+    @staticmethod
+    async def _copy_events(db: AsyncSession, records: List[tuple]) -> None:
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Event.__tablename__,
+            records=records,
+            columns=[
+                "name",
+                "location",
+                "start_time",
+                "end_time",
+                "max_capacity",
+                "created_at",
+                "updated_at",
+            ],
+        )
+
+    @staticmethod
+    async def import_attendees(
+        db: AsyncSession, event_id: int, file, file_format: str
+    ) -> ImportReport:
+        """
+        Import attendees for an event from an uploaded CSV, XLSX or NDJSON file.
+
+        Chunks are validated with vectorized AttendeeCreate rules. Each chunk
+        is then registered and committed as one batch with the
+        register_attendees rules. Duplicates and rows over capacity are
+        reported as row errors.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            event_id (int): ID of the event to register the attendees for.
+            file: Binary file object with the uploaded data.
+            file_format (str): One of "csv", "xlsx" or "ndjson".
+
+        Raises:
+            HTTPException: If the file is missing required columns, the event is not found or has already started.
+
+        Returns:
+            ImportReport: Row counts and the first IMPORT_MAX_REPORTED_ERRORS row errors.
+        """
+        report = ImportReport()
+        frames = importer.iter_frames(file, file_format, settings.IMPORT_CHUNK_SIZE)
+        while (frame := await run_in_threadpool(next, frames, None)) is not None:
+            importer.require_columns(frame, importer.ATTENDEE_COLUMNS)
+            attendees, errors = await run_in_threadpool(
+                importer.validate_attendees, frame
+            )
+            report.processed += len(frame)
+            _record_import_errors(report, list(errors.items()))
+            if attendees.empty:
+                continue
+
+            statuses, _ = await EventService.register_batch(
+                db,
+                event_id,
+                attendees["name"].tolist(),
+                attendees["email"].tolist(),
+            )
+            await db.commit()
+            await events_cache.invalidate([event_cache_tag(event_id)])
+            registration_jobs.committed(db)
+            rejected = [
+                (row, REJECTION_MESSAGES[row_status])
+                for row, row_status in zip(attendees.index, statuses)
+                if row_status != RegistrationStatus.CREATED
+            ]
+            report.imported += len(statuses) - len(rejected)
+            _record_import_errors(report, rejected)
+        return report
+
+    @staticmethod
+    async def _registration_rejection(
+        db: AsyncSession, event_id: int, email: str, current_time: datetime
+    ) -> HTTPException:
+        """
+        Work out why a seat could not be reserved for an event.
+
+        Only runs on the failure path of register_attendee, so the checks cost
+        nothing for successful registrations.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            event_id (int): ID of the event the registration was attempted for.
+            email (str): Email address of the rejected attendee.
+            current_time (datetime): Time the reservation was attempted at.
+
+        Returns:
+            HTTPException: The error to raise for the rejected registration.
+        """
         result = await db.execute(select(Event).where(Event.id == event_id))
         event = result.scalars().first()
         if not event:
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
             )
-        tz = pytz.timezone("Asia/Kolkata")
-        current_time = datetime.now(tz)
         if event.start_time <= current_time:
-            raise HTTPException(
+            return HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot register for past events",
             )
         attendee_obj = await db.execute(
-            select(Attendee).where(
+            select(Attendee.id).where(
                 and_(
-                    Attendee.event_id == event_id, Attendee.email == attendee_data.email
+                    Attendee.event_id == event_id,
+                    Attendee.event_start_time == event.start_time,
+                    Attendee.email == email,
                 )
             )
         )
-        attendee_exists = attendee_obj.scalars().first()
-        if attendee_exists:
-            raise HTTPException(
+        if attendee_obj.first() is not None:
+            return HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email already registered for this event",
             )
-        current_attendees = await db.execute(
-            select(func.count(Attendee.id)).where(Attendee.event_id == event_id)
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Event has reached maximum capacity",
         )
-        count = current_attendees.scalars().first()
-        if count >= event.max_capacity:
+
+    @staticmethod
+    async def search_events(
+        db: AsyncSession,
+        query_text: str,
+        starts_after: Optional[datetime] = None,
+        starts_before: Optional[datetime] = None,
+        min_seats: int = 0,
+        page: int = 1,
+        per_page: int = 10,
+    ) -> PaginatedEventsResponse:
+        """
+        Search upcoming events by name and location, ranked by relevance.
+
+        Every word of the query must match a word of the event's name or
+        location; matches in the name rank higher. Matching, and date ranges
+        of up to two months, use the GIN index on Event.search_vector. The
+        page and its total are loaded in one statement.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            query_text (str): Free-text search, e.g. "Bangalore jazz".
+            starts_after (datetime, optional): Only events starting after this time. Defaults to now.
+            starts_before (datetime, optional): Only events starting before this time.
+            min_seats (int, optional): Only events with at least this many seats remaining. Defaults to 0.
+            page (int, optional): Page number for pagination. Defaults to 1.
+            per_page (int, optional): Number of items per page. Defaults to 10.
+
+        Raises:
+            HTTPException: If the query contains no searchable words.
+
+        Returns:
+            PaginatedEventsResponse: Matching events, best match first.
+        """
+        terms = _search_terms(query_text)
+        if terms is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Event has reached maximum capacity",
+                detail="Search query must contain letters or digits",
             )
+        tz = pytz.timezone("Asia/Kolkata")
+        current_time = datetime.now(tz)
+        starts_after, starts_before = (
+            tz.localize(value) if value is not None and value.tzinfo is None else value
+            for value in (starts_after, starts_before)
+        )
+        if starts_after is None or starts_after < current_time:
+            starts_after = current_time
 
-        attendee_dict = attendee_data.model_dump()
-        attendee = Attendee(event_id=event_id, **attendee_dict)
-        db.add(attendee)
-        await db.commit()
-        await db.refresh(attendee)
+        offset = (page - 1) * per_page
+        result = await db.execute(
+            _search_events_query(terms, starts_after, starts_before, min_seats)
+            .offset(offset)
+            .limit(per_page)
+        )
+        rows = result.all()
+        if rows:
+            total_events = rows[0].total
+        elif offset:
+            count_result = await db.execute(
+                select(func.count()).select_from(
+                    _search_events_query(terms, starts_after, starts_before, min_seats).subquery()
+                )
+            )
+            total_events = count_result.scalar() or 0
+        else:
+            total_events = 0
 
-        return AttendeeResponse(
-            id=attendee.id,
-            name=attendee.name,
-            email=attendee.email,
-            registered_at=attendee.registered_at,
+        return PaginatedEventsResponse(
+            events=[_event_response(event) for event, _ in rows],
+            total=total_events,
+            page=page,
+            per_page=per_page,
+            total_pages=(total_events + per_page - 1) // per_page,
         )
 
+    @staticmethod
+    async def fetch_attendees_version(db: AsyncSession, event_id: int) -> Row:
+        """
+        Read what an event's attendee pages depend on, without reading attendees.
+
+        Every registration bumps attendee_count and updated_at, so together
+        they identify the attendee list.
+
+        Args:
+            db (AsyncSession): Async SQLAlchemy session instance.
+            event_id (int): ID of the event.
+
+        Raises:
+            HTTPException: If the event is not found.
+
+        Returns:
+            Row: The event's attendee_count, updated_at and start_time.
+        """
+        event_obj = await db.execute(
+            select(Event.attendee_count, Event.updated_at, Event.start_time).where(
+                Event.id == event_id
+            )
+        )
+        event = event_obj.first()
+        if event is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+            )
+        return event
+
     @staticmethod
     async def fetch_event_attendees(
-        db: AsyncSession, event_id: int, page: int = 1, per_page: int = 10
+        db: AsyncSession,
+        event_id: int,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        event: Optional[Row] = None,
     ) -> PaginatedAttendeesResponse:
         """
         Fetch paginated list of attendees for a specific event.
 
+        When a cursor is given, the page is read by keyset on
+        (registered_at, id) and the total is left out of the response.
+
         Args:
             db (AsyncSession): Async SQLAlchemy session instance.
             event_id (int): ID of the event to fetch attendees for.
             page (int, optional): Page number for pagination. Defaults to 1.
             per_page (int, optional): Number of attendees per page. Defaults to 10.
+            cursor (str, optional): Keyset cursor from a previous page; an empty string starts from the first attendee.
+            event (Row, optional): Row from fetch_attendees_version, if the caller already read it.
 
         Raises:
             HTTPException: If the event is not found.
@@ -192,44 +1063,45 @@ class EventService:
         Returns:
             PaginatedAttendeesResponse: Paginated response containing list of attendees and metadata.
         """
-        event_obj = await db.execute(select(Event).where(Event.id == event_id))
-        event = event_obj.scalars().first()
-        if not event:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Event not found"
+        if event is None:
+            event = await EventService.fetch_attendees_version(db, event_id)
+        total = event.attendee_count
+        if cursor is not None:
+            attendees_obj = await db.execute(
+                _event_attendees_query(event_id, event.start_time, decode_cursor(cursor)).limit(
+                    per_page + 1
+                )
+            )
+            attendees = attendees_obj.all()
+            next_cursor = None
+            if len(attendees) > per_page:
+                attendees = attendees[:per_page]
+                next_cursor = encode_cursor(
+                    attendees[-1].registered_at, attendees[-1].id
+                )
+            return PaginatedAttendeesResponse(
+                attendees=[_attendee_response(attendee) for attendee in attendees],
+                per_page=per_page,
+                next_cursor=next_cursor,
             )
-        offset = (page - 1) * per_page
 
+        offset = (page - 1) * per_page
         attendees_obj = await db.execute(
-            select(Attendee)
-            .where(Attendee.event_id == event_id)
-            .order_by(Attendee.registered_at)
-            .offset(offset)
-            .limit(per_page)
+            _event_attendees_query(event_id, event.start_time).offset(offset).limit(per_page)
         )
-        attendees = attendees_obj.scalars().all()
-
-        count_result = await db.execute(
-            select(func.count(Attendee.id)).where(Attendee.event_id == event_id)
-        )
-        total = count_result.scalar() or 0
-
-        attendee_responses = [
-            AttendeeResponse(
-                id=attendee.id,
-                name=attendee.name,
-                email=attendee.email,
-                registered_at=attendee.registered_at,
-            )
-            for attendee in attendees
-        ]
+        attendees = attendees_obj.all()
 
+        next_cursor = None
+        # attendee_count is denormalized; a page past the real rows is empty, not an error.
+        if attendees and offset + len(attendees) < total:
+            next_cursor = encode_cursor(attendees[-1].registered_at, attendees[-1].id)
         total_pages = math.ceil(total / per_page) if total > 0 else 1
 
         return PaginatedAttendeesResponse(
-            attendees=attendee_responses,
+            attendees=[_attendee_response(attendee) for attendee in attendees],
             total=total,
             page=page,
             per_page=per_page,
             total_pages=total_pages,
+            next_cursor=next_cursor,
         )
@@ -0,0 +1,212 @@
+"""
+Start-up warm-up, so a new worker's first requests are not its slowest.
+
+A fresh worker opens its pooled connections, lets asyncpg introspect
+types, has SQLAlchemy compile each statement and prepares each statement
+on each connection, all on the first requests that need them. Warmup does
+this work in the background at start-up instead. It opens every engine's
+pool to pool_size, runs the EventService statements once on each
+connection, and exercises the request and response schemas. /ready
+answers 503 until it has finished.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+import pytz
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from common import metrics
+from common.config import settings
+from common.database import engine, read_engine
+from event_management.api.v1.schemas.events import (
+    AttendeeCreate,
+    EventCreate,
+    EventResponse,
+    PaginatedAttendeesResponse,
+    PaginatedEventsResponse,
+)
+from event_management.views import (
+    EventService,
+    _registered_emails_query,
+    _reserve_seat_statement,
+    _seats_remaining_query,
+)
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Callable[[], Awaitable[None]]
+
+
+async def warm_connection(connection: AsyncConnection, writes: bool = True) -> None:
+    """
+    Run the EventService statements once on one connection, changing nothing.
+
+    Args:
+        connection (AsyncConnection): Connection to warm.
+        writes (bool, optional): Also prepare the registration statements; False for the replica.
+    """
+    now = datetime.now(pytz.UTC)
+    async with AsyncSession(bind=connection, expire_on_commit=False) as db:
+        page = await EventService.fetch_upcoming_events(db, use_cache=False)
+        await EventService.fetch_upcoming_events(db, cursor="", use_cache=False)
+        await EventService.search_events(db, "warmup")
+        event_id = page.events[0].id if page.events else 0
+        try:
+            await EventService.fetch_event_attendees(db, event_id)
+            await EventService.fetch_event_attendees(db, event_id, cursor="")
+        except HTTPException:
+            pass
+        await db.execute(_seats_remaining_query([event_id], now))
+        if writes:
+            # Matches no rows, and the transaction is rolled back below.
+            await db.execute(_reserve_seat_statement(0, now))
+            await db.execute(_registered_emails_query(0, now, ["warmup@example.com"]))
+        await db.rollback()
+
+
+async def warm_pool(engine: AsyncEngine, writes: bool = True) -> int:
+    """
+    Open an engine's pool to pool_size and warm every connection in it.
+
+    Args:
+        engine (AsyncEngine): Engine whose pool is opened.
+        writes (bool, optional): Passed to warm_connection.
+
+    Returns:
+        int: Number of connections warmed.
+    """
+    # Held together, so each one is a different pooled connection.
+    connections: List[AsyncConnection] = []
+    try:
+        for _ in range(engine.pool.size()):
+            connections.append(await engine.connect())
+        await asyncio.gather(*(warm_connection(connection, writes) for connection in connections))
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+async def warm_schemas() -> None:
+    """Validate and serialize each API schema once; EmailStr imports email_validator on first use."""
+    start = datetime.now(pytz.UTC) + timedelta(days=1)
+    end = start + timedelta(hours=1)
+    EventCreate.model_validate(
+        {
+            "name": "Warmup",
+            "location": "Kochi",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "max_capacity": 1,
+        }
+    )
+    AttendeeCreate.model_validate({"name": "Warmup", "email": "warmup@example.com"})
+    event = EventResponse(
+        id=0,
+        name="Warmup",
+        location="Kochi",
+        start_time=start,
+        end_time=end,
+        max_capacity=1,
+        created_at=start,
+        updated_at=start,
+    )
+    PaginatedEventsResponse(events=[event], per_page=1).model_dump_json(exclude_none=True)
+    PaginatedAttendeesResponse(attendees=[], per_page=1).model_dump_json(exclude_none=True)
+
+
+class Warmup:
+    """
+    Run warm-up steps once in the background and report readiness.
+
+    Steps run in order; a failing step is logged and skipped, and the whole
+    warm-up gives up after timeout seconds. Either way the worker is then
+    reported ready, since warm-up only saves latency.
+    """
+
+    def __init__(self, steps: Dict[str, WarmupStep], timeout: float = 30.0):
+        self.steps = dict(steps)
+        self.timeout = timeout
+        self.ready = False
+        self.durations: Dict[str, float] = {}
+        self.failures: List[str] = []
+        self.warmup_seconds: Optional[float] = None
+        self.ready_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add_step(self, name: str, step: WarmupStep) -> None:
+        self.steps[name] = step
+
+    async def run(self) -> None:
+        """Run every step, then mark the worker ready."""
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._run_steps(), self.timeout)
+        except asyncio.TimeoutError:
+            self.failures.append("timeout")
+            logger.warning("Warm-up did not finish within %.1f s", self.timeout)
+        self.warmup_seconds = time.monotonic() - started
+        self.ready_seconds = time.monotonic() - metrics.registry.started_at
+        self.ready = True
+        logger.info(
+            "Warm-up finished in %.3f s, ready %.3f s after start-up",
+            self.warmup_seconds,
+            self.ready_seconds,
+        )
+
+    async def _run_steps(self) -> None:
+        for name, step in self.steps.items():
+            started = time.monotonic()
+            try:
+                await step()
+            except Exception:
+                self.failures.append(name)
+                logger.exception("Warm-up step %s failed", name)
+            self.durations[name] = time.monotonic() - started
+
+    def start(self) -> None:
+        """Run the warm-up in a background task."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_seconds": _rounded(self.warmup_seconds),
+            "ready_seconds": _rounded(self.ready_seconds),
+            "first_fast_request_seconds": _rounded(metrics.registry.first_fast_request_seconds),
+            "steps": {name: _rounded(seconds) for name, seconds in self.durations.items()},
+            "failures": self.failures,
+        }
+
+
+def _rounded(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds, 3) if seconds is not None else None
+
+
+async def _warm_primary() -> None:
+    await warm_pool(engine)
+
+
+async def _warm_replica() -> None:
+    await warm_pool(read_engine, writes=False)
+
+
+warmup = Warmup(
+    {
+        "primary_pool": _warm_primary,
+        **({"replica_pool": _warm_replica} if read_engine is not engine else {}),
+        "schemas": warm_schemas,
+    }
+    if settings.WARMUP_ON_STARTUP
+    else {},
+    timeout=settings.WARMUP_TIMEOUT,
+)
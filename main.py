@@ -1,8 +1,86 @@
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from common import metrics
+from common.admission import AdmissionMiddleware, admission_controller
+from common.config import settings
+from common.database import engine, pool_status, read_engine
+from common.workers import WorkerStatusReporter
 from event_management.api.v1.endpoints import api_router as event_management_router
+from event_management.availability import availability_hub
+from event_management.coalescer import registration_coalescer
+from event_management.jobs import outbox_relay, registration_jobs
+from event_management.partitions import partition_maintainer
+from event_management.views import upcoming_snapshot
+from event_management.warmup import warmup
 
-app = FastAPI()
+metrics.instrument_engine("primary", engine)
+if read_engine is not engine:
+    metrics.instrument_engine("replica", read_engine)
+
+
+def _worker_status() -> dict:
+    return {
+        "worker": settings.SERVE_WORKER_INDEX,
+        "ready": warmup.ready,
+        "uptime_seconds": round(time.monotonic() - metrics.registry.started_at, 3),
+        "database_pool": pool_status(engine),
+        "requests": metrics.registry.request_summary(),
+        "admission": admission_controller.stats(),
+        "availability_subscribers": availability_hub.subscriptions,
+    }
+
+
+# Only workers started by serve.py report to its status directory.
+worker_status = (
+    WorkerStatusReporter(
+        os.path.join(settings.SERVE_STATUS_DIR, f"worker-{settings.SERVE_WORKER_INDEX}.json"),
+        _worker_status,
+        interval_seconds=settings.SERVE_STATUS_INTERVAL,
+    )
+    if settings.SERVE_STATUS_DIR
+    else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup.start()
+    if worker_status is not None:
+        worker_status.start()
+    if settings.PARTITION_MAINTENANCE_INTERVAL > 0:
+        partition_maintainer.start()
+    if registration_jobs.mode == "outbox" and settings.REGISTRATION_OUTBOX_POLL_INTERVAL > 0:
+        outbox_relay.start()
+    if settings.UPCOMING_SNAPSHOT_INTERVAL > 0:
+        upcoming_snapshot.start()
+    if settings.AVAILABILITY_STREAMING:
+        availability_hub.start()
+    yield
+    # Registrations waiting for their batch timer are written before shutdown.
+    await registration_coalescer.drain()
+    await warmup.stop()
+    await availability_hub.stop()
+    await upcoming_snapshot.stop()
+    await partition_maintainer.stop()
+    await outbox_relay.stop()
+    await registration_jobs.drain()
+    if worker_status is not None:
+        await worker_status.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+if settings.ADMISSION_CONTROL:
+    # Added before MetricsMiddleware so it runs inside it and sees the pool wait.
+    app.add_middleware(AdmissionMiddleware)
+app.add_middleware(
+    metrics.MetricsMiddleware,
+    server_timing=settings.METRICS_SERVER_TIMING,
+    n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+)
+# Added last so it is outermost: shed 503s get CORS headers too.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -12,3 +90,23 @@ app.add_middleware(
 )
 
 app.include_router(event_management_router, prefix="/event", tags=["event_management"])
+
+
+async def _warm_openapi() -> None:
+    # Built on the first /docs or /openapi.json request otherwise.
+    app.openapi()
+
+
+if settings.WARMUP_ON_STARTUP:
+    warmup.add_step("openapi", _warm_openapi)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Expose request and SQL metrics in Prometheus text format.
+
+    Returns:
+        Response: Metrics of this worker process.
+    """
+    return Response(metrics.registry.render(), media_type=metrics.PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,319 @@
+"""
+Serve the API with several uvicorn worker processes on one socket.
+
+    python serve.py run --workers 4 --connection-budget 80
+    python serve.py status
+
+run binds the listening socket once and shares it with its workers. With
+a connection budget, each worker's pool_size and max_overflow are pinned
+so that all workers together stay within it. A worker that dies is
+replaced. SIGHUP restarts the workers one at a time: each finishes its
+in-flight requests before exiting, and the next is only restarted once
+its replacement reports ready, so the deployment keeps serving throughout.
+SIGINT and SIGTERM stop every worker gracefully.
+
+status prints each worker's readiness, pool use and request counts from
+the files the workers write to the status directory.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+from multiprocessing.process import BaseProcess
+from typing import Dict, List, Optional
+import uvicorn
+from common.config import settings
+from common.workers import connection_budget, read_status_files, require_shared_backends
+
+logger = logging.getLogger("serve")
+
+SUPERVISOR_FILE = "supervisor.json"
+
+
+def _default_status_dir(port: int) -> str:
+    return settings.SERVE_STATUS_DIR or os.path.join(
+        tempfile.gettempdir(), f"event_management-{port}"
+    )
+
+
+def _serve_worker(config: uvicorn.Config, sockets: list) -> None:
+    # Runs in the spawned worker, which inherited its pinned settings as environment.
+    # A process group of its own keeps a terminal's Ctrl-C from reaching it
+    # alongside the supervisor's SIGTERM, which uvicorn would take as a forced exit.
+    os.setpgrp()
+    config.configure_logging()
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+class Supervisor:
+    """
+    Keep a fixed number of uvicorn workers running on a shared socket.
+
+    Workers are spawned, not forked, so each one imports the app, and
+    reads its settings, from the environment pinned for it.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        host: str,
+        port: int,
+        status_dir: str,
+        environment: Dict[str, str],
+        graceful_timeout: float = 30.0,
+        ready_timeout: float = 60.0,
+    ):
+        self.workers = workers
+        self.status_dir = status_dir
+        self.environment = environment
+        self.graceful_timeout = graceful_timeout
+        self.ready_timeout = ready_timeout
+        self.config = uvicorn.Config(
+            "main:app", host=host, port=port, timeout_graceful_shutdown=graceful_timeout
+        )
+        self.processes: List[Optional[BaseProcess]] = [None] * workers
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")
+        self._socket = None
+        self._should_exit = False
+        self._should_restart = False
+
+    def _start(self, index: int) -> BaseProcess:
+        # Spawned children copy os.environ as it is when they start.
+        os.environ.update(self.environment)
+        os.environ["SERVE_WORKER_INDEX"] = str(index)
+        os.environ["DB_APPLICATION_NAME"] = f"{settings.DB_APPLICATION_NAME}-w{index}"
+        process = self._context.Process(
+            target=_serve_worker, args=(self.config, [self._socket]), name=f"worker-{index}"
+        )
+        process.start()
+        self.processes[index] = process
+        logger.info("Started worker %d [%d]", index, process.pid)
+        return process
+
+    def _stop(self, index: int, signal_worker: bool = True) -> None:
+        process = self.processes[index]
+        if process is None:
+            return
+        # uvicorn stops accepting on SIGTERM, lets open requests finish for up
+        # to graceful_timeout, then runs the lifespan shutdown. A second
+        # SIGTERM would skip that, so it is sent once.
+        if signal_worker:
+            process.terminate()
+        process.join(self.graceful_timeout + 10)
+        if process.is_alive():
+            logger.warning("Worker %d [%d] did not stop in time, killing it", index, process.pid)
+            process.kill()
+            process.join()
+        self.processes[index] = None
+
+    def _wait_ready(self, index: int, pid: int) -> bool:
+        deadline = time.monotonic() + self.ready_timeout
+        while time.monotonic() < deadline and not self._should_exit:
+            for status in read_status_files(self.status_dir):
+                if status.get("pid") == pid and status.get("ready"):
+                    return True
+            if not self.processes[index].is_alive():
+                return False
+            time.sleep(0.2)
+        return False
+
+    def restart_all(self) -> None:
+        """Replace the workers one at a time, waiting for each replacement to be ready."""
+        for index in range(self.workers):
+            if self._should_exit:
+                return
+            self._stop(index)
+            process = self._start(index)
+            self.restarts += 1
+            if not self._wait_ready(index, process.pid):
+                logger.warning("Worker %d [%d] did not report ready", index, process.pid)
+
+    def _replace_dead_workers(self) -> None:
+        for index, process in enumerate(self.processes):
+            if process is not None and process.exitcode is not None:
+                logger.warning("Worker %d [%d] exited with %s", index, process.pid, process.exitcode)
+                self._start(index)
+                self.restarts += 1
+
+    def _on_exit_signal(self, signum, frame) -> None:
+        self._should_exit = True
+
+    def _on_restart_signal(self, signum, frame) -> None:
+        self._should_restart = True
+
+    def run(self, details: dict) -> None:
+        os.makedirs(self.status_dir, exist_ok=True)
+        with open(os.path.join(self.status_dir, SUPERVISOR_FILE), "w") as file:
+            json.dump({"pid": os.getpid(), "started_at": time.time(), **details}, file)
+        signal.signal(signal.SIGINT, self._on_exit_signal)
+        signal.signal(signal.SIGTERM, self._on_exit_signal)
+        signal.signal(signal.SIGHUP, self._on_restart_signal)
+
+        self._socket = self.config.bind_socket()
+        for index in range(self.workers):
+            self._start(index)
+        try:
+            while not self._should_exit:
+                if self._should_restart:
+                    self._should_restart = False
+                    self.restart_all()
+                self._replace_dead_workers()
+                time.sleep(0.5)
+        finally:
+            # Signal every worker first, so they drain in parallel.
+            for process in self.processes:
+                if process is not None:
+                    process.terminate()
+            for index in range(self.workers):
+                self._stop(index, signal_worker=False)
+            self._socket.close()
+            os.remove(os.path.join(self.status_dir, SUPERVISOR_FILE))
+
+
+def run(args) -> int:
+    try:
+        require_shared_backends(
+            args.workers,
+            {
+                "IDEMPOTENCY_BACKEND": settings.IDEMPOTENCY_BACKEND,
+                "EVENTS_CACHE_BACKEND": settings.EVENTS_CACHE_BACKEND,
+            },
+        )
+    except ValueError as exc:
+        logger.error("%s", exc)
+        return 2
+    options = settings.db_engine_options()
+    # The seat availability LISTEN connection is opened outside the pool.
+    reserved = 1 if settings.AVAILABILITY_STREAMING else 0
+    environment = {"SERVE_STATUS_DIR": args.status_dir}
+    budget = args.connection_budget
+    if budget:
+        try:
+            pool_size, max_overflow = connection_budget(
+                budget, args.workers, options["pool_size"], reserved
+            )
+        except ValueError as exc:
+            logger.error("%s", exc)
+            return 2
+        environment.update(DB_POOL_SIZE=str(pool_size), DB_MAX_OVERFLOW=str(max_overflow))
+    else:
+        pool_size, max_overflow = options["pool_size"], options["max_overflow"]
+        logger.warning(
+            "No connection budget set; %d workers may open up to %d connections",
+            args.workers,
+            args.workers * (pool_size + max_overflow + reserved),
+        )
+
+    details = {
+        "workers": args.workers,
+        "host": args.host,
+        "port": args.port,
+        "connection_budget": budget,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "reserved_per_worker": reserved,
+    }
+    logger.info("Serving with %s", details)
+    Supervisor(
+        args.workers,
+        args.host,
+        args.port,
+        args.status_dir,
+        environment,
+        graceful_timeout=args.graceful_timeout,
+        ready_timeout=settings.SERVE_READY_TIMEOUT,
+    ).run(details)
+    return 0
+
+
+def status(args) -> int:
+    supervisor_path = os.path.join(args.status_dir, SUPERVISOR_FILE)
+    supervisor = None
+    if os.path.exists(supervisor_path):
+        with open(supervisor_path) as file:
+            supervisor = json.load(file)
+    workers = read_status_files(args.status_dir)
+    if args.json:
+        print(json.dumps({"supervisor": supervisor, "workers": workers}, indent=2))
+        return 0 if supervisor else 1
+    if supervisor is None:
+        print(f"No supervisor is running with status directory {args.status_dir}")
+        return 1
+
+    print(
+        f"Supervisor [{supervisor['pid']}]: {supervisor['workers']} workers on "
+        f"{supervisor['host']}:{supervisor['port']}, connection budget "
+        f"{supervisor['connection_budget'] or 'unset'}, per worker pool_size "
+        f"{supervisor['pool_size']} + max_overflow {supervisor['max_overflow']} "
+        f"+ {supervisor['reserved_per_worker']} reserved"
+    )
+    header = (
+        "worker", "pid", "alive", "ready", "uptime_s", "pool_out", "pool_util",
+        "requests", "5xx", "mean_ms", "shed",
+    )
+    rows = [header]
+    for worker in workers:
+        pool = worker["database_pool"]
+        requests = worker["requests"]
+        rows.append(
+            (
+                worker["worker"],
+                worker["pid"],
+                worker["alive"],
+                worker["ready"],
+                worker["uptime_seconds"],
+                pool["checked_out"],
+                pool["utilization"],
+                requests["requests"],
+                requests["errors"],
+                requests["mean_latency_ms"],
+                sum(stats["shed"] for stats in worker["admission"]["classes"].values()),
+            )
+        )
+    widths = [max(len(str(row[column])) for row in rows) for column in range(len(header))]
+    for row in rows:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="start the supervisor and its workers")
+    run_parser.add_argument("--workers", type=int, default=settings.SERVE_WORKERS)
+    run_parser.add_argument("--host", default=settings.SERVE_HOST)
+    run_parser.add_argument("--port", type=int, default=settings.SERVE_PORT)
+    run_parser.add_argument(
+        "--connection-budget",
+        type=int,
+        default=settings.DB_CONNECTION_BUDGET,
+        help="connections all workers together may open on one database server",
+    )
+    run_parser.add_argument(
+        "--graceful-timeout", type=float, default=settings.SERVE_GRACEFUL_TIMEOUT,
+        help="seconds a stopping worker waits for in-flight requests",
+    )
+    run_parser.add_argument("--status-dir", help="defaults to a per-port temporary directory")
+
+    status_parser = commands.add_parser("status", help="report per-worker statistics")
+    status_parser.add_argument("--port", type=int, default=settings.SERVE_PORT)
+    status_parser.add_argument("--status-dir", help="defaults to a per-port temporary directory")
+    status_parser.add_argument("--json", action="store_true", help="print raw JSON")
+
+    args = parser.parse_args(argv)
+    args.status_dir = args.status_dir or _default_status_dir(args.port)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    if args.command == "run":
+        return run(args)
+    return status(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())